@@ -0,0 +1,37 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import Awaitable, Iterator
+from typing import Any, Callable, cast
+
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+from typing_extensions import TypeAlias
+
+__all__ = ('RunAsync',)
+
+RunAsync: TypeAlias = Callable[[Callable[[], Awaitable[Any]]], Any]
+
+
+@pytest.fixture
+def event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        yield loop
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@pytest.fixture
+def run_async(benchmark: BenchmarkFixture, event_loop: asyncio.AbstractEventLoop) -> RunAsync:
+    """Benchmark a coroutine function, running it on the same event loop each round.
+
+    Reusing the loop keeps the cost of creating and closing it out of the measurements.
+    """
+
+    def run(func: Callable[[], Awaitable[Any]]) -> Any:
+        return cast(Any, benchmark(lambda: event_loop.run_until_complete(func())))
+
+    return run
@@ -0,0 +1,92 @@
+"""Benchmarks of the agent loop, i.e. the overhead of an agent run around the model and the tools."""
+
+from __future__ import annotations as _annotations
+
+from typing import cast
+
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from pydantic import BaseModel
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pydantic_ai import Agent
+from pydantic_ai.agent import AgentRunResult
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.models.instrumented import InstrumentationSettings
+from pydantic_ai.models.test import TestModel
+from pydantic_ai.usage import UsageLimits
+
+from .conftest import RunAsync
+
+pytestmark = pytest.mark.benchmark(group='agent')
+
+
+class Answer(BaseModel):
+    answer: str
+    confidence: float
+
+
+def build_agent(tools: int, **kwargs: object) -> Agent[None, str]:
+    agent = Agent(TestModel(), **kwargs)  # pyright: ignore[reportArgumentType,reportCallIssue]
+    for i in range(tools):
+
+        def tool(x: int, y: str = 'default') -> str:
+            return f'{x} {y}'
+
+        tool.__name__ = f'tool_{i}'
+        agent.tool_plain(tool)
+    return agent
+
+
+@pytest.mark.parametrize('tools', [0, 1, 10])
+def test_run(run_async: RunAsync, tools: int):
+    agent = build_agent(tools)
+    result = run_async(lambda: agent.run('Hello'))
+    assert len(result.all_messages()) == (4 if tools else 2)
+
+
+def test_run_sync(benchmark: BenchmarkFixture):
+    agent = build_agent(1)
+    result = cast(AgentRunResult[str], benchmark(agent.run_sync, 'Hello'))
+    assert len(result.all_messages()) == 4
+
+
+def test_run_output_type(run_async: RunAsync):
+    """A per-run output type, which needs an output schema for the run."""
+    agent = build_agent(0)
+    result = run_async(lambda: agent.run('Hello', output_type=Answer))
+    assert isinstance(result.output, Answer)
+
+
+@pytest.mark.parametrize('instrument', [False, True], ids=['uninstrumented', 'instrumented'])
+def test_run_instrumented(run_async: RunAsync, instrument: bool):
+    settings = InstrumentationSettings(tracer_provider=TracerProvider()) if instrument else False
+    agent = build_agent(10, instrument=settings)
+    run_async(lambda: agent.run('Hello'))
+
+
+def sequential_tool_calls(steps: int) -> FunctionModel:
+    """A model calling a tool once per step, so the history grows by two messages each step."""
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) < 2 * steps:
+            return ModelResponse(parts=[ToolCallPart('get_data', {'page': len(messages)})])
+        return ModelResponse(parts=[TextPart('done')])
+
+    return FunctionModel(respond)
+
+
+@pytest.mark.parametrize('steps', [10, 50])
+@pytest.mark.parametrize('incremental_events', [False, True], ids=['full_events', 'incremental_events'])
+def test_run_instrumented_history(run_async: RunAsync, steps: int, incremental_events: bool):
+    """Instrumentation cost of long runs; with incremental events it should grow linearly with the number of steps."""
+    settings = InstrumentationSettings(tracer_provider=TracerProvider(), incremental_events=incremental_events)
+    agent = Agent(sequential_tool_calls(steps), instrument=settings)
+
+    @agent.tool_plain
+    def get_data(page: int) -> str:
+        return f'Data for page {page}: ' + 'lorem ipsum ' * 50
+
+    result = run_async(lambda: agent.run('Hello', usage_limits=UsageLimits(request_limit=None)))
+    assert len(result.all_messages()) == 2 * steps + 2
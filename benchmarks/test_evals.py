@@ -0,0 +1,26 @@
+"""Benchmarks of evaluating datasets, i.e. the overhead of running a task on many cases and scoring them."""
+
+from __future__ import annotations as _annotations
+
+import pytest
+
+from pydantic_evals import Case, Dataset
+from pydantic_evals.evaluators import EqualsExpected, IsInstance
+
+from .conftest import RunAsync
+
+pytestmark = pytest.mark.benchmark(group='evals')
+
+
+async def double(x: int) -> int:
+    return x * 2
+
+
+@pytest.mark.parametrize('cases', [1_000, 10_000])
+def test_evaluate(run_async: RunAsync, cases: int):
+    dataset = Dataset[int, int, None](
+        cases=[Case(name=f'case {i}', inputs=i, expected_output=i * 2) for i in range(cases)],
+        evaluators=[EqualsExpected(), IsInstance(type_name='int')],
+    )
+    report = run_async(lambda: dataset.evaluate(double))
+    assert len(report.cases) == cases
@@ -0,0 +1,56 @@
+"""Benchmarks of graph runs, in particular persisting snapshots of their state."""
+
+from __future__ import annotations as _annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Union
+
+import pytest
+
+from pydantic_graph import BaseNode, End, FullStatePersistence, Graph, GraphRunContext
+from pydantic_graph.persistence.file import FileStatePersistence
+
+from .conftest import RunAsync
+
+pytestmark = pytest.mark.benchmark(group='graph')
+
+
+@dataclass
+class State:
+    items: list[str] = field(default_factory=list)
+
+
+@dataclass
+class AddItem(BaseNode[State, None, int]):
+    remaining: int
+
+    async def run(self, ctx: GraphRunContext[State]) -> Union[AddItem, End[int]]:  # noqa: UP007
+        if self.remaining == 0:
+            return End(len(ctx.state.items))
+        ctx.state.items.append(f'item {self.remaining}')
+        return AddItem(self.remaining - 1)
+
+
+graph = Graph(nodes=[AddItem])
+
+
+@pytest.mark.parametrize('steps', [10, 100])
+def test_file_persistence(run_async: RunAsync, tmp_path: Path, steps: int):
+    json_file = tmp_path / 'run.json'
+
+    async def run() -> int:
+        json_file.unlink(missing_ok=True)
+        result = await graph.run(AddItem(steps), state=State(), persistence=FileStatePersistence(json_file))
+        return result.output
+
+    assert run_async(run) == steps
+
+
+@pytest.mark.parametrize('steps', [10, 100])
+def test_full_state_persistence(run_async: RunAsync, steps: int):
+    async def run() -> int:
+        result = await graph.run(AddItem(steps), state=State(), persistence=FullStatePersistence())
+        return result.output
+
+    assert run_async(run) == steps
@@ -0,0 +1,115 @@
+"""Benchmarks of message histories: serializing them, and mapping them to the providers' formats for each request."""
+
+from __future__ import annotations as _annotations
+
+from typing import Callable
+
+import httpx
+import pytest
+from openai import AsyncOpenAI
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import Model
+from pydantic_ai.models.gemini import GeminiModel
+from pydantic_ai.models.openai import OpenAIModel
+from pydantic_ai.providers.google_gla import GoogleGLAProvider
+from pydantic_ai.providers.openai import OpenAIProvider
+
+from .conftest import RunAsync
+
+pytestmark = pytest.mark.benchmark(group='messages')
+
+IMAGE = BinaryContent(data=b'\x89PNG' + bytes(range(256)) * 4096, media_type='image/png')
+
+
+def history(turns: int) -> list[ModelMessage]:
+    messages: list[ModelMessage] = [ModelRequest(parts=[SystemPromptPart('You are a helpful assistant.')])]
+    for i in range(turns):
+        messages += [
+            ModelRequest(parts=[UserPromptPart(f'Question {i}: what is in this image?')]),
+            ModelResponse(parts=[ToolCallPart('get_image', {'image_id': i}, tool_call_id=f'call_{i}')]),
+            ModelRequest(parts=[ToolReturnPart('get_image', {'id': i, 'tags': ['a', 'b']}, tool_call_id=f'call_{i}')]),
+            ModelResponse(parts=[TextPart(f'Answer {i}: ' + 'lorem ipsum ' * 20)]),
+        ]
+    return messages
+
+
+@pytest.mark.parametrize('turns', [100, 1000])
+def test_dump_json(benchmark: BenchmarkFixture, turns: int):
+    messages = history(turns)
+    benchmark(ModelMessagesTypeAdapter.dump_json, messages)
+
+
+@pytest.mark.parametrize('turns', [100, 1000])
+def test_round_trip(benchmark: BenchmarkFixture, turns: int):
+    messages = history(turns)
+
+    def round_trip() -> list[ModelMessage]:
+        return ModelMessagesTypeAdapter.validate_json(ModelMessagesTypeAdapter.dump_json(messages))
+
+    assert benchmark(round_trip) == messages
+
+
+def openai_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            'id': 'chatcmpl-123',
+            'object': 'chat.completion',
+            'created': 1704067200,
+            'model': 'gpt-4o',
+            'choices': [
+                {'index': 0, 'message': {'role': 'assistant', 'content': 'Done'}, 'finish_reason': 'stop'},
+            ],
+            'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+        },
+    )
+
+
+def gemini_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        json={
+            'candidates': [
+                {'content': {'role': 'model', 'parts': [{'text': 'Done'}]}, 'index': 0, 'finish_reason': 'STOP'}
+            ],
+            'usage_metadata': {'prompt_token_count': 1, 'candidates_token_count': 1, 'total_token_count': 2},
+            'model_version': 'gemini-1.5-flash',
+        },
+    )
+
+
+def openai_model() -> OpenAIModel:
+    client = AsyncOpenAI(api_key='test', http_client=httpx.AsyncClient(transport=httpx.MockTransport(openai_handler)))
+    return OpenAIModel('gpt-4o', provider=OpenAIProvider(openai_client=client))
+
+
+def gemini_model() -> GeminiModel:
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(gemini_handler))
+    return GeminiModel('gemini-1.5-flash', provider=GoogleGLAProvider(api_key='test', http_client=http_client))
+
+
+@pytest.mark.parametrize('turns', [10, 100])
+@pytest.mark.parametrize('model_factory', [openai_model, gemini_model], ids=['openai', 'gemini'])
+def test_provider_request(run_async: RunAsync, model_factory: Callable[[], Model], turns: int):
+    """A request with a long history including an image, through the model's client to a mock transport."""
+    agent = Agent(model_factory())
+    messages = history(turns)
+    messages.append(ModelRequest(parts=[UserPromptPart(['Describe this', IMAGE])]))
+    messages.append(ModelResponse(parts=[TextPart('An image')]))
+
+    result = run_async(lambda: agent.run('And now?', message_history=messages))
+    assert result.output == 'Done'
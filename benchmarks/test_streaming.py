@@ -0,0 +1,295 @@
+"""Benchmarks of streamed responses: consuming the stream, managing the parts and validating partial output."""
+
+from __future__ import annotations as _annotations
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any, cast
+
+import httpx
+import pytest
+from mistralai import CompletionChunk, CompletionEvent, CompletionResponseStreamChoice, DeltaMessage, Mistral
+from pydantic import BaseModel
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from pydantic_ai import Agent
+from pydantic_ai._output import OutputSchemaTool
+from pydantic_ai._partial_json import IncrementalJsonParser
+from pydantic_ai._parts_manager import ModelResponsePartsManager
+from pydantic_ai.messages import ModelMessage, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.models.gemini import GeminiModel
+from pydantic_ai.models.mistral import MistralModel
+from pydantic_ai.providers.google_gla import GoogleGLAProvider
+from pydantic_ai.providers.mistral import MistralProvider
+
+from .conftest import RunAsync
+
+pytestmark = pytest.mark.benchmark(group='streaming')
+
+TOKENS = 10_000
+DELTAS = 100_000
+
+
+class Item(BaseModel):
+    # defaults so the last item of a partial response validates
+    name: str = ''
+    description: str = ''
+    price: float = 0
+
+
+class Catalog(BaseModel):
+    items: list[Item]
+
+
+CATALOG_JSON = Catalog(
+    items=[Item(name=f'item {i}', description='lorem ipsum ' * 5, price=i) for i in range(50)]
+).model_dump_json()
+# about 100k characters, streamed in as many chunks as a model would
+LONG_CATALOG_JSON = Catalog(
+    items=[Item(name=f'item {i}', description='lorem ipsum ' * 5, price=i) for i in range(1_000)]
+).model_dump_json()
+
+
+async def stream_text(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+    for i in range(TOKENS):
+        yield f'token{i} '
+
+
+async def stream_catalog(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+    assert info.output_tools
+    yield {0: DeltaToolCall(name=info.output_tools[0].name)}
+    for i in range(0, len(CATALOG_JSON), 10):
+        yield {0: DeltaToolCall(json_args=CATALOG_JSON[i : i + 10])}
+
+
+async def stream_long_text_field(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+    assert info.output_tools
+    yield {0: DeltaToolCall(name=info.output_tools[0].name, json_args='{"items": [{"name": "essay", "description": "')}
+    for _ in range(TOKENS):
+        yield {0: DeltaToolCall(json_args='lorem ipsum ')}
+    yield {0: DeltaToolCall(json_args='"}]}')}
+
+
+def test_run_stream_text(run_async: RunAsync):
+    agent = Agent(FunctionModel(stream_function=stream_text))
+
+    async def run() -> int:
+        chunks = 0
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream_text(delta=True, debounce_by=None):
+                chunks += 1
+        return chunks
+
+    assert run_async(run) == TOKENS
+
+
+CONSUMERS = 1_000
+CONSUMER_TOKENS = 100
+
+
+async def stream_text_paced(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+    for i in range(CONSUMER_TOKENS):
+        # give the other streams a turn after each token, as waiting for a network response would
+        await asyncio.sleep(0)
+        yield f'token{i} '
+
+
+def test_run_stream_concurrent(run_async: RunAsync, benchmark: BenchmarkFixture):
+    """Many concurrent streams consumed with the default debouncing, which groups the events of each stream."""
+    agent = Agent(FunctionModel(stream_function=stream_text_paced))
+
+    async def consume() -> int:
+        chunks = 0
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream_text(delta=True):
+                chunks += 1
+        return chunks
+
+    extra_info: dict[str, Any] = benchmark.extra_info  # pyright: ignore[reportUnknownMemberType]
+
+    async def run() -> list[int]:
+        start = time.perf_counter()
+        chunks = await asyncio.gather(*(consume() for _ in range(CONSUMERS)))
+        extra_info['events_per_second'] = round(CONSUMERS * CONSUMER_TOKENS / (time.perf_counter() - start))
+        return chunks
+
+    assert all(chunks >= 1 for chunks in run_async(run))
+
+
+def test_run_stream_structured(run_async: RunAsync):
+    agent = Agent(FunctionModel(stream_function=stream_catalog), output_type=Catalog)
+
+    async def run() -> Catalog:
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream(debounce_by=None):
+                pass
+            return await result.get_output()
+
+    assert len(run_async(run).items) == 50
+
+
+def test_run_stream_long_text_field(run_async: RunAsync):
+    """A long string field, where re-parsing all the arguments on each chunk made streaming quadratic."""
+    agent = Agent(FunctionModel(stream_function=stream_long_text_field), output_type=Catalog)
+
+    async def run() -> Catalog:
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream(debounce_by=None):
+                pass
+            return await result.get_output()
+
+    assert len(run_async(run).items[0].description) == TOKENS * 12
+
+
+def test_incremental_json_parser(benchmark: BenchmarkFixture):
+    chunks = [LONG_CATALOG_JSON[i : i + 10] for i in range(0, len(LONG_CATALOG_JSON), 10)]
+
+    def parse() -> IncrementalJsonParser:
+        parser = IncrementalJsonParser()
+        for chunk in chunks:
+            parser.feed(chunk)
+        return parser
+
+    parser = cast(IncrementalJsonParser, benchmark(parse))
+    assert parser.complete
+
+
+GEMINI_RESPONSE = json.dumps(
+    {
+        'candidates': [{'content': {'role': 'model', 'parts': [{'text': 'lorem ipsum ' * 100}]}, 'index': 0}],
+        'usage_metadata': {'prompt_token_count': 1, 'candidates_token_count': 1, 'total_token_count': 2},
+    }
+).encode()
+# about 5MB, in chunks of the size httpx reads
+GEMINI_STREAM = b'[' + b',\r\n'.join([GEMINI_RESPONSE] * 4_000) + b']'
+GEMINI_CHUNKS = [GEMINI_STREAM[i : i + 4096] for i in range(0, len(GEMINI_STREAM), 4096)]
+
+
+class GeminiStream(httpx.AsyncByteStream):
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in GEMINI_CHUNKS:
+            yield chunk
+
+
+def test_gemini_stream(run_async: RunAsync):
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(lambda _: httpx.Response(200, stream=GeminiStream())))
+    model = GeminiModel('gemini-1.5-flash', provider=GoogleGLAProvider(api_key='test', http_client=http_client))
+    agent = Agent(model)
+
+    async def run() -> int:
+        chunks = 0
+        async with agent.run_stream('Hello') as result:
+            async for _ in result.stream_text(delta=True, debounce_by=None):
+                chunks += 1
+        return chunks
+
+    assert run_async(run) == 4_000
+
+
+def mistral_event(content: str) -> CompletionEvent:
+    return CompletionEvent(
+        data=CompletionChunk(
+            id='x',
+            model='mistral-large-latest',
+            created=1704067200,
+            choices=[
+                CompletionResponseStreamChoice(
+                    index=0, delta=DeltaMessage(role='assistant', content=content), finish_reason=None
+                )
+            ],
+        )
+    )
+
+
+# Mistral streams structured output as JSON text, in tokens of a few characters
+MISTRAL_EVENTS = [mistral_event(LONG_CATALOG_JSON[i : i + 10]) for i in range(0, len(LONG_CATALOG_JSON), 10)]
+
+
+class MockMistralStream:
+    async def __aenter__(self) -> MockMistralStream:
+        return self
+
+    async def __aexit__(self, *_args: Any) -> None:
+        pass
+
+    async def __aiter__(self) -> AsyncIterator[CompletionEvent]:
+        for event in MISTRAL_EVENTS:
+            yield event
+
+
+class MockMistralChat:
+    """Just enough of the Mistral client to stream the events, without its deserialization of each one."""
+
+    async def stream_async(self, **_kwargs: Any) -> MockMistralStream:
+        return MockMistralStream()
+
+
+def test_mistral_stream_structured(run_async: RunAsync):
+    """A long structured output in Mistral's JSON mode, where the output tool call is parsed from the text."""
+    client = cast(Mistral, SimpleNamespace(chat=MockMistralChat()))
+    agent = Agent(
+        MistralModel('mistral-large-latest', provider=MistralProvider(mistral_client=client)), output_type=Catalog
+    )
+
+    async def run() -> Catalog:
+        async with agent.run_stream('Hello') as result:
+            # the structured responses aren't validated, so this measures the handling of the stream by the model
+            async for _ in result.stream_structured(debounce_by=None):
+                pass
+            return await result.get_output()
+
+    assert len(run_async(run).items) == 1_000
+
+
+def test_parts_manager_text_deltas(benchmark: BenchmarkFixture):
+    def handle_deltas() -> ModelResponsePartsManager:
+        manager = ModelResponsePartsManager()
+        for _ in range(DELTAS):
+            manager.handle_text_delta(vendor_part_id='content', content='token ')
+        return manager
+
+    manager = cast(ModelResponsePartsManager, benchmark(handle_deltas))
+    assert len(manager.get_parts()) == 1
+
+
+def test_parts_manager_tool_call_deltas(benchmark: BenchmarkFixture):
+    def handle_deltas() -> ModelResponsePartsManager:
+        manager = ModelResponsePartsManager()
+        for i in range(DELTAS):
+            # interleave the deltas of ten tool calls streamed concurrently, as some models do
+            manager.handle_tool_call_delta(
+                vendor_part_id=i % 10,
+                tool_name='tool' if i < 10 else None,
+                args='"x' if i < 10 else 'x',
+                tool_call_id=None,
+            )
+        return manager
+
+    manager = cast(ModelResponsePartsManager, benchmark(handle_deltas))
+    assert len(manager.get_parts()) == 10
+
+
+def test_output_schema_partial_validation(benchmark: BenchmarkFixture):
+    """Validating the output after each chunk of a streamed structured response, as `run_stream` does."""
+    tool = OutputSchemaTool(output_type=Catalog, name='final_result', description=None, multiple=False, strict=None)
+    prefixes = [CATALOG_JSON[:i] for i in range(100, len(CATALOG_JSON), 100)]
+
+    def validate() -> Catalog:
+        output = Catalog(items=[])
+        for args in prefixes:
+            output = tool.validate(ToolCallPart('final_result', args), allow_partial=True, wrap_validation_errors=False)
+        return output
+
+    output = cast(Catalog, benchmark(validate))
+    assert 0 < len(output.items) <= 50
+
+
+def test_output_schema_validation(benchmark: BenchmarkFixture):
+    tool = OutputSchemaTool(output_type=Catalog, name='final_result', description=None, multiple=False, strict=None)
+    tool_call = ToolCallPart('final_result', json.loads(CATALOG_JSON))
+    output = cast(Catalog, benchmark(tool.validate, tool_call))
+    assert len(output.items) == 50
@@ -2,13 +2,18 @@ from __future__ import annotations as _annotations
 
 import asyncio
 import dataclasses
+import functools
 import hashlib
+import inspect
 from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
-from contextlib import asynccontextmanager, contextmanager
+from concurrent.futures import Executor
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
 from contextvars import ContextVar
 from dataclasses import field
+from time import perf_counter
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Union, cast
 
+import anyio
 from opentelemetry.trace import Tracer
 from typing_extensions import TypeGuard, TypeVar, assert_never
 
@@ -24,8 +29,11 @@ from . import (
     result,
     usage as _usage,
 )
+from .cache import CacheBackend
+from .history_processors import HistoryProcessor
 from .result import OutputDataT, ToolOutput
 from .settings import ModelSettings, merge_model_settings
+from .timing import RunTiming, StepTiming
 from .tools import RunContext, Tool, ToolDefinition
 
 if TYPE_CHECKING:
@@ -63,6 +71,9 @@ class GraphAgentState:
     usage: _usage.Usage
     retries: int
     run_step: int
+    tool_retries: dict[str, int] = dataclasses.field(default_factory=dict)
+    """Number of retries for each function tool in this run, kept here so tools can be shared between runs."""
+    timing: RunTiming = dataclasses.field(default_factory=RunTiming)
 
     def increment_retries(self, max_result_retries: int) -> None:
         self.retries += 1
@@ -94,9 +105,18 @@ class GraphAgentDeps(Generic[DepsT, OutputDataT]):
     function_tools: dict[str, Tool[DepsT]] = dataclasses.field(repr=False)
     mcp_servers: Sequence[MCPServer] = dataclasses.field(repr=False)
     default_retries: int
+    max_concurrent_tool_calls: int | None
+    tool_concurrency_limiter: anyio.CapacityLimiter | None
+    get_process_pool: Callable[[], Executor | None]
+    tool_cache: CacheBackend | None
+    speculative_tool_calls: bool
+    history_processors: Sequence[HistoryProcessor]
 
     tracer: Tracer
 
+    mcp_tool_servers: dict[str, MCPServer] = dataclasses.field(default_factory=dict, repr=False)
+    """Index of MCP tool names to the server providing them, rebuilt each time tools are listed."""
+
 
 class AgentNode(BaseNode[GraphAgentState, GraphAgentDeps[DepsT, Any], result.FinalResult[NodeRunEndT]]):
     """The base class for all agent nodes.
@@ -135,7 +155,11 @@ class UserPromptNode(AgentNode[DepsT, NodeRunEndT]):
     async def run(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
     ) -> ModelRequestNode[DepsT, NodeRunEndT]:
-        return ModelRequestNode[DepsT, NodeRunEndT](request=await self._get_first_message(ctx))
+        start = perf_counter()
+        try:
+            return ModelRequestNode[DepsT, NodeRunEndT](request=await self._get_first_message(ctx))
+        finally:
+            ctx.state.timing.prompt_preparation += perf_counter() - start
 
     async def _get_first_message(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
@@ -146,11 +170,6 @@ class UserPromptNode(AgentNode[DepsT, NodeRunEndT]):
         )
         ctx.state.message_history = history
         run_context.messages = history
-
-        # TODO: We need to make it so that function_tools are not shared between runs
-        #   See comment on the current_retry field of `Tool` for more details.
-        for tool in ctx.deps.function_tools.values():
-            tool.current_retry = 0
         return next_message
 
     async def _prepare_messages(
@@ -223,21 +242,24 @@ async def _prepare_request_parameters(
     run_context = build_run_context(ctx)
 
     async def add_tool(tool: Tool[DepsT]) -> None:
-        ctx = run_context.replace_with(retry=tool.current_retry, tool_name=tool.name)
+        ctx = run_context.replace_with(retry=run_context.retries.get(tool.name, 0), tool_name=tool.name)
         if tool_def := await tool.prepare_tool_def(ctx):
             function_tool_defs.append(tool_def)
 
-    async def add_mcp_server_tools(server: MCPServer) -> None:
+    async def add_mcp_server_tools(server: MCPServer) -> tuple[MCPServer, list[ToolDefinition]]:
         if not server.is_running:
             raise exceptions.UserError(f'MCP server is not running: {server}')
         tool_defs = await server.list_tools()
         # TODO(Marcelo): We should check if the tool names are unique. If not, we should raise an error.
         function_tool_defs.extend(tool_defs)
+        return server, tool_defs
 
-    await asyncio.gather(
-        *map(add_tool, ctx.deps.function_tools.values()),
-        *map(add_mcp_server_tools, ctx.deps.mcp_servers),
+    _, mcp_server_tools = await asyncio.gather(
+        asyncio.gather(*map(add_tool, ctx.deps.function_tools.values())),
+        asyncio.gather(*map(add_mcp_server_tools, ctx.deps.mcp_servers)),
     )
+    if mcp_server_tools:
+        ctx.deps.mcp_tool_servers = _mcp_tool_servers_index(mcp_server_tools)
 
     output_schema = ctx.deps.output_schema
     return models.ModelRequestParameters(
@@ -255,6 +277,7 @@ class ModelRequestNode(AgentNode[DepsT, NodeRunEndT]):
 
     _result: CallToolsNode[DepsT, NodeRunEndT] | None = field(default=None, repr=False)
     _did_stream: bool = field(default=False, repr=False)
+    _speculative_tool_calls: _SpeculativeToolCalls[DepsT] | None = field(default=None, repr=False)
 
     async def run(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
@@ -295,18 +318,34 @@ class ModelRequestNode(AgentNode[DepsT, NodeRunEndT]):
     ) -> AsyncIterator[models.StreamedResponse]:
         assert not self._did_stream, 'stream() should only be called once per node'
 
-        model_settings, model_request_parameters = await self._prepare_request(ctx)
+        messages, model_settings, model_request_parameters = await self._prepare_request(ctx)
         model_request_parameters = ctx.deps.model.customize_request_parameters(model_request_parameters)
+        step_timing = ctx.state.timing.step(ctx.state.run_step)
+        start = perf_counter()
         async with ctx.deps.model.request_stream(
-            ctx.state.message_history, model_settings, model_request_parameters
+            messages, model_settings, model_request_parameters
         ) as streamed_response:
+            step_timing.time_to_first_token = perf_counter() - start
             self._did_stream = True
             ctx.state.usage.incr(_usage.Usage(), requests=1)
-            yield streamed_response
-            # In case the user didn't manually consume the full stream, ensure it is fully consumed here,
-            # otherwise usage won't be properly counted:
-            async for _ in streamed_response:
-                pass
+            if ctx.deps.speculative_tool_calls:
+                self._speculative_tool_calls = speculative = _SpeculativeToolCalls[DepsT](
+                    _tool_call_limiters(ctx), step_timing
+                )
+                streamed_response.on_tool_call_complete = functools.partial(
+                    speculative.start, build_run_context(ctx), ctx.deps
+                )
+            try:
+                yield streamed_response
+                # In case the user didn't manually consume the full stream, ensure it is fully consumed here,
+                # otherwise usage won't be properly counted:
+                async for _ in streamed_response:
+                    pass
+            except BaseException:
+                if self._speculative_tool_calls is not None:
+                    self._speculative_tool_calls.cancel()
+                raise
+        step_timing.model_request = perf_counter() - start
         model_response = streamed_response.get()
         request_usage = streamed_response.usage()
 
@@ -319,18 +358,19 @@ class ModelRequestNode(AgentNode[DepsT, NodeRunEndT]):
         if self._result is not None:
             return self._result
 
-        model_settings, model_request_parameters = await self._prepare_request(ctx)
+        messages, model_settings, model_request_parameters = await self._prepare_request(ctx)
         model_request_parameters = ctx.deps.model.customize_request_parameters(model_request_parameters)
-        model_response, request_usage = await ctx.deps.model.request(
-            ctx.state.message_history, model_settings, model_request_parameters
-        )
+        start = perf_counter()
+        model_response, request_usage = await ctx.deps.model.request(messages, model_settings, model_request_parameters)
+        ctx.state.timing.step(ctx.state.run_step).model_request = perf_counter() - start
         ctx.state.usage.incr(_usage.Usage(), requests=1)
 
         return self._finish_handling(ctx, model_response, request_usage)
 
     async def _prepare_request(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
-    ) -> tuple[ModelSettings | None, models.ModelRequestParameters]:
+    ) -> tuple[list[_messages.ModelMessage], ModelSettings | None, models.ModelRequestParameters]:
+        start = perf_counter()
         ctx.state.message_history.append(self.request)
 
         # Check usage
@@ -342,7 +382,9 @@ class ModelRequestNode(AgentNode[DepsT, NodeRunEndT]):
 
         model_settings = merge_model_settings(ctx.deps.model_settings, None)
         model_request_parameters = await _prepare_request_parameters(ctx)
-        return model_settings, model_request_parameters
+        messages = await _process_message_history(ctx.state.message_history, ctx.deps.history_processors)
+        ctx.state.timing.step(ctx.state.run_step).prepare = perf_counter() - start
+        return messages, model_settings, model_request_parameters
 
     def _finish_handling(
         self,
@@ -359,7 +401,7 @@ class ModelRequestNode(AgentNode[DepsT, NodeRunEndT]):
         ctx.state.message_history.append(response)
 
         # Set the `_result` attribute since we can't use `return` in an async iterator
-        self._result = CallToolsNode(response)
+        self._result = CallToolsNode(response, _speculative_tool_calls=self._speculative_tool_calls)
 
         return self._result
 
@@ -375,6 +417,7 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
         default=None, repr=False
     )
     _tool_responses: list[_messages.ModelRequestPart] = field(default_factory=list, repr=False)
+    _speculative_tool_calls: _SpeculativeToolCalls[DepsT] | None = field(default=None, repr=False)
 
     async def run(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
@@ -396,6 +439,11 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
         async for _event in stream:
             pass
 
+        if isinstance(self._next_node, ModelRequestNode):
+            ctx.state.timing.step(ctx.state.run_step).retries = sum(
+                isinstance(part, _messages.RetryPromptPart) for part in self._next_node.request.parts
+            )
+
     async def _run_stream(
         self, ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]
     ) -> AsyncIterator[_messages.HandleResponseEvent]:
@@ -457,6 +505,7 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
         parts: list[_messages.ModelRequestPart] = []
         if output_schema is not None:
             for call, output_tool in output_schema.find_tool(tool_calls):
+                start = perf_counter()
                 try:
                     result_data = output_tool.validate(call)
                     result_data = await _validate_output(result_data, ctx, call)
@@ -468,6 +517,8 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
                 else:
                     final_result = result.FinalResult(result_data, call.tool_name, call.tool_call_id)
                     break
+                finally:
+                    ctx.state.timing.step(ctx.state.run_step).output_validation += perf_counter() - start
 
         # Then build the other request parts based on end strategy
         tool_responses: list[_messages.ModelRequestPart] = self._tool_responses
@@ -477,6 +528,7 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
             final_result and final_result.tool_call_id,
             ctx,
             tool_responses,
+            self._speculative_tool_calls,
         ):
             yield event
 
@@ -516,6 +568,7 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
         if allow_text_output(output_schema):
             # The following cast is safe because we know `str` is an allowed result type
             result_data_input = cast(NodeRunEndT, text)
+            start = perf_counter()
             try:
                 result_data = await _validate_output(result_data_input, ctx, None)
             except _output.ToolRetryError as e:
@@ -523,6 +576,8 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
                 return ModelRequestNode[DepsT, NodeRunEndT](_messages.ModelRequest(parts=[e.tool_retry]))
             else:
                 return self._handle_final_result(ctx, result.FinalResult(result_data, None, None), [])
+            finally:
+                ctx.state.timing.step(ctx.state.run_step).output_validation += perf_counter() - start
         else:
             ctx.state.increment_retries(ctx.deps.max_result_retries)
             return ModelRequestNode[DepsT, NodeRunEndT](
@@ -536,6 +591,23 @@ class CallToolsNode(AgentNode[DepsT, NodeRunEndT]):
             )
 
 
+async def _process_message_history(
+    messages: list[_messages.ModelMessage], processors: Sequence[HistoryProcessor]
+) -> list[_messages.ModelMessage]:
+    """Run the history processors over a copy of the message history, to get the messages to send to the model."""
+    if not processors:
+        return messages
+    messages = list(messages)
+    for processor in processors:
+        processed = processor(messages)
+        if inspect.isawaitable(processed):
+            processed = await processed
+        messages = processed
+    if not messages:
+        raise exceptions.UserError('History processors returned no messages to send to the model.')
+    return messages
+
+
 def build_run_context(ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, Any]]) -> RunContext[DepsT]:
     """Build a `RunContext` object from the current agent graph run context."""
     return RunContext[DepsT](
@@ -544,6 +616,7 @@ def build_run_context(ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT
         usage=ctx.state.usage,
         prompt=ctx.deps.prompt,
         messages=ctx.state.message_history,
+        retries=ctx.state.tool_retries,
         run_step=ctx.state.run_step,
     )
 
@@ -555,19 +628,41 @@ def multi_modal_content_identifier(identifier: str | bytes) -> str:
     return hashlib.sha1(identifier).hexdigest()[:6]
 
 
-async def process_function_tools(  # noqa C901
+async def process_function_tools(
     tool_calls: list[_messages.ToolCallPart],
     output_tool_name: str | None,
     output_tool_call_id: str | None,
     ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]],
     output_parts: list[_messages.ModelRequestPart],
+    speculative_tool_calls: _SpeculativeToolCalls[DepsT] | None = None,
 ) -> AsyncIterator[_messages.HandleResponseEvent]:
     """Process function (i.e., non-result) tool calls in parallel.
 
     Also add stub return parts for any other tools that need it.
 
     Because async iterators can't have return values, we use `output_parts` as an output argument.
+
+    Tool calls already started in `speculative_tool_calls` while the response was streaming are reused, the
+    others are cancelled.
     """
+    try:
+        async for event in _process_function_tools(
+            tool_calls, output_tool_name, output_tool_call_id, ctx, output_parts, speculative_tool_calls
+        ):
+            yield event
+    finally:
+        if speculative_tool_calls is not None:
+            speculative_tool_calls.cancel()
+
+
+async def _process_function_tools(  # noqa C901
+    tool_calls: list[_messages.ToolCallPart],
+    output_tool_name: str | None,
+    output_tool_call_id: str | None,
+    ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]],
+    output_parts: list[_messages.ModelRequestPart],
+    speculative_tool_calls: _SpeculativeToolCalls[DepsT] | None,
+) -> AsyncIterator[_messages.HandleResponseEvent]:
     stub_function_tools = bool(output_tool_name) and ctx.deps.end_strategy == 'early'
     output_schema = ctx.deps.output_schema
 
@@ -652,8 +747,16 @@ async def process_function_tools(  # noqa C901
             'logfire.msg': f'running {len(calls_to_run)} tool{"" if len(calls_to_run) == 1 else "s"}',
         },
     ):
+        if speculative_tool_calls is not None:
+            limiters = speculative_tool_calls.limiters
+        else:
+            limiters = _tool_call_limiters(ctx)
         tasks = [
-            asyncio.create_task(tool.run(call, run_context, ctx.deps.tracer), name=call.tool_name)
+            (speculative_tool_calls and speculative_tool_calls.take(call))
+            or asyncio.create_task(
+                _run_tool(tool, call, run_context, ctx.deps, limiters, ctx.state.timing.step(ctx.state.run_step)),
+                name=call.tool_name,
+            )
             for tool, call in calls_to_run
         ]
 
@@ -713,11 +816,94 @@ async def process_function_tools(  # noqa C901
     output_parts.extend(user_parts)
 
 
+def _tool_call_limiters(
+    ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, Any]],
+) -> list[anyio.CapacityLimiter | None]:
+    """Build the limiters shared by the tool calls of one model response."""
+    limiters = [ctx.deps.tool_concurrency_limiter]
+    if ctx.deps.max_concurrent_tool_calls is not None:
+        limiters.append(anyio.CapacityLimiter(ctx.deps.max_concurrent_tool_calls))
+    return limiters
+
+
+@dataclasses.dataclass
+class _SpeculativeToolCalls(Generic[DepsT]):
+    """Function tool calls started while the model response is still streaming, see `Agent.speculative_tool_calls`."""
+
+    limiters: list[anyio.CapacityLimiter | None]
+    """The limiters shared by all the tool calls of the response, including those started later."""
+    step_timing: StepTiming
+    """The timing of the step the tool calls are made in."""
+    tasks: dict[
+        str, tuple[_messages.ToolCallPart, asyncio.Task[_messages.ToolReturnPart | _messages.RetryPromptPart]]
+    ] = field(default_factory=dict)
+
+    def start(
+        self, run_context: RunContext[DepsT], deps: GraphAgentDeps[DepsT, Any], call: _messages.ToolCallPart
+    ) -> None:
+        """Start running a complete tool call, if it calls a function tool."""
+        if (tool := deps.function_tools.get(call.tool_name)) is not None:
+            task = asyncio.create_task(
+                _run_tool(tool, call, run_context, deps, self.limiters, self.step_timing), name=call.tool_name
+            )
+            self.tasks[call.tool_call_id] = call, task
+
+    def take(
+        self, call: _messages.ToolCallPart
+    ) -> asyncio.Task[_messages.ToolReturnPart | _messages.RetryPromptPart] | None:
+        """Get the task started for a tool call, unless the call changed after it was started."""
+        started = self.tasks.pop(call.tool_call_id, None)
+        if started is None:
+            return None
+        started_call, task = started
+        if started_call != call:
+            task.cancel()
+            return None
+        return task
+
+    def cancel(self) -> None:
+        """Cancel the tool calls which haven't been taken."""
+        for _, task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+
+async def _run_tool(
+    tool: Tool[DepsT],
+    call: _messages.ToolCallPart,
+    run_context: RunContext[DepsT],
+    deps: GraphAgentDeps[DepsT, Any],
+    limiters: Sequence[anyio.CapacityLimiter | None],
+    step_timing: StepTiming,
+) -> _messages.ToolReturnPart | _messages.RetryPromptPart:
+    """Run a tool once a slot is free in the tool's own limiter and in each of `limiters`.
+
+    The tool's limiter is acquired first, so calls waiting on a busy tool don't hold slots other tools could use.
+    The time spent running the tool, not counting the wait for the limiters, is added to `step_timing`.
+    """
+    stack = AsyncExitStack()
+    try:
+        for limiter in (tool.concurrency_limiter, *limiters):
+            if limiter is not None:
+                await stack.enter_async_context(limiter)
+        process_pool = deps.get_process_pool() if tool.executor == 'process' else None
+        start = perf_counter()
+        try:
+            return await tool.run(call, run_context, deps.tracer, process_pool, deps.tool_cache)
+        finally:
+            step_timing.tools[tool.name] = step_timing.tools.get(tool.name, 0.0) + perf_counter() - start
+    finally:
+        await stack.aclose()
+
+
 async def _tool_from_mcp_server(
     tool_name: str,
     ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]],
 ) -> Tool[DepsT] | None:
-    """Call each MCP server to find the tool with the given name.
+    """Find the MCP server providing the tool with the given name.
+
+    The server is looked up in the index built when the tools were last listed for a model request, the servers are
+    only asked for their tools again if the name isn't found there.
 
     Args:
         tool_name: The name of the tool to find.
@@ -726,6 +912,15 @@ async def _tool_from_mcp_server(
     Returns:
         The tool with the given name, or `None` if no tool with the given name is found.
     """
+    if not ctx.deps.mcp_servers:
+        return None
+
+    server = ctx.deps.mcp_tool_servers.get(tool_name)
+    if server is None:
+        await _index_mcp_server_tools(ctx)
+        server = ctx.deps.mcp_tool_servers.get(tool_name)
+        if server is None:
+            return None
 
     async def run_tool(ctx: RunContext[DepsT], **args: Any) -> Any:
         # There's no normal situation where the server will not be running at this point, we check just in case
@@ -735,11 +930,28 @@ async def _tool_from_mcp_server(
         result = await server.call_tool(tool_name, args)
         return result
 
-    for server in ctx.deps.mcp_servers:
-        tools = await server.list_tools()
-        if tool_name in {tool.name for tool in tools}:
-            return Tool(name=tool_name, function=run_tool, takes_ctx=True, max_retries=ctx.deps.default_retries)
-    return None
+    return Tool(name=tool_name, function=run_tool, takes_ctx=True, max_retries=ctx.deps.default_retries)
+
+
+async def _index_mcp_server_tools(ctx: GraphRunContext[GraphAgentState, GraphAgentDeps[DepsT, NodeRunEndT]]) -> None:
+    """List the tools of every running MCP server and rebuild the tool name index from them."""
+
+    async def list_server_tools(server: MCPServer) -> tuple[MCPServer, list[ToolDefinition]]:
+        return server, await server.list_tools()
+
+    servers = [server for server in ctx.deps.mcp_servers if server.is_running]
+    ctx.deps.mcp_tool_servers = _mcp_tool_servers_index(await asyncio.gather(*map(list_server_tools, servers)))
+
+
+def _mcp_tool_servers_index(
+    server_tools: Sequence[tuple[MCPServer, list[ToolDefinition]]],
+) -> dict[str, MCPServer]:
+    """Map each tool name to the server providing it, the first server wins if several provide the same name."""
+    index: dict[str, MCPServer] = {}
+    for server, tool_defs in server_tools:
+        for tool_def in tool_defs:
+            index.setdefault(tool_def.name, server)
+    return index
 
 
 def _unknown_tool(
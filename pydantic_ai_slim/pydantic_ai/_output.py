@@ -1,7 +1,7 @@
 from __future__ import annotations as _annotations
 
 import inspect
-from collections.abc import Awaitable, Iterable, Iterator
+from collections.abc import Awaitable, Hashable, Iterable, Iterator
 from dataclasses import dataclass, field
 from typing import Any, Callable, Generic, Literal, Union, cast
 
@@ -171,6 +171,8 @@ DEFAULT_DESCRIPTION = 'The final response which ends this conversation'
 class OutputSchemaTool(Generic[OutputDataT]):
     tool_def: ToolDefinition
     type_adapter: TypeAdapter[Any]
+    _python_partial_args_invalid: bool = field(default=False, repr=False, compare=False)
+    """Whether partial arguments failed python validation which their JSON passed, e.g. for strict models."""
 
     def __init__(
         self, *, output_type: type[OutputDataT], name: str, description: str | None, multiple: bool, strict: bool | None
@@ -216,7 +218,11 @@ class OutputSchemaTool(Generic[OutputDataT]):
         )
 
     def validate(
-        self, tool_call: _messages.ToolCallPart, allow_partial: bool = False, wrap_validation_errors: bool = True
+        self,
+        tool_call: _messages.ToolCallPart,
+        allow_partial: bool = False,
+        wrap_validation_errors: bool = True,
+        partial_args: dict[str, Any] | None = None,
     ) -> OutputDataT:
         """Validate an output message.
 
@@ -224,16 +230,31 @@ class OutputSchemaTool(Generic[OutputDataT]):
             tool_call: The tool call from the LLM to validate.
             allow_partial: If true, allow partial validation.
             wrap_validation_errors: If true, wrap the validation errors in a retry message.
+            partial_args: The arguments of the tool call parsed incrementally while it's streamed, validated instead
+                of parsing the JSON arguments again if `allow_partial` is true.
 
         Returns:
             Either the validated output data (left) or a retry message (right).
         """
         try:
             pyd_allow_partial: Literal['off', 'trailing-strings'] = 'trailing-strings' if allow_partial else 'off'
-            if isinstance(tool_call.args, str):
-                output = self.type_adapter.validate_json(tool_call.args, experimental_allow_partial=pyd_allow_partial)
-            else:
-                output = self.type_adapter.validate_python(tool_call.args, experimental_allow_partial=pyd_allow_partial)
+            output: Any = _utils.UNSET
+            tried_partial_args = False
+            if allow_partial and partial_args is not None and not self._python_partial_args_invalid:
+                output = self._validate_partial_args(partial_args)
+                tried_partial_args = True
+            if isinstance(output, _utils.Unset):
+                if isinstance(tool_call.args, str):
+                    output = self.type_adapter.validate_json(
+                        tool_call.args, experimental_allow_partial=pyd_allow_partial
+                    )
+                else:
+                    output = self.type_adapter.validate_python(
+                        tool_call.args, experimental_allow_partial=pyd_allow_partial
+                    )
+                if tried_partial_args:
+                    # python validation rejects arguments JSON validation accepts, so don't try it on later ticks
+                    self._python_partial_args_invalid = True
         except ValidationError as e:
             if wrap_validation_errors:
                 m = _messages.RetryPromptPart(
@@ -249,6 +270,38 @@ class OutputSchemaTool(Generic[OutputDataT]):
                 output = output[k]
             return output
 
+    def _validate_partial_args(self, partial_args: dict[str, Any]) -> Any:
+        try:
+            return self.type_adapter.validate_python(partial_args, experimental_allow_partial='trailing-strings')
+        except ValidationError:
+            # validating python objects is stricter than validating JSON in places, e.g. for strict models,
+            # so leave it to JSON validation to decide whether the arguments are invalid
+            return _utils.UNSET
+
+
+def output_type_cache_key(output_type: type[Any] | ToolOutput[Any]) -> Hashable | None:
+    """Build a key to cache objects derived from an output type, or `None` if the output type can't be used as one.
+
+    `ToolOutput` isn't hashable since it's a plain dataclass, so we use its fields instead.
+    """
+    key: Hashable
+    if isinstance(output_type, ToolOutput):
+        key = (
+            ToolOutput,
+            output_type.output_type,
+            output_type.name,
+            output_type.description,
+            output_type.strict,
+        )
+    else:
+        key = output_type
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    else:
+        return key
+
 
 def union_tool_name(base_name: str | None, union_arg: Any) -> str:
     return f'{base_name or DEFAULT_OUTPUT_TOOL_NAME}_{union_arg_name(union_arg)}'
@@ -0,0 +1,323 @@
+"""Incremental parsing of JSON documents which are streamed in chunks, e.g. the arguments of a tool call.
+
+Parsing the whole document each time a chunk is received makes streaming a long document quadratic in its length,
+so `IncrementalJsonParser` only parses each new chunk, and keeps the values parsed so far.
+"""
+
+from __future__ import annotations as _annotations
+
+import re
+from typing import Any, Union
+
+from ._utils import UNSET, Unset
+
+__all__ = ('IncrementalJsonParser',)
+
+# what the parser expects next
+_VALUE = 0
+_ARRAY_START = 1
+_OBJECT_START = 2
+_KEY = 3
+_COLON = 4
+_AFTER_VALUE = 5
+_STRING = 6
+_KEY_STRING = 7
+_DONE = 8
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_SPECIAL = re.compile(r'["\\\x00-\x1f]')
+_NUMBER_CHARS = re.compile(r'[-+0-9.eE]*')
+_NUMBER = re.compile(r'-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+_LITERALS: dict[str, tuple[str, Any]] = {'t': ('true', True), 'f': ('false', False), 'n': ('null', None)}
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+_Container = Union[list[Any], dict[str, Any]]
+
+
+class _InvalidJson(ValueError):
+    pass
+
+
+class IncrementalJsonParser:
+    """Parse a JSON document fed in chunks, so each character is only parsed once.
+
+    `value` gives the document parsed so far, matching `pydantic_core.from_json` with
+    `allow_partial='trailing-strings'` on the text fed so far:
+    incomplete strings are included, while incomplete numbers, literals, keys and escape sequences are left out.
+
+    The parser gives up on input it doesn't expect, including JSON extensions like `NaN`, setting `failed`, so callers
+    can fall back to parsing the whole document, which reports the error.
+    """
+
+    length: int
+    """Number of characters fed to the parser."""
+    failed: bool
+    """Whether the parser has given up, e.g. because the document isn't valid JSON."""
+
+    def __init__(self) -> None:
+        self.length = 0
+        self.failed = False
+        self._state = _VALUE
+        # the start of an incomplete token, i.e. a number, literal or escape sequence in a string
+        self._buffer = ''
+        # the decoded chunks of the string being parsed
+        self._chunks: list[str] = []
+        # the open containers, outermost first, and the key being parsed in each, if it's an object
+        self._containers: list[_Container] = []
+        self._keys: list[str] = []
+        self._root: Any = UNSET
+        self._value: Any = UNSET
+
+    @property
+    def complete(self) -> bool:
+        """Whether the document is complete, i.e. nothing more than whitespace can follow."""
+        return self._state == _DONE and not self.failed
+
+    def feed(self, text: str) -> None:
+        """Parse the next chunk of the document."""
+        self.length += len(text)
+        self._value = UNSET
+        if self.failed or not text:
+            return
+        if self._buffer:
+            text = self._buffer + text
+            self._buffer = ''
+        try:
+            self._parse(text)
+        except _InvalidJson:
+            self.failed = True
+
+    @property
+    def value(self) -> Any | Unset:
+        """The document parsed so far, or `UNSET` if there's no value yet.
+
+        Containers which are still open are copied, so the value doesn't change as more chunks are fed.
+        """
+        if self.failed:
+            return UNSET
+        if isinstance(self._value, Unset):
+            self._value = self._snapshot()
+        return self._value
+
+    def _snapshot(self) -> Any:
+        pending = self._pending()
+        containers = self._containers
+        if not containers:
+            return self._root if self._state == _DONE else pending
+
+        inner = containers[-1]
+        inner = list(inner) if isinstance(inner, list) else dict(inner)
+        if not isinstance(pending, Unset):
+            if isinstance(inner, list):
+                inner.append(pending)
+            else:
+                inner[self._keys[-1]] = pending
+        for i in range(len(containers) - 2, -1, -1):
+            outer = containers[i]
+            if isinstance(outer, list):
+                outer = list(outer)
+                outer[-1] = inner
+            else:
+                outer = dict(outer)
+                outer[self._keys[i]] = inner
+            inner = outer
+        return inner
+
+    def _pending(self) -> Any:
+        """The incomplete value at the end of the document, if it would be included in a partial parse."""
+        if self._state == _STRING:
+            if self._buffer:
+                # like `from_json`, leave out strings ending with an incomplete escape sequence
+                return UNSET
+            if len(self._chunks) > 1:
+                self._chunks = [''.join(self._chunks)]
+            return self._chunks[0] if self._chunks else ''
+        elif self._state in (_VALUE, _ARRAY_START) and self._buffer and _NUMBER.fullmatch(self._buffer):
+            return _parse_number(self._buffer)
+        else:
+            return UNSET
+
+    def _parse(self, text: str) -> None:  # noqa: C901
+        pos = 0
+        end = len(text)
+        while pos < end:
+            state = self._state
+            if state == _STRING or state == _KEY_STRING:
+                pos = self._parse_string(text, pos)
+                continue
+
+            pos = _WHITESPACE.match(text, pos).end()  # pyright: ignore[reportOptionalMemberAccess]
+            if pos == end:
+                return
+            char = text[pos]
+
+            if state == _VALUE or state == _ARRAY_START:
+                if char == ']' and state == _ARRAY_START:
+                    self._close()
+                    pos += 1
+                elif char == '"':
+                    self._state = _STRING
+                    pos += 1
+                elif char == '{':
+                    self._open({})
+                    pos += 1
+                elif char == '[':
+                    self._open([])
+                    pos += 1
+                elif char in _LITERALS:
+                    literal, value = _LITERALS[char]
+                    token = text[pos : pos + len(literal)]
+                    if token == literal:
+                        self._add(value)
+                        pos += len(literal)
+                    elif pos + len(token) == end and literal.startswith(token):
+                        self._buffer = token
+                        return
+                    else:
+                        raise _InvalidJson
+                elif char == '-' or '0' <= char <= '9':
+                    number_end = _NUMBER_CHARS.match(text, pos).end()  # pyright: ignore[reportOptionalMemberAccess]
+                    if number_end == end:
+                        # the number may continue in the next chunk
+                        self._buffer = text[pos:]
+                        return
+                    token = text[pos:number_end]
+                    if not _NUMBER.fullmatch(token):
+                        raise _InvalidJson
+                    self._add(_parse_number(token))
+                    pos = number_end
+                else:
+                    raise _InvalidJson
+            elif state == _OBJECT_START or state == _KEY:
+                if char == '"':
+                    self._state = _KEY_STRING
+                elif char == '}' and state == _OBJECT_START:
+                    self._close()
+                else:
+                    raise _InvalidJson
+                pos += 1
+            elif state == _COLON:
+                if char != ':':
+                    raise _InvalidJson
+                self._state = _VALUE
+                pos += 1
+            elif state == _AFTER_VALUE:
+                container = self._containers[-1]
+                if char == ',':
+                    self._state = _VALUE if isinstance(container, list) else _KEY
+                elif char == (']' if isinstance(container, list) else '}'):
+                    self._close()
+                else:
+                    raise _InvalidJson
+                pos += 1
+            else:
+                # only whitespace can follow a complete document
+                raise _InvalidJson
+
+    def _parse_string(self, text: str, pos: int) -> int:
+        """Parse the string being parsed up to its end or the end of the text, returning the position after it."""
+        chunks = self._chunks
+        end = len(text)
+        while True:
+            match = _STRING_SPECIAL.search(text, pos)
+            if match is None:
+                if pos < end:
+                    chunks.append(text[pos:])
+                return end
+            special = match.start()
+            if special > pos:
+                chunks.append(text[pos:special])
+            char = text[special]
+            if char == '"':
+                self._end_string()
+                return special + 1
+            elif char != '\\':
+                # control characters must be escaped
+                raise _InvalidJson
+
+            escape = text[special + 1 : special + 2]
+            if escape == 'u':
+                code, pos = self._parse_unicode_escape(text, special)
+                if code is None:
+                    self._buffer = text[special:]
+                    return end
+                chunks.append(chr(code))
+            elif escape in _ESCAPES:
+                chunks.append(_ESCAPES[escape])
+                pos = special + 2
+            elif not escape:
+                self._buffer = text[special:]
+                return end
+            else:
+                raise _InvalidJson
+
+    @staticmethod
+    def _parse_unicode_escape(text: str, start: int) -> tuple[int | None, int]:
+        """Parse a unicode escape sequence, or a surrogate pair of them, or return `None` if it's incomplete."""
+        hex_digits = text[start + 2 : start + 6]
+        if len(hex_digits) < 4:
+            if not _HEX4.fullmatch(hex_digits.ljust(4, '0')):
+                raise _InvalidJson
+            return None, start
+        if not _HEX4.fullmatch(hex_digits):
+            raise _InvalidJson
+        code = int(hex_digits, 16)
+        if 0xDC00 <= code < 0xE000:
+            raise _InvalidJson
+        elif code < 0xD800 or code >= 0xE000:
+            return code, start + 6
+
+        # a high surrogate, which must be followed by a low one
+        low = text[start + 6 : start + 12]
+        if len(low) < 6:
+            if not '\\u'.startswith(low[:2]) or not _HEX4.fullmatch(low[2:].ljust(4, '0')):
+                raise _InvalidJson
+            return None, start
+        if not low.startswith('\\u') or not _HEX4.fullmatch(low[2:]):
+            raise _InvalidJson
+        low_code = int(low[2:], 16)
+        if not 0xDC00 <= low_code < 0xE000:
+            raise _InvalidJson
+        return 0x10000 + ((code - 0xD800) << 10) + (low_code - 0xDC00), start + 12
+
+    def _end_string(self) -> None:
+        chunks = self._chunks
+        string = chunks[0] if len(chunks) == 1 else ''.join(chunks)
+        self._chunks = []
+        if self._state == _KEY_STRING:
+            self._keys[-1] = string
+            self._state = _COLON
+        else:
+            self._add(string)
+
+    def _add(self, value: Any) -> None:
+        if not self._containers:
+            self._root = value
+            self._state = _DONE
+            return
+        container = self._containers[-1]
+        if isinstance(container, list):
+            container.append(value)
+        else:
+            container[self._keys[-1]] = value
+        self._state = _AFTER_VALUE
+
+    def _open(self, container: _Container) -> None:
+        self._add(container)
+        self._containers.append(container)
+        self._keys.append('')
+        self._state = _ARRAY_START if isinstance(container, list) else _OBJECT_START
+
+    def _close(self) -> None:
+        self._containers.pop()
+        self._keys.pop()
+        self._state = _AFTER_VALUE if self._containers else _DONE
+
+
+def _parse_number(token: str) -> int | float:
+    match = _NUMBER.fullmatch(token)
+    assert match is not None
+    if match.group(1) is None and match.group(2) is None:
+        return int(token)
+    return float(token)
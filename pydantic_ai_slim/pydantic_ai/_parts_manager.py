@@ -14,9 +14,11 @@ event-emitting logic.
 from __future__ import annotations as _annotations
 
 from collections.abc import Hashable
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Any, Union
 
+import pydantic_core
+
 from pydantic_ai.exceptions import UnexpectedModelBehavior
 from pydantic_ai.messages import (
     ModelResponsePart,
@@ -29,6 +31,7 @@ from pydantic_ai.messages import (
     ToolCallPartDelta,
 )
 
+from ._partial_json import IncrementalJsonParser
 from ._utils import generate_tool_call_id as _generate_tool_call_id
 
 VendorId = Hashable
@@ -52,9 +55,20 @@ class ModelResponsePartsManager:
     """
 
     _parts: list[ManagedPart] = field(default_factory=list, init=False)
-    """A list of parts (text or tool calls) that make up the current state of the model's response."""
+    """A list of parts (text or tool calls) that make up the current state of the model's response.
+
+    Apart from the deltas in `_pending_deltas`, which are applied by `get_parts`.
+    """
     _vendor_id_to_part_index: dict[VendorId, int] = field(default_factory=dict, init=False)
     """Maps a vendor's "part" ID (if provided) to the index in `_parts` where that part resides."""
+    _args_parsers: dict[int, IncrementalJsonParser] = field(default_factory=dict, init=False)
+    """Parsers of the arguments of tool calls streamed as JSON, by the index of the part in `_parts`."""
+    _pending_deltas: dict[int, list[str]] = field(default_factory=dict, init=False)
+    """Text or JSON arguments deltas not yet applied to the part at each index in `_parts`.
+
+    Deltas are only joined onto their parts when the parts are needed, rather than copying the whole content
+    of a part for each delta, which would make streaming a long part quadratic in its length.
+    """
 
     def get_parts(self) -> list[ModelResponsePart]:
         """Return only model response parts that are complete (i.e., not ToolCallPartDelta's).
@@ -62,8 +76,49 @@ class ModelResponsePartsManager:
         Returns:
             A list of ModelResponsePart objects. ToolCallPartDelta objects are excluded.
         """
+        self._apply_pending_deltas()
         return [p for p in self._parts if not isinstance(p, ToolCallPartDelta)]
 
+    def get_completed_tool_calls(self, start: int = 0) -> list[ToolCallPart]:
+        """Return the tool calls which are complete, i.e. a later part has started and their arguments are valid JSON.
+
+        Vendors stream the parts of a response one after another, so once a later part has started, the arguments
+        of the tool calls before it won't change any more. The last part is never considered complete, as more
+        arguments may still be streamed to it.
+
+        Args:
+            start: The index of the first part to consider, so parts already checked aren't checked again.
+
+        Returns:
+            A list of the complete ToolCallPart objects, in the order they appear in the response.
+        """
+        completed: list[ToolCallPart] = []
+        for i in range(start, len(self._parts) - 1):
+            part = self._apply_pending_deltas_to(i)
+            if isinstance(part, ToolCallPart) and _has_complete_args(part, self._args_parsers.get(i)):
+                completed.append(part)
+        return completed
+
+    def get_partial_args(self, part: ToolCallPart) -> dict[str, Any] | None:
+        """Get the arguments streamed so far of a tool call part in the manager, parsed incrementally.
+
+        The arguments are parsed like [`pydantic_core.from_json`][pydantic_core.from_json] with
+        `allow_partial='trailing-strings'` would parse them, but each delta is only parsed once.
+
+        Returns:
+            The partial arguments, or `None` if they can't be parsed incrementally, e.g. because the part isn't in
+            the manager any more, or the arguments aren't a JSON object, in which case they should be parsed in full.
+        """
+        for index, managed_part in enumerate(self._parts):
+            if managed_part is part:
+                parser = self._args_parsers.get(index)
+                if parser is not None and isinstance(part.args, str) and parser.length == len(part.args):
+                    args = parser.value
+                    if isinstance(args, dict):
+                        return args  # pyright: ignore[reportUnknownVariableType]
+                return None
+        return None
+
     def handle_text_delta(
         self,
         *,
@@ -116,11 +171,10 @@ class ModelResponsePartsManager:
             self._parts.append(part)
             return PartStartEvent(index=new_part_index, part=part)
         else:
-            # Update the existing TextPart with the new content delta
-            existing_text_part, part_index = existing_text_part_and_index
-            part_delta = TextPartDelta(content_delta=content)
-            self._parts[part_index] = part_delta.apply(existing_text_part)
-            return PartDeltaEvent(index=part_index, delta=part_delta)
+            # Update the existing TextPart with the new content delta, when it's next needed
+            _, part_index = existing_text_part_and_index
+            self._add_pending_delta(part_index, content)
+            return PartDeltaEvent(index=part_index, delta=TextPartDelta(content_delta=content))
 
     def handle_tool_call_delta(
         self,
@@ -183,6 +237,7 @@ class ModelResponsePartsManager:
                 self._vendor_id_to_part_index[vendor_part_id] = len(self._parts)
             new_part_index = len(self._parts)
             self._parts.append(part)
+            self._parse_args_delta(new_part_index, args)
             # Only emit a PartStartEvent if we have enough information to produce a full ToolCallPart
             if isinstance(part, ToolCallPart):
                 return PartStartEvent(index=new_part_index, part=part)
@@ -190,8 +245,22 @@ class ModelResponsePartsManager:
             # Update the existing part or delta with the new information
             existing_part, part_index = existing_matching_part_and_index
             delta = ToolCallPartDelta(tool_name_delta=tool_name, args_delta=args, tool_call_id=tool_call_id)
+            if (
+                isinstance(existing_part, ToolCallPart)
+                and isinstance(existing_part.args, str)
+                and isinstance(args, str)
+                and not tool_name
+                and not tool_call_id
+            ):
+                # Just more JSON arguments, which are appended to the part's when it's next needed
+                self._add_pending_delta(part_index, args)
+                self._parse_args_delta(part_index, args)
+                return PartDeltaEvent(index=part_index, delta=delta)
+
+            existing_part = self._apply_pending_deltas_to(part_index)
             updated_part = delta.apply(existing_part)
             self._parts[part_index] = updated_part
+            self._parse_args_delta(part_index, args)
             if isinstance(updated_part, ToolCallPart):
                 if isinstance(existing_part, ToolCallPartDelta):
                     # We just upgraded a delta to a full part, so emit a PartStartEvent
@@ -238,8 +307,55 @@ class ModelResponsePartsManager:
             if maybe_part_index is not None:
                 new_part_index = maybe_part_index
                 self._parts[new_part_index] = new_part
+                self._args_parsers.pop(new_part_index, None)
+                self._pending_deltas.pop(new_part_index, None)
             else:
                 new_part_index = len(self._parts)
                 self._parts.append(new_part)
             self._vendor_id_to_part_index[vendor_part_id] = new_part_index
+        # parse string arguments too, so partial arguments are available for parts that are replayed whole
+        self._parse_args_delta(new_part_index, args)
         return PartStartEvent(index=new_part_index, part=new_part)
+
+    def _add_pending_delta(self, part_index: int, delta: str) -> None:
+        pending = self._pending_deltas.get(part_index)
+        if pending is None:
+            self._pending_deltas[part_index] = [delta]
+        else:
+            pending.append(delta)
+
+    def _apply_pending_deltas_to(self, part_index: int) -> ManagedPart:
+        part = self._parts[part_index]
+        pending = self._pending_deltas.pop(part_index, None)
+        if pending is not None:
+            if isinstance(part, TextPart):
+                part = replace(part, content=part.content + ''.join(pending))
+            else:
+                assert isinstance(part, ToolCallPart) and isinstance(part.args, str), f'Unexpected {part=}'
+                part = replace(part, args=part.args + ''.join(pending))
+            self._parts[part_index] = part
+        return part
+
+    def _apply_pending_deltas(self) -> None:
+        for part_index in list(self._pending_deltas):
+            self._apply_pending_deltas_to(part_index)
+
+    def _parse_args_delta(self, part_index: int, args: str | dict[str, Any] | None) -> None:
+        if isinstance(args, str):
+            parser = self._args_parsers.get(part_index)
+            if parser is None:
+                parser = self._args_parsers[part_index] = IncrementalJsonParser()
+            parser.feed(args)
+        elif args is not None:
+            self._args_parsers.pop(part_index, None)
+
+
+def _has_complete_args(part: ToolCallPart, parser: IncrementalJsonParser | None) -> bool:
+    if not isinstance(part.args, str) or not part.args:
+        return True
+    if parser is not None and parser.length == len(part.args) and not parser.failed:
+        return parser.complete and isinstance(parser.value, dict)
+    try:
+        return isinstance(pydantic_core.from_json(part.args), dict)
+    except ValueError:
+        return False
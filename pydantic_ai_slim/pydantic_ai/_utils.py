@@ -1,9 +1,12 @@
 from __future__ import annotations as _annotations
 
 import asyncio
+import pickle
 import time
 import uuid
+from collections import OrderedDict
 from collections.abc import AsyncIterable, AsyncIterator, Iterator
+from concurrent.futures import Executor
 from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, is_dataclass
 from datetime import datetime, timezone
@@ -36,6 +39,33 @@ async def run_in_executor(func: Callable[_P, _R], *args: _P.args, **kwargs: _P.k
     return await run_sync(wrapped_func)
 
 
+async def run_in_process(executor: Executor, func: Callable[_P, _R], *args: _P.args, **kwargs: _P.kwargs) -> _R:
+    """Run `func` in `executor`, typically a process pool.
+
+    The call is pickled here rather than by the executor, so unpicklable arguments raise a clear `UserError`
+    instead of an error indistinguishable from one raised by `func`. Errors pickling anything the executor adds to
+    the call when it's submitted, e.g. context added by instrumentation, raise a `UserError` too.
+    """
+    from .exceptions import UserError
+
+    try:
+        call = pickle.dumps((func, args, kwargs))
+    except Exception as e:
+        raise UserError(
+            f'Arguments to {func.__qualname__!r} could not be pickled to send to a worker process: {e}'
+        ) from e
+    try:
+        future = asyncio.get_running_loop().run_in_executor(executor, _call_pickled, call)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        raise UserError(f'The call to {func.__qualname__!r} could not be sent to a worker process: {e}') from e
+    return await future
+
+
+def _call_pickled(call: bytes) -> Any:
+    func, args, kwargs = pickle.loads(call)
+    return func(*args, **kwargs)
+
+
 def is_model_like(type_: Any) -> bool:
     """Check if something is a pydantic model, dataclass or typedict.
 
@@ -78,6 +108,29 @@ Option: TypeAlias = Union[Some[T], None]
 """Analogous to Rust's `Option` type, usage: `Option[Thing]` is equivalent to `Some[Thing] | None`."""
 
 
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class LRUDict(OrderedDict[K, V]):
+    """A dict holding at most `max_size` items, evicting the least recently used item when it's full."""
+
+    def __init__(self, max_size: int):
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, key: K) -> V:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+
 class Unset:
     """A singleton to represent an unset value."""
 
@@ -128,66 +181,124 @@ async def group_by_temporal(
         yield async_iter_groups_noop()
         return
 
-    # we might wait for the next item more than once, so we store the task to await next time
-    task: asyncio.Task[T] | None = None
+    buffer = _TemporalBuffer(aiterable)
 
     async def async_iter_groups() -> AsyncIterator[list[T]]:
-        nonlocal task
-
         assert soft_max_interval is not None and soft_max_interval >= 0, 'soft_max_interval must be a positive number'
-        buffer: list[T] = []
-        group_start_time = time.monotonic()
+        group_start_time: float | None = time.monotonic()
 
-        aiterator = aiterable.__aiter__()
+        buffer.start()
         while True:
+            if buffer.done:
+                # raise any error from the iterable, otherwise we're done iterating
+                items = buffer.finish()
+                if items:
+                    yield items
+                break
+
             if group_start_time is None:
-                # group hasn't started, we just wait for the maximum interval
-                wait_time = soft_max_interval
-            else:
-                # wait for the time remaining in the group
-                wait_time = soft_max_interval - (time.monotonic() - group_start_time)
-
-            # if there's no current task, we get the next one
-            if task is None:
-                # aiter.__anext__() returns an Awaitable[T], not a Coroutine which asyncio.create_task expects
-                # so far, this doesn't seem to be a problem
-                task = asyncio.create_task(aiterator.__anext__())  # pyright: ignore[reportArgumentType]
-
-            # we use asyncio.wait to avoid cancelling the coroutine if it's not done
-            done, _ = await asyncio.wait((task,), timeout=wait_time)
-
-            if done:
-                # the one task we waited for completed
-                try:
-                    item = done.pop().result()
-                except StopAsyncIteration:
-                    # if the task raised StopAsyncIteration, we're done iterating
-                    if buffer:
-                        yield buffer
-                    task = None
-                    break
-                else:
-                    # we got an item, add it to the buffer and set task to None to get the next item
-                    buffer.append(item)
-                    task = None
-                    # if this is the first item in the group, set the group start time
-                    if group_start_time is None:
-                        group_start_time = time.monotonic()
-            elif buffer:
-                # otherwise if the task timeout expired and we have items in the buffer, yield the buffer
-                yield buffer
-                # clear the buffer and reset the group start time ready for the next group
-                buffer = []
+                if not buffer.items:
+                    # group hasn't started, we wait for the first item
+                    await buffer.wait_for_item()
+                    continue
+                # this is the first item in the group, set the group start time
+                group_start_time = time.monotonic()
+
+            # wait for the time remaining in the group
+            remaining = soft_max_interval - (time.monotonic() - group_start_time)
+            if remaining > 0:
+                await buffer.wait(remaining)
+            elif buffer.items:
+                # the group's time is up and we have items in the buffer, yield them
+                yield buffer.take()
+                # reset the group start time ready for the next group
                 group_start_time = None
+            else:
+                # we're over time, so yield the next item as soon as it arrives
+                await buffer.wait_for_item()
 
     try:
         yield async_iter_groups()
-    finally:  # pragma: no cover
-        # after iteration if a tasks still exists, cancel it, this will only happen if an error occurred
-        if task:
-            task.cancel('Cancelling due to error in iterator')
+    finally:
+        # after iteration if items are still being received, stop, this will only happen if an error occurred
+        # or iteration stopped early
+        await buffer.cancel()
+
+
+class _TemporalBuffer(Generic[T]):
+    """Items received from an async iterable by a single task, for `group_by_temporal` to group.
+
+    This avoids creating a task, and waiting for it with a timeout, for each item. Items are only received while the
+    consumer is waiting, so at most one item is read ahead while it's busy with a group, as with `anext`.
+    """
+
+    def __init__(self, aiterable: AsyncIterable[T]):
+        self.items: list[T] = []
+        self._aiterable = aiterable
+        self._task: asyncio.Task[None] | None = None
+        self._waiter: asyncio.Future[None] | None = None
+        # whether the next item should wake the waiter, rather than just being added to the items
+        self._wake_on_item = False
+        # set while the consumer is waiting, so items aren't received while it's busy
+        self._consumer_waiting = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._task is not None and self._task.done()
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._receive())
+        self._task.add_done_callback(self._wake)
+
+    def take(self) -> list[T]:
+        items, self.items = self.items, []
+        return items
+
+    def finish(self) -> list[T]:
+        """Get the remaining items once all have been received, raising any error from the iterable."""
+        assert self._task is not None
+        self._task.result()
+        return self.take()
+
+    async def wait(self, timeout: float | None = None) -> None:
+        """Wait until all items have been received, or the timeout expires, or the next item if it's been requested."""
+        loop = asyncio.get_running_loop()
+        self._waiter = loop.create_future()
+        timer = None if timeout is None else loop.call_later(timeout, self._wake)
+        self._consumer_waiting.set()
+        try:
+            await self._waiter
+        finally:
+            self._consumer_waiting.clear()
+            self._waiter = None
+            if timer is not None:
+                timer.cancel()
+
+    async def wait_for_item(self) -> None:
+        self._wake_on_item = True
+        try:
+            await self.wait()
+        finally:
+            self._wake_on_item = False
+
+    async def cancel(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel('Cancelling due to error in iterator')
             with suppress(asyncio.CancelledError):
-                await task
+                await self._task
+
+    async def _receive(self) -> None:
+        async for item in self._aiterable:
+            self.items.append(item)
+            if self._wake_on_item:
+                self._wake()
+                # let the consumer start the group before getting the next item, as the group's time starts then
+                await asyncio.sleep(0)
+            await self._consumer_waiting.wait()
+
+    def _wake(self, *_args: Any) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
 
 
 def sync_anext(iterator: Iterator[T]) -> T:
@@ -1,15 +1,19 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import dataclasses
 import inspect
 import json
+import time
 import warnings
-from collections.abc import AsyncIterator, Awaitable, Iterator, Sequence
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Hashable, Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager, contextmanager
 from copy import deepcopy
 from types import FrameType
 from typing import TYPE_CHECKING, Any, Callable, ClassVar, Generic, cast, final, overload
 
+import anyio
 from opentelemetry.trace import NoOpTracer, use_span
 from pydantic.json_schema import GenerateJsonSchema
 from typing_extensions import Literal, Never, TypeGuard, TypeVar, deprecated
@@ -26,8 +30,11 @@ from . import (
     messages as _messages,
     models,
     result,
+    timing as _timing,
     usage as _usage,
 )
+from .cache import CacheBackend
+from .history_processors import HistoryProcessor
 from .models.instrumented import InstrumentationSettings, InstrumentedModel
 from .result import FinalResult, OutputDataT, StreamedRunResult, ToolOutput
 from .settings import ModelSettings, merge_model_settings
@@ -37,6 +44,7 @@ from .tools import (
     GenerateToolJsonSchema,
     RunContext,
     Tool,
+    ToolExecutor,
     ToolFuncContext,
     ToolFuncEither,
     ToolFuncPlain,
@@ -59,6 +67,8 @@ __all__ = (
     'Agent',
     'AgentRun',
     'AgentRunResult',
+    'AgentBatchItem',
+    'AgentBatchResult',
     'capture_run_messages',
     'EndStrategy',
     'CallToolsNode',
@@ -74,6 +84,9 @@ NoneType = type(None)
 RunOutputDataT = TypeVar('RunOutputDataT')
 """Type variable for the result data of a run where `output_type` was customized on the run call."""
 
+_OUTPUT_TYPE_CACHE_SIZE = 64
+"""The number of run output types whose graphs and output schemas each agent keeps."""
+
 
 @final
 @dataclasses.dataclass(init=False)
@@ -111,6 +124,21 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
     end_strategy: EndStrategy
     """Strategy for handling tool calls when a final result is found."""
 
+    max_concurrent_tool_calls: int | None
+    """Maximum number of tool calls to run concurrently within a run, `None` means unlimited."""
+
+    tool_concurrency_limiter: anyio.CapacityLimiter | None
+    """Optional limiter on the number of concurrent tool calls, shared by all runs using it."""
+
+    tool_process_pool_size: int | None
+    """Number of worker processes used to run tools with `executor='process'`, defaults to the number of CPUs."""
+
+    tool_cache: CacheBackend | None
+    """Cache for the results of tools which don't set their own `cache` and don't take a `RunContext`."""
+
+    speculative_tool_calls: bool
+    """Whether to start running function tools while the model response is still streaming."""
+
     model_settings: ModelSettings | None
     """Optional model request settings to use for this agents's runs, by default.
 
@@ -142,10 +170,16 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
     )
     _function_tools: dict[str, Tool[AgentDepsT]] = dataclasses.field(repr=False)
     _mcp_servers: Sequence[MCPServer] = dataclasses.field(repr=False)
+    _history_processors: Sequence[HistoryProcessor] = dataclasses.field(repr=False)
     _default_retries: int = dataclasses.field(repr=False)
     _max_result_retries: int = dataclasses.field(repr=False)
     _override_deps: _utils.Option[AgentDepsT] = dataclasses.field(default=None, repr=False)
     _override_model: _utils.Option[models.Model] = dataclasses.field(default=None, repr=False)
+    _graph_cache: _utils.LRUDict[
+        Hashable, Graph[_agent_graph.GraphAgentState, _agent_graph.GraphAgentDeps[AgentDepsT, Any], FinalResult[Any]]
+    ] = dataclasses.field(repr=False)
+    _output_schema_cache: _utils.LRUDict[Hashable, _output.OutputSchema[Any] | None] = dataclasses.field(repr=False)
+    _process_pool: ProcessPoolExecutor | Literal[False] | None = dataclasses.field(default=None, repr=False)
 
     @overload
     def __init__(
@@ -167,6 +201,12 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         mcp_servers: Sequence[MCPServer] = (),
         defer_model_check: bool = False,
         end_strategy: EndStrategy = 'early',
+        max_concurrent_tool_calls: int | None = None,
+        tool_concurrency_limiter: anyio.CapacityLimiter | None = None,
+        tool_process_pool_size: int | None = None,
+        tool_cache: CacheBackend | None = None,
+        speculative_tool_calls: bool = False,
+        history_processors: Sequence[HistoryProcessor] = (),
         instrument: InstrumentationSettings | bool | None = None,
     ) -> None: ...
 
@@ -195,6 +235,12 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         mcp_servers: Sequence[MCPServer] = (),
         defer_model_check: bool = False,
         end_strategy: EndStrategy = 'early',
+        max_concurrent_tool_calls: int | None = None,
+        tool_concurrency_limiter: anyio.CapacityLimiter | None = None,
+        tool_process_pool_size: int | None = None,
+        tool_cache: CacheBackend | None = None,
+        speculative_tool_calls: bool = False,
+        history_processors: Sequence[HistoryProcessor] = (),
         instrument: InstrumentationSettings | bool | None = None,
     ) -> None: ...
 
@@ -218,6 +264,12 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         mcp_servers: Sequence[MCPServer] = (),
         defer_model_check: bool = False,
         end_strategy: EndStrategy = 'early',
+        max_concurrent_tool_calls: int | None = None,
+        tool_concurrency_limiter: anyio.CapacityLimiter | None = None,
+        tool_process_pool_size: int | None = None,
+        tool_cache: CacheBackend | None = None,
+        speculative_tool_calls: bool = False,
+        history_processors: Sequence[HistoryProcessor] = (),
         instrument: InstrumentationSettings | bool | None = None,
         **_deprecated_kwargs: Any,
     ):
@@ -252,6 +304,22 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                 [override the model][pydantic_ai.Agent.override] for testing.
             end_strategy: Strategy for handling tool calls that are requested alongside a final result.
                 See [`EndStrategy`][pydantic_ai.agent.EndStrategy] for more information.
+            max_concurrent_tool_calls: Maximum number of tool calls to run concurrently within a single run,
+                `None` means all the tool calls in a model response run at once.
+            tool_concurrency_limiter: An `anyio.CapacityLimiter` limiting the number of concurrent tool calls across
+                all runs of this agent, and of any other agent using the same limiter.
+            tool_process_pool_size: Number of worker processes used to run tools with `executor='process'`,
+                defaults to the number of CPUs. The pool is started when such a tool is first called,
+                and shared by all runs of the agent.
+            tool_cache: Cache for tool results, keyed by tool name and arguments, used for tools which don't set
+                their own `cache`. Tools taking a [`RunContext`][pydantic_ai.tools.RunContext] aren't cached
+                unless they set `cache` explicitly, since their result may depend on the context.
+            speculative_tool_calls: When streaming, start running a function tool as soon as its call is complete,
+                i.e. once the model has moved on to the next part of the response, rather than once the whole
+                response has been received. Tools may then run even if the response ends with a final result and
+                `end_strategy` is `'early'`, so only enable this for tools without side effects.
+            history_processors: Functions run in order before each model request to trim the message history sent
+                to the model, see [`pydantic_ai.history_processors`][pydantic_ai.history_processors].
             instrument: Set to True to automatically instrument with OpenTelemetry,
                 which will use Logfire if it's configured.
                 Set to an instance of [`InstrumentationSettings`][pydantic_ai.agent.InstrumentationSettings] to customize.
@@ -266,6 +334,11 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             self.model = models.infer_model(model)
 
         self.end_strategy = end_strategy
+        self.max_concurrent_tool_calls = max_concurrent_tool_calls
+        self.tool_concurrency_limiter = tool_concurrency_limiter
+        self.tool_process_pool_size = tool_process_pool_size
+        self.tool_cache = tool_cache
+        self.speculative_tool_calls = speculative_tool_calls
         self.name = name
         self.model_settings = model_settings
 
@@ -305,6 +378,9 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             output_type, self._deprecated_result_tool_name, self._deprecated_result_tool_description
         )
         self._output_validators = []
+        # bounded, as run output types may be created dynamically, e.g. with `pydantic.create_model` per request
+        self._graph_cache = _utils.LRUDict(_OUTPUT_TYPE_CACHE_SIZE)
+        self._output_schema_cache = _utils.LRUDict(_OUTPUT_TYPE_CACHE_SIZE)
 
         self._instructions = ''
         self._instructions_functions = []
@@ -326,6 +402,7 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         self._default_retries = retries
         self._max_result_retries = output_retries if output_retries is not None else retries
         self._mcp_servers = mcp_servers
+        self._history_processors = history_processors
         for tool in tools:
             if isinstance(tool, Tool):
                 self._register_tool(tool)
@@ -595,10 +672,8 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
 
         output_type_ = output_type or self.output_type
 
-        # Build the graph
-        graph: Graph[_agent_graph.GraphAgentState, _agent_graph.GraphAgentDeps[AgentDepsT, Any], FinalResult[Any]] = (
-            _agent_graph.build_agent_graph(self.name, self._deps_type, output_type_)
-        )
+        # Build the graph, or reuse the one built by a previous run
+        graph = self._get_graph(output_type_)
 
         # Build the initial state
         usage = usage or _usage.Usage()
@@ -614,17 +689,14 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         # typecast reasonable, even though it is possible to violate it with otherwise-type-checked code.
         output_validators = cast(list[_output.OutputValidator[AgentDepsT, RunOutputDataT]], self._output_validators)
 
-        # TODO: Instead of this, copy the function tools to ensure they don't share current_retry state between agent
-        #  runs. Requires some changes to `Tool` to make them copyable though.
-        for v in self._function_tools.values():
-            v.current_retry = 0
-
         model_settings = merge_model_settings(self.model_settings, model_settings)
         usage_limits = usage_limits or _usage.UsageLimits()
 
         if isinstance(model_used, InstrumentedModel):
+            instrumentation_settings = model_used.settings
             tracer = model_used.settings.tracer
         else:
+            instrumentation_settings = None
             tracer = NoOpTracer()
         agent_name = self.name or 'agent'
         run_span = tracer.start_span(
@@ -659,6 +731,12 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             function_tools=self._function_tools,
             mcp_servers=self._mcp_servers,
             default_retries=self._default_retries,
+            max_concurrent_tool_calls=self.max_concurrent_tool_calls,
+            tool_concurrency_limiter=self.tool_concurrency_limiter,
+            get_process_pool=self._get_process_pool,
+            tool_cache=self.tool_cache,
+            speculative_tool_calls=self.speculative_tool_calls,
+            history_processors=self._history_processors,
             tracer=tracer,
             get_instructions=get_instructions,
         )
@@ -671,6 +749,7 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             system_prompt_dynamic_functions=self._system_prompt_dynamic_functions,
         )
 
+        start = time.perf_counter()
         try:
             async with graph.iter(
                 start_node,
@@ -691,19 +770,28 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                         ),
                     )
         finally:
+            state.timing.total = time.perf_counter() - start
             try:
                 if run_span.is_recording():
-                    run_span.set_attributes(self._run_span_end_attributes(state, usage))
+                    run_span.set_attributes(self._run_span_end_attributes(state, usage, instrumentation_settings))
             finally:
                 run_span.end()
 
-    def _run_span_end_attributes(self, state: _agent_graph.GraphAgentState, usage: _usage.Usage):
+    def _run_span_end_attributes(
+        self,
+        state: _agent_graph.GraphAgentState,
+        usage: _usage.Usage,
+        instrumentation_settings: InstrumentationSettings | None,
+    ):
+        max_content_length = instrumentation_settings and instrumentation_settings.max_event_content_length
         return {
             **usage.opentelemetry_attributes(),
             'all_messages_events': json.dumps(
                 [
                     InstrumentedModel.event_to_dict(e)
-                    for e in InstrumentedModel.messages_to_otel_events(state.message_history)
+                    for e in InstrumentedModel.messages_to_otel_events(
+                        state.message_history, max_content_length=max_content_length
+                    )
                 ]
             ),
             'logfire.json_schema': json.dumps(
@@ -830,6 +918,165 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             )
         )
 
+    async def run_many(
+        self,
+        user_prompts: Iterable[str | Sequence[_messages.UserContent]],
+        *,
+        max_concurrency: int = 10,
+        model: models.Model | models.KnownModelName | str | None = None,
+        deps: AgentDepsT = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        infer_name: bool = True,
+    ) -> AgentBatchResult[OutputDataT]:
+        """Run the agent once for each of many user prompts, with at most `max_concurrency` runs at a time.
+
+        A run which fails doesn't stop the others, its exception is recorded on its item of the result instead.
+
+        Example:
+        ```python
+        from pydantic_ai import Agent
+
+        agent = Agent('test')
+
+        async def main():
+            batch = await agent.run_many(['What is 1 + 1?', 'What is 2 + 2?'], max_concurrency=2)
+            print([item.result.output for item in batch.items if item.result])
+            #> ['success (no tool calls)', 'success (no tool calls)']
+            print(batch.usage().requests)
+            #> 2
+        ```
+
+        Args:
+            user_prompts: The user prompts to run the agent with, consumed lazily.
+            max_concurrency: The maximum number of runs in progress at a time.
+            model: Optional model to use for these runs, required if `model` was not set when creating the agent.
+            deps: Optional dependencies to use for every run.
+            model_settings: Optional settings to use for the model's requests.
+            usage_limits: Optional limits on model request count or token usage, applied to each run.
+            infer_name: Whether to try to infer the agent name from the call frame if it's not set.
+
+        Returns:
+            The results of all the runs, in the same order as `user_prompts`.
+        """
+        if infer_name and self.name is None:
+            self._infer_name(inspect.currentframe())
+
+        start = time.perf_counter()
+        items = [
+            item
+            async for item in self.iter_many(
+                user_prompts,
+                max_concurrency=max_concurrency,
+                ordered=True,
+                model=model,
+                deps=deps,
+                model_settings=model_settings,
+                usage_limits=usage_limits,
+                infer_name=False,
+            )
+        ]
+        return AgentBatchResult(items=items, duration=time.perf_counter() - start)
+
+    async def iter_many(
+        self,
+        user_prompts: Iterable[str | Sequence[_messages.UserContent]],
+        *,
+        max_concurrency: int = 10,
+        ordered: bool = False,
+        model: models.Model | models.KnownModelName | str | None = None,
+        deps: AgentDepsT = None,
+        model_settings: ModelSettings | None = None,
+        usage_limits: _usage.UsageLimits | None = None,
+        infer_name: bool = True,
+    ) -> AsyncGenerator[AgentBatchItem[OutputDataT], None]:
+        """Run the agent once for each of many user prompts, yielding the result of each run as it's available.
+
+        This is the streaming counterpart of [`run_many`][pydantic_ai.Agent.run_many], useful to process results of
+        large batches without keeping them all in memory. If iteration is stopped early by closing the generator with
+        `aclose()`, runs in progress are cancelled.
+
+        Args:
+            user_prompts: The user prompts to run the agent with, consumed lazily.
+            max_concurrency: The maximum number of runs in progress at a time.
+            ordered: If `True`, results are yielded in the order of `user_prompts`, otherwise in completion order.
+            model: Optional model to use for these runs, required if `model` was not set when creating the agent.
+            deps: Optional dependencies to use for every run.
+            model_settings: Optional settings to use for the model's requests.
+            usage_limits: Optional limits on model request count or token usage, applied to each run.
+            infer_name: Whether to try to infer the agent name from the call frame if it's not set.
+
+        Yields:
+            An [`AgentBatchItem`][pydantic_ai.agent.AgentBatchItem] for each user prompt.
+        """
+        if infer_name and self.name is None:
+            self._infer_name(inspect.currentframe())
+        if max_concurrency < 1:
+            raise exceptions.UserError('`max_concurrency` must be at least 1')
+
+        prompts = enumerate(user_prompts)
+        # bounded so workers can't get far ahead of a slow consumer
+        finished: asyncio.Queue[AgentBatchItem[OutputDataT] | None] = asyncio.Queue(maxsize=max_concurrency)
+        # results that finished out of order, waiting for earlier ones when `ordered`
+        pending: dict[int, AgentBatchItem[OutputDataT]] = {}
+        pending_changed = asyncio.Condition()
+
+        async def worker() -> None:
+            try:
+                while True:
+                    if ordered:
+                        # don't start new runs while too many results are waiting for an earlier one
+                        async with pending_changed:
+                            await pending_changed.wait_for(lambda: len(pending) < max_concurrency)
+                    # the iterator is shared by all workers, each taking the next prompt once it's done with the last
+                    next_prompt = next(prompts, None)
+                    if next_prompt is None:
+                        break
+                    index, prompt = next_prompt
+                    start = time.perf_counter()
+                    try:
+                        run_result = await self.run(
+                            prompt,
+                            model=model,
+                            deps=deps,
+                            model_settings=model_settings,
+                            usage_limits=usage_limits,
+                            infer_name=False,
+                        )
+                    except Exception as e:
+                        item = AgentBatchItem[OutputDataT](index, prompt, None, e, time.perf_counter() - start)
+                    else:
+                        item = AgentBatchItem(index, prompt, run_result, None, time.perf_counter() - start)
+                    await finished.put(item)
+            except Exception:
+                # an error iterating over `user_prompts`, raised by `gather` below once all workers are done
+                await finished.put(None)
+                raise
+            await finished.put(None)
+
+        workers = [asyncio.create_task(worker()) for _ in range(max_concurrency)]
+        try:
+            running = len(workers)
+            next_index = 0
+            while running:
+                item = await finished.get()
+                if item is None:
+                    running -= 1
+                elif not ordered:
+                    yield item
+                else:
+                    pending[item.index] = item
+                    while next_index in pending:
+                        yield pending.pop(next_index)
+                        next_index += 1
+                    async with pending_changed:
+                        pending_changed.notify_all()
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
     @overload
     def run_stream(
         self,
@@ -994,6 +1241,7 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                                     final_result_details.tool_call_id,
                                     graph_ctx,
                                     parts,
+                                    node._speculative_tool_calls,  # pyright: ignore[reportPrivateUsage]
                                 ):
                                     pass
                                 # TODO: Should we do something here related to the retry count?
@@ -1260,6 +1508,7 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         ```
         """
         self._output_validators.append(_output.OutputValidator[AgentDepsT, Any](func))
+        self._clear_caches()
         return func
 
     @deprecated('`result_validator` is deprecated, use `output_validator` instead.')
@@ -1280,6 +1529,9 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         require_parameter_descriptions: bool = False,
         schema_generator: type[GenerateJsonSchema] = GenerateToolJsonSchema,
         strict: bool | None = None,
+        max_concurrency: int | None = None,
+        cache: CacheBackend | Literal[False] | None = None,
+        cache_key_prefix: str | None = None,
     ) -> Callable[[ToolFuncContext[AgentDepsT, ToolParams]], ToolFuncContext[AgentDepsT, ToolParams]]: ...
 
     def tool(
@@ -1294,6 +1546,9 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         require_parameter_descriptions: bool = False,
         schema_generator: type[GenerateJsonSchema] = GenerateToolJsonSchema,
         strict: bool | None = None,
+        max_concurrency: int | None = None,
+        cache: CacheBackend | Literal[False] | None = None,
+        cache_key_prefix: str | None = None,
     ) -> Any:
         """Decorator to register a tool function which takes [`RunContext`][pydantic_ai.tools.RunContext] as its first argument.
 
@@ -1338,6 +1593,13 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             schema_generator: The JSON schema generator class to use for this tool. Defaults to `GenerateToolJsonSchema`.
             strict: Whether to enforce JSON schema compliance (only affects OpenAI).
                 See [`ToolDefinition`][pydantic_ai.tools.ToolDefinition] for more info.
+            max_concurrency: The maximum number of concurrent calls of this tool across all runs of the agent,
+                `None` means unlimited.
+            cache: Where to cache the tool's results, keyed by `cache_key_prefix`, its name and arguments. If `None`,
+                the agent's `tool_cache` is used unless the tool takes a [`RunContext`][pydantic_ai.tools.RunContext].
+                If `False`, results are never cached.
+            cache_key_prefix: Prefix of the tool's cache keys, defaults to the function's module and qualified name.
+                Set it to keep apart the results of tools created from the same function, e.g. by a factory.
         """
         if func is None:
 
@@ -1355,6 +1617,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                     require_parameter_descriptions,
                     schema_generator,
                     strict,
+                    max_concurrency,
+                    'thread',
+                    cache,
+                    cache_key_prefix,
                 )
                 return func_
 
@@ -1371,6 +1637,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                 require_parameter_descriptions,
                 schema_generator,
                 strict,
+                max_concurrency,
+                'thread',
+                cache,
+                cache_key_prefix,
             )
             return func
 
@@ -1389,6 +1659,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         require_parameter_descriptions: bool = False,
         schema_generator: type[GenerateJsonSchema] = GenerateToolJsonSchema,
         strict: bool | None = None,
+        max_concurrency: int | None = None,
+        executor: ToolExecutor = 'thread',
+        cache: CacheBackend | Literal[False] | None = None,
+        cache_key_prefix: str | None = None,
     ) -> Callable[[ToolFuncPlain[ToolParams]], ToolFuncPlain[ToolParams]]: ...
 
     def tool_plain(
@@ -1403,6 +1677,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         require_parameter_descriptions: bool = False,
         schema_generator: type[GenerateJsonSchema] = GenerateToolJsonSchema,
         strict: bool | None = None,
+        max_concurrency: int | None = None,
+        executor: ToolExecutor = 'thread',
+        cache: CacheBackend | Literal[False] | None = None,
+        cache_key_prefix: str | None = None,
     ) -> Any:
         """Decorator to register a tool function which DOES NOT take `RunContext` as an argument.
 
@@ -1447,6 +1725,14 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             schema_generator: The JSON schema generator class to use for this tool. Defaults to `GenerateToolJsonSchema`.
             strict: Whether to enforce JSON schema compliance (only affects OpenAI).
                 See [`ToolDefinition`][pydantic_ai.tools.ToolDefinition] for more info.
+            max_concurrency: The maximum number of concurrent calls of this tool across all runs of the agent,
+                `None` means unlimited.
+            executor: Where to run the function if it's not async, see [`ToolExecutor`][pydantic_ai.tools.ToolExecutor].
+            cache: Where to cache the tool's results, keyed by `cache_key_prefix`, its name and arguments. If `None`,
+                the agent's `tool_cache` is used unless the tool takes a [`RunContext`][pydantic_ai.tools.RunContext].
+                If `False`, results are never cached.
+            cache_key_prefix: Prefix of the tool's cache keys, defaults to the function's module and qualified name.
+                Set it to keep apart the results of tools created from the same function, e.g. by a factory.
         """
         if func is None:
 
@@ -1462,6 +1748,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                     require_parameter_descriptions,
                     schema_generator,
                     strict,
+                    max_concurrency,
+                    executor,
+                    cache,
+                    cache_key_prefix,
                 )
                 return func_
 
@@ -1477,6 +1767,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
                 require_parameter_descriptions,
                 schema_generator,
                 strict,
+                max_concurrency,
+                executor,
+                cache,
+                cache_key_prefix,
             )
             return func
 
@@ -1491,6 +1785,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         require_parameter_descriptions: bool,
         schema_generator: type[GenerateJsonSchema],
         strict: bool | None,
+        max_concurrency: int | None,
+        executor: ToolExecutor,
+        cache: CacheBackend | Literal[False] | None,
+        cache_key_prefix: str | None,
     ) -> None:
         """Private utility to register a function as a tool."""
         retries_ = retries if retries is not None else self._default_retries
@@ -1504,6 +1802,10 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             require_parameter_descriptions=require_parameter_descriptions,
             schema_generator=schema_generator,
             strict=strict,
+            max_concurrency=max_concurrency,
+            executor=executor,
+            cache=cache,
+            cache_key_prefix=cache_key_prefix,
         )
         self._register_tool(tool)
 
@@ -1520,6 +1822,34 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
             raise exceptions.UserError(f'Tool name conflicts with result schema name: {tool.name!r}')
 
         self._function_tools[tool.name] = tool
+        self._clear_caches()
+
+    def _get_process_pool(self) -> ProcessPoolExecutor | None:
+        """Get the pool used to run tools with `executor='process'`, starting it if necessary.
+
+        Returns `None`, so tools are run in threads instead, if processes aren't supported on this platform.
+        """
+        if self._process_pool is None:
+            try:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.tool_process_pool_size)
+            except (ImportError, NotImplementedError, OSError) as e:
+                # remembered so later calls don't try again and repeat the warning
+                self._process_pool = False
+                warnings.warn(f"Can't start a process pool, tools will be run in threads instead: {e}", RuntimeWarning)
+        return self._process_pool or None
+
+    def shutdown_tool_process_pool(self, wait: bool = True) -> None:
+        """Shut down the worker processes running tools with `executor='process'`, if they were started.
+
+        The pool is otherwise only shut down when the interpreter exits. If such a tool is called again,
+        a new pool is started.
+
+        Args:
+            wait: Whether to wait for the tool calls running in the pool to finish.
+        """
+        if self._process_pool:
+            pool, self._process_pool = self._process_pool, None
+            pool.shutdown(wait=wait)
 
     def _get_model(self, model: models.Model | models.KnownModelName | str | None) -> models.Model:
         """Create a model configured for this agent.
@@ -1603,14 +1933,43 @@ class Agent(Generic[AgentDepsT, OutputDataT]):
         if output_type is not None:
             if self._output_validators:
                 raise exceptions.UserError('Cannot set a custom run `output_type` when the agent has output validators')
-            return _output.OutputSchema[RunOutputDataT].build(
+            key = _output.output_type_cache_key(output_type)
+            if key is not None and key in self._output_schema_cache:
+                return self._output_schema_cache[key]
+            output_schema = _output.OutputSchema[RunOutputDataT].build(
                 output_type,
                 self._deprecated_result_tool_name,
                 self._deprecated_result_tool_description,
             )
+            if key is not None:
+                self._output_schema_cache[key] = output_schema
+            return output_schema
         else:
             return self._output_schema  # pyright: ignore[reportReturnType]
 
+    def _get_graph(
+        self, output_type: type[RunOutputDataT] | ToolOutput[RunOutputDataT]
+    ) -> Graph[_agent_graph.GraphAgentState, _agent_graph.GraphAgentDeps[AgentDepsT, Any], FinalResult[Any]]:
+        """Get the agent graph for a run, building it only if an equivalent graph hasn't been built before.
+
+        Graphs are cached on `(name, deps_type, output_type)`, since the name can be inferred on the first run.
+        """
+        output_type_key = _output.output_type_cache_key(output_type)
+        if output_type_key is None:
+            return _agent_graph.build_agent_graph(self.name, self._deps_type, output_type)
+
+        key = (self.name, self._deps_type, output_type_key)
+        try:
+            return self._graph_cache[key]
+        except KeyError:
+            graph = self._graph_cache[key] = _agent_graph.build_agent_graph(self.name, self._deps_type, output_type)
+            return graph
+
+    def _clear_caches(self) -> None:
+        """Clear the cached graphs and output schemas, called whenever tools or output validators change."""
+        self._graph_cache.clear()
+        self._output_schema_cache.clear()
+
     @staticmethod
     def is_model_request_node(
         node: _agent_graph.AgentNode[T, S] | End[result.FinalResult[S]],
@@ -1884,6 +2243,10 @@ class AgentRun(Generic[AgentDepsT, OutputDataT]):
         """Get usage statistics for the run so far, including token usage, model requests, and so on."""
         return self._graph_run.state.usage
 
+    def timing(self) -> _timing.RunTiming:
+        """Get the time spent in the run so far, by step and by phase, e.g. in model requests and tool calls."""
+        return self._graph_run.state.timing
+
     def __repr__(self) -> str:
         result = self._graph_run.result
         result_repr = '<run not finished>' if result is None else repr(result.output)
@@ -2039,3 +2402,46 @@ class AgentRunResult(Generic[OutputDataT]):
     def usage(self) -> _usage.Usage:
         """Return the usage of the whole run."""
         return self._state.usage
+
+    def timing(self) -> _timing.RunTiming:
+        """Return the time spent in the whole run, by step and by phase, e.g. in model requests and tool calls."""
+        return self._state.timing
+
+
+@dataclasses.dataclass
+class AgentBatchItem(Generic[OutputDataT]):
+    """The outcome of one of the runs from [`Agent.run_many`][pydantic_ai.Agent.run_many] or [`Agent.iter_many`][pydantic_ai.Agent.iter_many]."""
+
+    index: int
+    """The index of the user prompt in the prompts passed."""
+    user_prompt: str | Sequence[_messages.UserContent]
+    """The user prompt of the run."""
+    result: AgentRunResult[OutputDataT] | None
+    """The result of the run, `None` if it failed."""
+    error: Exception | None
+    """The exception raised by the run, `None` if it succeeded."""
+    duration: float
+    """Time taken by the run, in seconds."""
+
+
+@dataclasses.dataclass
+class AgentBatchResult(Generic[OutputDataT]):
+    """The results of [`Agent.run_many`][pydantic_ai.Agent.run_many]."""
+
+    items: list[AgentBatchItem[OutputDataT]]
+    """The outcome of each run, in the order of the user prompts."""
+    duration: float
+    """Time taken by the whole batch, in seconds."""
+
+    @property
+    def failures(self) -> list[AgentBatchItem[OutputDataT]]:
+        """The items whose run raised an exception."""
+        return [item for item in self.items if item.error is not None]
+
+    def usage(self) -> _usage.Usage:
+        """Return the usage of all the runs which succeeded, added together."""
+        usage = _usage.Usage()
+        for item in self.items:
+            if item.result is not None:
+                usage.incr(item.result.usage())
+        return usage
@@ -0,0 +1,256 @@
+from __future__ import annotations as _annotations
+
+import base64
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, cast
+
+import pydantic_core
+
+from .messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelRequestPart,
+    UserContent,
+    UserPromptPart,
+    _LazyBinaryContent,  # pyright: ignore[reportPrivateUsage]
+)
+
+__all__ = 'BlobStore', 'MemoryBlobStore', 'FileBlobStore'
+
+
+class BlobStore(ABC):
+    """Base class for content-addressed stores of binary data, keyed by the SHA-256 hash of the data.
+
+    A blob store can serialize message histories with the data of
+    [`BinaryContent`][pydantic_ai.messages.BinaryContent] in user prompts, including files returned by tools,
+    stored separately and replaced by a reference to it. Identical files are only stored once, however many
+    messages or conversations include them, and loaded messages only read the data from the store when it's used.
+
+    Example:
+    ```python
+    from pydantic_ai import Agent
+    from pydantic_ai.blobs import MemoryBlobStore
+    from pydantic_ai.messages import BinaryContent
+
+    store = MemoryBlobStore()
+    agent = Agent('test')
+    result = agent.run_sync(['Describe this image', BinaryContent(data=b'...', media_type='image/png')])
+
+    messages_json = store.dump_messages(result.all_messages())
+    print(len(store))
+    #> 1
+    messages = store.load_messages(messages_json)
+    ```
+    """
+
+    @staticmethod
+    def blob_key(data: bytes) -> str:
+        """Get the key data is stored under, the hex SHA-256 hash of the data."""
+        return hashlib.sha256(data).hexdigest()
+
+    def put(self, data: bytes) -> str:
+        """Store data, unless it's already stored, and return its key."""
+        key = self.blob_key(data)
+        if not self.has_blob(key):
+            self.set_blob(key, data)
+        return key
+
+    def __getitem__(self, key: str) -> bytes:
+        return self.get_blob(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.has_blob(key)
+
+    @abstractmethod
+    def get_blob(self, key: str) -> bytes:
+        """Get stored data, raising `KeyError` if it's missing."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_blob(self, key: str, data: bytes) -> None:
+        """Store data under a key."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def has_blob(self, key: str) -> bool:
+        """Check whether data is stored under a key."""
+        raise NotImplementedError
+
+    def blob_size(self, key: str) -> int:
+        """Get the size of stored data, raising `KeyError` if it's missing.
+
+        This reads the data by default, stores which can get the size without doing so should override it.
+        """
+        return len(self.get_blob(key))
+
+    def load_binary_content(self, key: str, media_type: str) -> BinaryContent:
+        """Create binary content which reads its data from the store when it's first accessed."""
+        return _LazyBinaryContent(None, media_type, loader=_BlobLoader(self, key))
+
+    def dump_messages(self, messages: Sequence[ModelMessage]) -> bytes:
+        """Serialize messages to JSON, storing the data of binary content in user prompts and referencing it by key.
+
+        Binary content which was loaded from this store and hasn't been accessed since isn't read again.
+        """
+        keys: dict[tuple[int, int, int], str] = {}
+        placeholders: list[ModelMessage] = []
+        for message_index, message in enumerate(messages):
+            if isinstance(message, ModelRequest):
+                parts: list[ModelRequestPart] = []
+                for part_index, part in enumerate(message.parts):
+                    if isinstance(part, UserPromptPart) and not isinstance(part.content, str):
+                        content: list[UserContent] = []
+                        for content_index, item in enumerate(part.content):
+                            if isinstance(item, BinaryContent):
+                                keys[message_index, part_index, content_index] = self._content_key(item)
+                                # serializing the content itself would load its data
+                                item = BinaryContent(data=b'', media_type=item.media_type)
+                            content.append(item)
+                        part = replace(part, content=content)
+                    parts.append(part)
+                message = replace(message, parts=parts)
+            placeholders.append(message)
+
+        dumped = ModelMessagesTypeAdapter.dump_python(placeholders, mode='json')
+        for (message_index, part_index, content_index), key in keys.items():
+            reference = dumped[message_index]['parts'][part_index]['content'][content_index]
+            del reference['data']
+            reference['blob'] = key
+        return pydantic_core.to_json(dumped)
+
+    def load_messages(self, data: str | bytes) -> list[ModelMessage]:
+        """Load messages serialized with [`dump_messages`][pydantic_ai.blobs.BlobStore.dump_messages].
+
+        The data of binary content is read from the store when it's first accessed, so a missing blob only raises
+        `KeyError` then.
+        """
+        loaded: list[dict[str, Any]] = pydantic_core.from_json(data)
+        for message in loaded:
+            for part in message['parts'] if message.get('kind') == 'request' else ():
+                if part.get('part_kind') != 'user-prompt' or not isinstance(part.get('content'), list):
+                    continue
+                content: list[Any] = part['content']
+                for index, item in enumerate(content):
+                    if not isinstance(item, dict):
+                        continue
+                    item = cast('dict[str, Any]', item)
+                    if item.get('kind') != 'binary':
+                        continue
+                    if 'blob' in item:
+                        content[index] = self.load_binary_content(item['blob'], item['media_type'])
+                    else:
+                        # inline data, as dumped by `ModelMessagesTypeAdapter`
+                        item['data'] = base64.b64decode(item['data'])
+        return ModelMessagesTypeAdapter.validate_python(loaded)
+
+    def _content_key(self, content: BinaryContent) -> str:
+        if isinstance(content, _LazyBinaryContent) and not content.loaded:
+            loader = content.loader
+            if isinstance(loader, _BlobLoader) and loader.store is self:
+                return loader.key
+        return self.put(content.data)
+
+
+@dataclass(init=False)
+class MemoryBlobStore(BlobStore):
+    """An in-memory blob store."""
+
+    _blobs: dict[str, bytes] = field(repr=False)
+    _lock: threading.Lock = field(repr=False)
+
+    def __init__(self):
+        self._blobs = {}
+        self._lock = threading.Lock()
+
+    def get_blob(self, key: str) -> bytes:
+        with self._lock:
+            return self._blobs[key]
+
+    def set_blob(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._blobs[key] = data
+
+    def has_blob(self, key: str) -> bool:
+        with self._lock:
+            return key in self._blobs
+
+    def blob_size(self, key: str) -> int:
+        with self._lock:
+            return len(self._blobs[key])
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+
+@dataclass(init=False)
+class FileBlobStore(BlobStore):
+    """A blob store keeping each blob in a file, so blobs persist and can be shared across processes."""
+
+    directory: Path
+    """Directory the blobs are stored in, each under a subdirectory named after the first two characters of its key."""
+
+    def __init__(self, directory: Path | str):
+        """Open or create a blob store directory.
+
+        Args:
+            directory: Directory to store the blobs in, created if it doesn't exist.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get_blob(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def set_blob(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # write to a temporary file first, so readers never see a partially written blob
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def has_blob(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def blob_size(self, key: str) -> int:
+        try:
+            return self._path(key).stat().st_size
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def _path(self, key: str) -> Path:
+        if len(key) < 3 or not key.isalnum():
+            raise ValueError(f'Invalid blob key: {key!r}')
+        return self.directory / key[:2] / key
+
+
+@dataclass
+class _BlobLoader:
+    """Reads the data of lazily loaded binary content from a blob store."""
+
+    store: BlobStore = field(compare=False)
+    # blobs are keyed by the hash of their data, so loaders of the same key load the same data
+    key: str
+
+    def __call__(self) -> bytes:
+        return self.store.get_blob(self.key)
+
+    def size(self) -> int:
+        return self.store.blob_size(self.key)
@@ -0,0 +1,240 @@
+from __future__ import annotations as _annotations
+
+import pickle
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import anyio.to_thread
+
+__all__ = 'CacheStats', 'CacheBackend', 'MemoryCache', 'SQLiteCache'
+
+
+@dataclass
+class CacheStats:
+    """Counters of cache lookups."""
+
+    hits: int = 0
+    """Number of lookups which found a value."""
+    misses: int = 0
+    """Number of lookups which found no value, or an expired one."""
+
+
+class CacheBackend(ABC):
+    """Base class for stores of cached values, keyed by string.
+
+    Lookups use `cache[key]`, or [`aget`][pydantic_ai.cache.CacheBackend.aget] from async code, which raise `KeyError`
+    if the key isn't cached or has expired, and record a hit or a miss in [`stats`][pydantic_ai.cache.CacheBackend.stats].
+    """
+
+    stats: CacheStats
+    """Hit and miss counters for this cache."""
+
+    def __init__(self) -> None:
+        self.stats = CacheStats()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            value = self.get_value(key)
+        except KeyError:
+            self.stats.misses += 1
+            raise
+        self.stats.hits += 1
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.set_value(key, value)
+
+    async def aget(self, key: str) -> Any:
+        """Get a value like `cache[key]`, without blocking the event loop if the backend does I/O."""
+        try:
+            value = await self.aget_value(key)
+        except KeyError:
+            self.stats.misses += 1
+            raise
+        self.stats.hits += 1
+        return value
+
+    async def aset(self, key: str, value: Any) -> None:
+        """Store a value like `cache[key] = value`, without blocking the event loop if the backend does I/O."""
+        await self.aset_value(key, value)
+
+    @abstractmethod
+    def get_value(self, key: str) -> Any:
+        """Get a value from the store, raising `KeyError` if it's missing or expired."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_value(self, key: str, value: Any) -> None:
+        """Store a value."""
+        raise NotImplementedError
+
+    async def aget_value(self, key: str) -> Any:
+        """Get a value from the store from async code, override this for backends doing blocking I/O."""
+        return self.get_value(key)
+
+    async def aset_value(self, key: str, value: Any) -> None:
+        """Store a value from async code, override this for backends doing blocking I/O."""
+        self.set_value(key, value)
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all values from the store."""
+        raise NotImplementedError
+
+
+@dataclass(init=False)
+class MemoryCache(CacheBackend):
+    """An in-memory cache, evicting the least recently used values once `max_size` or `max_bytes` is reached."""
+
+    max_size: int | None
+    """Maximum number of values to keep, `None` means unlimited."""
+    ttl: float | None
+    """Time in seconds after which values expire, `None` means values never expire."""
+    max_bytes: int | None
+    """Maximum total size of the values to keep, as measured by `sizeof`, `None` means unlimited."""
+    sizeof: Callable[[Any], int] = field(repr=False)
+    """Function measuring the size of a value in bytes."""
+    _total_bytes: int = field(repr=False)
+    _values: OrderedDict[str, tuple[float | None, Any, int]] = field(repr=False)
+    _lock: threading.Lock = field(repr=False)
+
+    def __init__(
+        self,
+        max_size: int | None = 1024,
+        ttl: float | None = None,
+        *,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ):
+        """Create an in-memory cache.
+
+        Args:
+            max_size: Maximum number of values to keep, `None` means unlimited.
+            ttl: Time in seconds after which values expire, `None` means values never expire.
+            max_bytes: Maximum total size of the values to keep, `None` means unlimited. Values larger than this
+                aren't stored.
+            sizeof: Function measuring the size of a value in bytes, defaults to `sys.getsizeof`, which doesn't
+                include the size of objects the value refers to.
+        """
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._total_bytes = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_value(self, key: str) -> Any:
+        with self._lock:
+            expires_at, value, size = self._values[key]
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._values[key]
+                self._total_bytes -= size
+                raise KeyError(key)
+            self._values.move_to_end(key)
+            return value
+
+    def set_value(self, key: str, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        with self._lock:
+            if (old := self._values.pop(key, None)) is not None:
+                self._total_bytes -= old[2]
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._values[key] = expires_at, value, size
+            self._total_bytes += size
+            while (self.max_size is not None and len(self._values) > self.max_size) or (
+                self.max_bytes is not None and self._total_bytes > self.max_bytes
+            ):
+                _, (_, _, evicted_size) = self._values.popitem(last=False)
+                self._total_bytes -= evicted_size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+            self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+
+@dataclass(init=False)
+class SQLiteCache(CacheBackend):
+    """A cache stored in an SQLite database, so values persist across processes.
+
+    Values are pickled, so they must be picklable, and the database must only be shared with trusted processes.
+    From async code, the database is accessed in a worker thread so it doesn't block the event loop.
+    """
+
+    path: Path | str
+    """Path to the database file, `':memory:'` creates a private in-memory database."""
+    ttl: float | None
+    """Time in seconds after which values expire, `None` means values never expire."""
+    table: str
+    """Name of the table to store values in."""
+    _connection: sqlite3.Connection = field(repr=False)
+    _lock: threading.Lock = field(repr=False)
+
+    def __init__(self, path: Path | str, *, ttl: float | None = None, table: str = 'pydantic_ai_cache'):
+        """Open or create a cache database.
+
+        Args:
+            path: Path to the database file, `':memory:'` creates a private in-memory database.
+            ttl: Time in seconds after which values expire, `None` means values never expire.
+            table: Name of the table to store values in, so several caches can share a database.
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute(
+            f'CREATE TABLE IF NOT EXISTS "{table}" (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)'
+        )
+
+    def get_value(self, key: str) -> Any:
+        with self._lock:
+            row = self._connection.execute(
+                f'SELECT value, expires_at FROM "{self.table}" WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                raise KeyError(key)
+            value, expires_at = row
+            if expires_at is not None and expires_at <= time.time():
+                self._connection.execute(f'DELETE FROM "{self.table}" WHERE key = ?', (key,))
+                raise KeyError(key)
+        return pickle.loads(value)
+
+    def set_value(self, key: str, value: Any) -> None:
+        expires_at = time.time() + self.ttl if self.ttl is not None else None
+        data = pickle.dumps(value)
+        with self._lock:
+            self._connection.execute(
+                f'INSERT OR REPLACE INTO "{self.table}" (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, data, expires_at),
+            )
+
+    async def aget_value(self, key: str) -> Any:
+        return await anyio.to_thread.run_sync(self.get_value, key)
+
+    async def aset_value(self, key: str, value: Any) -> None:
+        await anyio.to_thread.run_sync(self.set_value, key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute(f'DELETE FROM "{self.table}"')
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        self._connection.close()
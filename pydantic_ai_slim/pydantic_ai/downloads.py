@@ -0,0 +1,271 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import base64
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from email.utils import mktime_tz, parsedate_tz
+from functools import cached_property, partial
+from typing import Callable, Union
+
+import httpx
+from typing_extensions import TypeAlias
+
+from .cache import CacheBackend, CacheStats, MemoryCache
+from .messages import AudioUrl, DocumentUrl, ImageUrl, ModelMessage, ModelRequest, UserPromptPart, VideoUrl
+from .models import cached_async_http_client
+
+__all__ = (
+    'DownloadedFile',
+    'DownloadCache',
+    'download',
+    'prefetch',
+    'prefetch_prompt_files',
+    'get_download_cache',
+    'set_download_cache',
+)
+
+FileUrl: TypeAlias = Union[AudioUrl, DocumentUrl, ImageUrl, VideoUrl]
+
+
+@dataclass
+class DownloadedFile:
+    """A file downloaded from a URL, e.g. for an [`ImageUrl`][pydantic_ai.messages.ImageUrl] sent to a model."""
+
+    content: bytes
+    """The content of the response."""
+
+    content_type: str = 'application/octet-stream'
+    """The `Content-Type` header of the response."""
+
+    @property
+    def media_type(self) -> str:
+        """The media type of the content, i.e. the content type without parameters."""
+        return self.content_type.split(';')[0].strip()
+
+    @property
+    def text(self) -> str:
+        """The content decoded with the charset from the content type, defaulting to UTF-8."""
+        for param in self.content_type.split(';')[1:]:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'charset':
+                return self.content.decode(value.strip().strip('"'), errors='replace')
+        return self.content.decode('utf-8', errors='replace')
+
+    @cached_property
+    def base64(self) -> str:
+        """The content encoded as base64."""
+        return base64.b64encode(self.content).decode()
+
+
+@dataclass
+class _CachedDownload:
+    file: DownloadedFile
+    etag: str | None
+    last_modified: str | None
+    expires_at: float | None
+
+
+@dataclass(init=False)
+class DownloadCache:
+    """Downloads of the files referenced by URL in messages, shared by all the models that download them.
+
+    Downloads are cached in memory, and optionally in a persistent cache, following the response's `Cache-Control`
+    or `Expires` headers. Expired downloads with an `ETag` or `Last-Modified` header are revalidated with a conditional
+    request rather than downloaded again, as are downloads with neither freshness headers nor a `default_ttl`.
+    Concurrent downloads of the same URL share a single request.
+    """
+
+    memory: CacheBackend
+    """The in-memory cache of downloads, checked first."""
+    persistent: CacheBackend | None
+    """An optional cache checked when a download isn't in memory, e.g. an [`SQLiteCache`][pydantic_ai.cache.SQLiteCache]."""
+    default_ttl: float | None
+    """Time in seconds downloads without freshness headers are fresh, `None` means they're always revalidated."""
+    stats: CacheStats
+    """Downloads served from the cache, including revalidated ones, count as hits, and actual downloads as misses."""
+    _http_client: httpx.AsyncClient | None = field(repr=False)
+    _in_flight: dict[str, asyncio.Task[DownloadedFile]] = field(repr=False)
+
+    def __init__(
+        self,
+        *,
+        memory: CacheBackend | None = None,
+        persistent: CacheBackend | None = None,
+        default_ttl: float | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        """Create a download cache.
+
+        Args:
+            memory: The in-memory cache of downloads, defaults to a [`MemoryCache`][pydantic_ai.cache.MemoryCache]
+                keeping the most recently used downloads, up to 64MiB in total.
+            persistent: An optional cache checked when a download isn't in memory, so downloads are shared across
+                processes, e.g. an [`SQLiteCache`][pydantic_ai.cache.SQLiteCache].
+            default_ttl: Time in seconds downloads without `Cache-Control` or `Expires` headers are fresh. If `None`,
+                they're only cached if they have an `ETag` or `Last-Modified` header, and revalidated on each use.
+            http_client: The client to download with, defaults to the shared client used for downloads by models.
+        """
+        if memory is None:
+            memory = MemoryCache(max_size=None, max_bytes=64 * 1024 * 1024, sizeof=_download_size)
+        self.memory = memory
+        self.persistent = persistent
+        self.default_ttl = default_ttl
+        self.stats = CacheStats()
+        self._http_client = http_client
+        self._in_flight = {}
+
+    async def get(self, url: str) -> DownloadedFile:
+        """Get the file at a URL, from the cache if possible.
+
+        Raises:
+            httpx.HTTPStatusError: If the file couldn't be downloaded.
+        """
+        task = self._in_flight.get(url)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.create_task(self._download(url))
+            self._in_flight[url] = task
+            task.add_done_callback(partial(self._forget, url))
+        # shielded so one caller being cancelled doesn't cancel the download for the others
+        return await asyncio.shield(task)
+
+    async def prefetch(self, urls: Iterable[str]) -> None:
+        """Download files concurrently, so they're cached when they're used."""
+        await asyncio.gather(*(self.get(url) for url in dict.fromkeys(urls)))
+
+    def clear(self) -> None:
+        """Remove all downloads from the caches."""
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    async def _download(self, url: str) -> DownloadedFile:
+        cached = await self._load(url)
+        now = time.time()
+        if cached is not None and (cached.expires_at is None or cached.expires_at > now):
+            self.stats.hits += 1
+            return cached.file
+
+        headers: dict[str, str] = {}
+        if cached is not None:
+            if cached.etag is not None:
+                headers['If-None-Match'] = cached.etag
+            if cached.last_modified is not None:
+                headers['If-Modified-Since'] = cached.last_modified
+        client = self._http_client or cached_async_http_client()
+        response = await client.get(url, headers=headers, follow_redirects=True)
+
+        if cached is not None and response.status_code == 304:
+            self.stats.hits += 1
+            store, expires_at = _cache_policy(response.headers, now, self.default_ttl)
+            if store:
+                await self._store(url, replace(cached, expires_at=expires_at))
+            return cached.file
+
+        response.raise_for_status()
+        self.stats.misses += 1
+        file = DownloadedFile(response.content, response.headers.get('content-type', 'application/octet-stream'))
+        store, expires_at = _cache_policy(response.headers, now, self.default_ttl)
+        if store:
+            etag, last_modified = response.headers.get('etag'), response.headers.get('last-modified')
+            await self._store(url, _CachedDownload(file, etag, last_modified, expires_at))
+        return file
+
+    async def _load(self, url: str) -> _CachedDownload | None:
+        try:
+            return await self.memory.aget(url)
+        except KeyError:
+            pass
+        if self.persistent is not None:
+            try:
+                cached = await self.persistent.aget(url)
+            except KeyError:
+                pass
+            else:
+                await self.memory.aset(url, cached)
+                return cached
+
+    async def _store(self, url: str, cached: _CachedDownload) -> None:
+        await self.memory.aset(url, cached)
+        if self.persistent is not None:
+            await self.persistent.aset(url, cached)
+
+    def _forget(self, url: str, task: asyncio.Task[DownloadedFile]) -> None:
+        if self._in_flight.get(url) is task:
+            del self._in_flight[url]
+
+
+def _cache_policy(headers: httpx.Headers, now: float, default_ttl: float | None) -> tuple[bool, float | None]:
+    """Whether to cache a response, and when it expires, from its `Cache-Control` and `Expires` headers."""
+    directives: dict[str, str] = {}
+    for directive in headers.get('cache-control', '').split(','):
+        name, _, value = directive.partition('=')
+        directives[name.strip().lower()] = value.strip().strip('"')
+
+    if 'no-store' in directives:
+        return False, None
+    elif 'no-cache' in directives:
+        return True, now
+    elif 'max-age' in directives:
+        try:
+            return True, now + int(directives['max-age'])
+        except ValueError:
+            return True, now
+    elif expires := headers.get('expires'):
+        # invalid dates mean the response has already expired
+        parsed = parsedate_tz(expires)
+        return True, float(mktime_tz(parsed)) if parsed is not None else now
+    elif default_ttl is not None:
+        return True, now + default_ttl
+    else:
+        # without freshness information, responses are only kept if they can be revalidated
+        return 'etag' in headers or 'last-modified' in headers, now
+
+
+def _download_size(cached: _CachedDownload) -> int:
+    return len(cached.file.content)
+
+
+_download_cache: DownloadCache | None = None
+
+
+def get_download_cache() -> DownloadCache:
+    """Get the download cache used by models, created on first use."""
+    global _download_cache
+    if _download_cache is None:
+        _download_cache = DownloadCache()
+    return _download_cache
+
+
+def set_download_cache(download_cache: DownloadCache | None) -> None:
+    """Set the download cache used by models, `None` resets it to a new default cache on next use."""
+    global _download_cache
+    _download_cache = download_cache
+
+
+async def download(url: str) -> DownloadedFile:
+    """Get the file at a URL using the [download cache][pydantic_ai.downloads.get_download_cache]."""
+    return await get_download_cache().get(url)
+
+
+async def prefetch(urls: Iterable[str]) -> None:
+    """Download files concurrently using the [download cache][pydantic_ai.downloads.get_download_cache]."""
+    await get_download_cache().prefetch(urls)
+
+
+async def prefetch_prompt_files(messages: Iterable[ModelMessage], include: Callable[[FileUrl], bool]) -> None:
+    """Download the files referenced by URL in the user prompts of messages concurrently, when `include` returns `True`.
+
+    Models call this with the messages they're about to map, so all the files needed by a request are downloaded at
+    once, rather than one user prompt at a time.
+    """
+    await prefetch(
+        item.url
+        for message in messages
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, UserPromptPart) and not isinstance(part.content, str)
+        for item in part.content
+        if isinstance(item, (AudioUrl, DocumentUrl, ImageUrl, VideoUrl)) and include(item)
+    )
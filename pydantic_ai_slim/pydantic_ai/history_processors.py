@@ -0,0 +1,249 @@
+"""Processors to trim the message history sent to the model on each request.
+
+History processors are registered on an agent with the `history_processors` argument, and run in order before
+every model request. They only change the messages sent to the model, the full history is still available from
+[`all_messages()`][pydantic_ai.agent.AgentRunResult.all_messages].
+
+Processors must keep the history valid for the model: every tool return needs the matching tool call from an
+earlier response. The built-in processors only ever drop whole "turns" — a request containing a user prompt, and all
+messages up to the next such request — so tool calls and their returns are always kept or dropped together.
+"""
+
+from __future__ import annotations as _annotations
+
+import dataclasses
+from collections.abc import Awaitable, Sequence
+from dataclasses import dataclass
+from typing import Callable, Union
+
+from typing_extensions import TypeAlias, assert_never
+
+from .messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelRequest,
+    ModelRequestPart,
+    ModelResponse,
+    RetryPromptPart,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserContent,
+    UserPromptPart,
+)
+
+__all__ = (
+    'HistoryProcessor',
+    'KeepLastTurns',
+    'TokenBudget',
+    'StripBinaryContent',
+    'estimate_tokens',
+)
+
+HistoryProcessor: TypeAlias = Union[
+    Callable[[list[ModelMessage]], list[ModelMessage]],
+    Callable[[list[ModelMessage]], Awaitable[list[ModelMessage]]],
+]
+"""A function which takes the message history and returns the messages to send to the model, may be async."""
+
+
+def estimate_tokens(message: ModelMessage) -> int:
+    """Roughly estimate the number of tokens in a message, assuming about four characters per token.
+
+    Binary content is counted by size, URLs are counted as a fixed small number of tokens.
+    """
+    if isinstance(message, ModelRequest):
+        tokens = _estimate_parts_tokens(message.parts)
+        if message.instructions:
+            tokens += _estimate_text_tokens(message.instructions)
+        return tokens
+    elif isinstance(message, ModelResponse):
+        tokens = 0
+        for part in message.parts:
+            if isinstance(part, TextPart):
+                tokens += _estimate_text_tokens(part.content)
+            elif isinstance(part, ToolCallPart):
+                tokens += _estimate_text_tokens(part.tool_name) + _estimate_text_tokens(part.args_as_json_str())
+            else:
+                assert_never(part)
+        return tokens
+    else:
+        assert_never(message)
+
+
+@dataclass
+class KeepLastTurns:
+    """Only send the last `turns` turns of the conversation, plus the system prompts."""
+
+    turns: int
+    """The number of turns to keep, including the current one."""
+
+    def __call__(self, messages: list[ModelMessage]) -> list[ModelMessage]:
+        starts = _turn_starts(messages)
+        if len(starts) <= self.turns:
+            return messages
+        return _drop_before(messages, starts[-max(self.turns, 1)])
+
+
+@dataclass
+class TokenBudget:
+    """Drop the oldest turns until the estimated number of tokens in the history fits in `max_tokens`.
+
+    The system prompts and the current turn are always kept, even if they don't fit in the budget on their own.
+    """
+
+    max_tokens: int
+    """The maximum estimated number of tokens to send."""
+
+    estimate: Callable[[ModelMessage], int] = dataclasses.field(default=estimate_tokens, repr=False)
+    """Function estimating the number of tokens in a message."""
+
+    def __call__(self, messages: list[ModelMessage]) -> list[ModelMessage]:
+        starts = _turn_starts(messages)
+        if len(starts) <= 1:
+            return messages
+
+        # `sent_tokens[i]` is the estimate for the messages from `i` onwards, plus the system prompts before `i`
+        # which are moved to the first message sent
+        system_tokens: list[int] = []
+        for message in messages:
+            system_parts = _system_prompt_parts([message])
+            system_tokens.append(self.estimate(ModelRequest(parts=list(system_parts))) if system_parts else 0)
+        suffix_tokens = 0
+        sent_tokens = [0] * len(messages)
+        for index in range(len(messages) - 1, -1, -1):
+            suffix_tokens += self.estimate(messages[index])
+            sent_tokens[index] = suffix_tokens
+        prefix_system_tokens = [0]
+        for tokens in system_tokens:
+            prefix_system_tokens.append(prefix_system_tokens[-1] + tokens)
+
+        keep_from = starts[-1]
+        for start in reversed(starts[:-1]):
+            if sent_tokens[start] + prefix_system_tokens[start] > self.max_tokens:
+                break
+            keep_from = start
+        return _drop_before(messages, keep_from)
+
+
+@dataclass
+class StripBinaryContent:
+    """Replace binary content, e.g. images and documents, in all but the last `keep_last_turns` turns with a short note."""
+
+    keep_last_turns: int = 1
+    """The number of most recent turns in which binary content is kept."""
+
+    def __call__(self, messages: list[ModelMessage]) -> list[ModelMessage]:
+        starts = _turn_starts(messages)
+        if len(starts) <= self.keep_last_turns:
+            return messages
+        end = starts[-self.keep_last_turns] if self.keep_last_turns > 0 else len(messages)
+        return [_strip_binary(message) for message in messages[:end]] + messages[end:]
+
+
+def _estimate_parts_tokens(parts: Sequence[ModelRequestPart]) -> int:
+    tokens = 0
+    for part in parts:
+        if isinstance(part, SystemPromptPart):
+            tokens += _estimate_text_tokens(part.content)
+        elif isinstance(part, UserPromptPart):
+            tokens += _estimate_user_content_tokens(part.content)
+        elif isinstance(part, ToolReturnPart):
+            tokens += _estimate_text_tokens(part.model_response_str())
+        elif isinstance(part, RetryPromptPart):
+            tokens += _estimate_text_tokens(part.model_response())
+        else:
+            assert_never(part)
+    return tokens
+
+
+def _estimate_text_tokens(text: str) -> int:
+    return (len(text) + 3) // 4
+
+
+def _estimate_user_content_tokens(content: str | Sequence[UserContent]) -> int:
+    if isinstance(content, str):
+        return _estimate_text_tokens(content)
+    tokens = 0
+    for item in content:
+        if isinstance(item, str):
+            tokens += _estimate_text_tokens(item)
+        elif isinstance(item, BinaryContent):
+            # the size doesn't load the data of lazily loaded content
+            tokens += (item.size + 3) // 4
+        else:
+            tokens += 10
+    return tokens
+
+
+def _turn_starts(messages: list[ModelMessage]) -> list[int]:
+    """Find the index of the first message of each turn.
+
+    A turn starts with a request containing a user prompt and no tool returns or tool retries, which would need the
+    tool calls from the previous response.
+    """
+    starts: list[int] = []
+    for index, message in enumerate(messages):
+        if isinstance(message, ModelRequest) and _starts_turn(message):
+            starts.append(index)
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return starts
+
+
+def _starts_turn(request: ModelRequest) -> bool:
+    has_user_prompt = False
+    for part in request.parts:
+        if isinstance(part, ToolReturnPart) or (isinstance(part, RetryPromptPart) and part.tool_name is not None):
+            return False
+        elif isinstance(part, UserPromptPart):
+            has_user_prompt = True
+    return has_user_prompt
+
+
+def _system_prompt_parts(messages: list[ModelMessage]) -> list[SystemPromptPart]:
+    return [
+        part
+        for message in messages
+        if isinstance(message, ModelRequest)
+        for part in message.parts
+        if isinstance(part, SystemPromptPart)
+    ]
+
+
+def _drop_before(messages: list[ModelMessage], index: int) -> list[ModelMessage]:
+    """Drop the messages before `index`, moving their system prompts to the first kept message."""
+    if index == 0:
+        return messages
+    kept = messages[index:]
+    system_prompts = _system_prompt_parts(messages[:index])
+    first = kept[0]
+    if system_prompts and isinstance(first, ModelRequest):
+        kept[0] = dataclasses.replace(first, parts=[*system_prompts, *first.parts])
+    return kept
+
+
+def _strip_binary(message: ModelMessage) -> ModelMessage:
+    if not isinstance(message, ModelRequest):
+        return message
+    if not any(
+        isinstance(part, UserPromptPart)
+        and not isinstance(part.content, str)
+        and any(isinstance(item, BinaryContent) for item in part.content)
+        for part in message.parts
+    ):
+        return message
+    parts = [
+        dataclasses.replace(
+            part,
+            content=[
+                f'[binary content removed: {item.media_type}]' if isinstance(item, BinaryContent) else item
+                for item in part.content
+            ],
+        )
+        if isinstance(part, UserPromptPart) and not isinstance(part.content, str)
+        else part
+        for part in message.parts
+    ]
+    return dataclasses.replace(message, parts=parts)
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import base64
 import json
+import time
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator, Sequence
 from contextlib import AsyncExitStack, asynccontextmanager
@@ -17,8 +18,10 @@ from mcp.types import (
     ImageContent,
     JSONRPCMessage,
     LoggingLevel,
+    ServerNotification,
     TextContent,
     TextResourceContents,
+    ToolListChangedNotification,
 )
 from typing_extensions import Self, assert_never
 
@@ -30,6 +33,7 @@ try:
     from mcp.client.session import ClientSession
     from mcp.client.sse import sse_client
     from mcp.client.stdio import StdioServerParameters, stdio_client
+    from mcp.shared.session import RequestResponder
 except ImportError as _import_error:
     raise ImportError(
         'Please install the `mcp` package to use the MCP server, '
@@ -47,6 +51,12 @@ class MCPServer(ABC):
 
     is_running: bool = False
 
+    cache_tools: bool = False
+    cache_tools_ttl: float | None = None
+
+    _cached_tools: list[ToolDefinition] | None = None
+    _cached_tools_at: float = 0.0
+
     _client: ClientSession
     _read_stream: MemoryObjectReceiveStream[JSONRPCMessage | Exception]
     _write_stream: MemoryObjectSendStream[JSONRPCMessage]
@@ -71,12 +81,17 @@ class MCPServer(ABC):
     async def list_tools(self) -> list[ToolDefinition]:
         """Retrieve tools that are currently active on the server.
 
-        Note:
-        - We don't cache tools as they might change.
-        - We also don't subscribe to the server to avoid complexity.
+        If [`cache_tools`][pydantic_ai.mcp.MCPServerStdio.cache_tools] is enabled, the result of the last request is
+        reused until it's older than `cache_tools_ttl`, or the server sends a `notifications/tools/list_changed`
+        notification.
         """
+        if self.cache_tools and self._cached_tools is not None:
+            ttl = self.cache_tools_ttl
+            if ttl is None or time.monotonic() - self._cached_tools_at < ttl:
+                return self._cached_tools
+
         tools = await self._client.list_tools()
-        return [
+        tool_defs = [
             ToolDefinition(
                 name=tool.name,
                 description=tool.description or '',
@@ -84,6 +99,14 @@ class MCPServer(ABC):
             )
             for tool in tools.tools
         ]
+        if self.cache_tools:
+            self._cached_tools = tool_defs
+            self._cached_tools_at = time.monotonic()
+        return tool_defs
+
+    def invalidate_tools_cache(self) -> None:
+        """Discard the cached list of tools, so the next call to `list_tools` requests it from the server."""
+        self._cached_tools = None
 
     async def call_tool(
         self, tool_name: str, arguments: dict[str, Any]
@@ -116,7 +139,10 @@ class MCPServer(ABC):
         self._exit_stack = AsyncExitStack()
 
         self._read_stream, self._write_stream = await self._exit_stack.enter_async_context(self.client_streams())
-        client = ClientSession(read_stream=self._read_stream, write_stream=self._write_stream)
+        self.invalidate_tools_cache()
+        client = ClientSession(
+            read_stream=self._read_stream, write_stream=self._write_stream, message_handler=self._handle_message
+        )
         self._client = await self._exit_stack.enter_async_context(client)
 
         await self._client.initialize()
@@ -129,8 +155,13 @@ class MCPServer(ABC):
         self, exc_type: type[BaseException] | None, exc_value: BaseException | None, traceback: TracebackType | None
     ) -> bool | None:
         await self._exit_stack.aclose()
+        self.invalidate_tools_cache()
         self.is_running = False
 
+    async def _handle_message(self, message: RequestResponder[Any, Any] | ServerNotification | Exception) -> None:
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            self.invalidate_tools_cache()
+
     def _map_tool_result_part(
         self, part: TextContent | ImageContent | EmbeddedResource
     ) -> str | BinaryContent | dict[str, Any] | list[Any]:
@@ -223,6 +254,16 @@ class MCPServerStdio(MCPServer):
     cwd: str | Path | None = None
     """The working directory to use when spawning the process."""
 
+    cache_tools: bool = False
+    """Whether to cache the list of tools returned by the server.
+
+    The cache is invalidated when the server sends a `notifications/tools/list_changed` notification,
+    when it's older than `cache_tools_ttl`, or when the connection to the server is closed.
+    """
+
+    cache_tools_ttl: float | None = None
+    """Maximum age in seconds of the cached list of tools, if `None` the cache is only invalidated by the server."""
+
     @asynccontextmanager
     async def client_streams(
         self,
@@ -303,6 +344,16 @@ class MCPServerHTTP(MCPServer):
     If `None`, no log level will be set.
     """
 
+    cache_tools: bool = False
+    """Whether to cache the list of tools returned by the server.
+
+    The cache is invalidated when the server sends a `notifications/tools/list_changed` notification,
+    when it's older than `cache_tools_ttl`, or when the connection to the server is closed.
+    """
+
+    cache_tools_ttl: float | None = None
+    """Maximum age in seconds of the cached list of tools, if `None` the cache is only invalidated by the server."""
+
     @asynccontextmanager
     async def client_streams(
         self,
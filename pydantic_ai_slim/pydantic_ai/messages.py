@@ -1,11 +1,15 @@
 from __future__ import annotations as _annotations
 
 import uuid
+from base64 import b64encode
+from binascii import b2a_base64
 from collections.abc import Sequence
 from dataclasses import dataclass, field, replace
 from datetime import datetime
+from functools import partial
 from mimetypes import guess_type
-from typing import Annotated, Any, Literal, Union, cast, overload
+from pathlib import Path
+from typing import Annotated, Any, ClassVar, Literal, Protocol, Union, cast, overload
 
 import pydantic
 import pydantic_core
@@ -234,6 +238,20 @@ class BinaryContent:
             'application/vnd.ms-excel',
         }
 
+    @property
+    def size(self) -> int:
+        """The size of the data in bytes, got without loading the data of lazily loaded content."""
+        return len(self.data)
+
+    @property
+    def base64(self) -> str:
+        """The data encoded as base64.
+
+        The encoding isn't kept with the content, models which send it on every step of a run keep their mapped
+        messages in a [`MessageMappingCache`][pydantic_ai.models.MessageMappingCache] instead.
+        """
+        return b64encode(self.data).decode()
+
     @property
     def format(self) -> str:
         """The file format of the binary content."""
@@ -250,6 +268,150 @@ class BinaryContent:
             return _video_format(self.media_type)
         raise ValueError(f'Unknown media type: {self.media_type}')
 
+    @classmethod
+    def from_path(cls, path: Path | str, media_type: str | None = None) -> BinaryContent:
+        """Create binary content backed by a file, for large files such as videos or PDFs.
+
+        The file is only read when the content is sent to a model or serialized, and its data isn't kept in memory
+        afterwards: models which send base64 encoded data encode the file in chunks without reading it into memory
+        whole, while accessing `data` reads the file each time, including when the content is compared to content
+        which isn't backed by the same file. The file must not be changed or deleted while the content is in use.
+
+        Args:
+            path: Path to the file.
+            media_type: The media type of the file, guessed from its extension if not provided.
+
+        Raises:
+            FileNotFoundError: If the file doesn't exist.
+            ValueError: If the media type isn't provided and can't be guessed.
+        """
+        path = Path(path)
+        if not path.is_file():
+            raise FileNotFoundError(f'No such file: {str(path)!r}')
+        if media_type is None:
+            media_type, _ = guess_type(path)
+            if media_type is None:
+                raise ValueError(f'Unknown media type for file: {str(path)!r}')
+        return _LazyBinaryContent(None, media_type, loader=_FileLoader(path))
+
+
+class _LazyBinaryContent(BinaryContent):
+    """Binary content whose `data` is loaded by calling `loader` when it's accessed.
+
+    Content backed by a file reads it on every access, so its data is never kept in memory, while the data of other
+    loaders is kept once it's loaded.
+
+    `data` can be passed instead of `loader`, as [`dataclasses.replace`][dataclasses.replace] does, which gives
+    content holding the data.
+    """
+
+    loader: _Loader | None
+    """Loads the data, e.g. a `_FileLoader`, `None` if the data was passed to the content."""
+
+    _data: bytes | None
+    """The data once it's loaded or set, `None` until then."""
+
+    def __init__(
+        self,
+        data: bytes | None,
+        media_type: str,
+        kind: Literal['binary'] = 'binary',
+        *,
+        loader: _Loader | None = None,
+    ):
+        if data is None and loader is None:
+            raise TypeError('Either `data` or `loader` must be provided')
+        self.loader = loader
+        self._data = data
+        self.media_type = media_type
+        self.kind = kind
+
+    @property
+    def data(self) -> bytes:
+        """The binary data, loaded when it's accessed."""
+        if self._data is not None:
+            return self._data
+        assert self.loader is not None, 'content without data has a loader'
+        if isinstance(self.loader, _FileLoader):
+            # read on every access rather than kept with the content
+            return self.loader()
+        data = self._data = self.loader()
+        return data
+
+    @data.setter
+    def data(self, value: bytes) -> None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._data = value
+
+    @property
+    def size(self) -> int:
+        if self._data is not None:
+            return len(self._data)
+        assert self.loader is not None, 'content without data has a loader'
+        return self.loader.size()
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the data is held by the content, i.e. it's been loaded or set."""
+        return self._data is not None
+
+    @property
+    def base64(self) -> str:
+        if self._data is None and isinstance(self.loader, _FileLoader):
+            # encoded on every access, so the data of file-backed content is never held in memory
+            return self.loader.base64()
+        return super().base64
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, BinaryContent):
+            return NotImplemented
+        if (self.media_type, self.kind) != (other.media_type, other.kind):
+            return False
+        if (
+            isinstance(other, _LazyBinaryContent)
+            and not self.loaded
+            and not other.loaded
+            and self.loader == other.loader
+        ):
+            # the same file or blob, so there's no need to load it
+            return True
+        return self.data == other.data
+
+    def __repr__(self) -> str:
+        data = repr(self._data) if self._data is not None else f'<loaded by {self.loader!r}>'
+        return f'BinaryContent(data={data}, media_type={self.media_type!r}, kind={self.kind!r})'
+
+
+class _Loader(Protocol):
+    """Loads the data of lazily loaded binary content."""
+
+    def __call__(self) -> bytes: ...
+
+    def size(self) -> int:
+        """Get the size of the data without loading it."""
+        ...
+
+
+@dataclass
+class _FileLoader:
+    """Reads the data of binary content created by [`BinaryContent.from_path`][pydantic_ai.messages.BinaryContent.from_path]."""
+
+    path: Path
+
+    # a multiple of 3, so the chunks encode to base64 without padding
+    chunk_size: ClassVar[int] = 3 * 1024 * 1024
+
+    def __call__(self) -> bytes:
+        return self.path.read_bytes()
+
+    def size(self) -> int:
+        return self.path.stat().st_size
+
+    def base64(self) -> str:
+        with self.path.open('rb') as f:
+            return ''.join(
+                b2a_base64(chunk, newline=False).decode() for chunk in iter(partial(f.read, self.chunk_size), b'')
+            )
+
 
 UserContent: TypeAlias = 'str | ImageUrl | AudioUrl | DocumentUrl | VideoUrl | BinaryContent'
 
@@ -6,20 +6,28 @@ specific LLM being used.
 
 from __future__ import annotations as _annotations
 
+import weakref
 from abc import ABC, abstractmethod
 from collections.abc import AsyncIterator, Iterator
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime
 from functools import cache
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Generic, TypeVar
 
 import httpx
 from typing_extensions import Literal, TypeAliasType
 
 from .._parts_manager import ModelResponsePartsManager
 from ..exceptions import UserError
-from ..messages import ModelMessage, ModelRequest, ModelResponse, ModelResponseStreamEvent
+from ..messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    PartStartEvent,
+    ToolCallPart,
+)
 from ..settings import ModelSettings
 from ..usage import Usage
 
@@ -342,13 +350,40 @@ class StreamedResponse(ABC):
     _parts_manager: ModelResponsePartsManager = field(default_factory=ModelResponsePartsManager, init=False)
     _event_iterator: AsyncIterator[ModelResponseStreamEvent] | None = field(default=None, init=False)
     _usage: Usage = field(default_factory=Usage, init=False)
+    on_tool_call_complete: Callable[[ToolCallPart], None] | None = field(default=None, init=False)
+    """Called with each tool call once its arguments are complete, while the rest of the response is streamed.
+
+    A tool call is complete once a later part of the response has started and its arguments are valid JSON.
+    Must be set before the stream is iterated.
+    """
 
     def __aiter__(self) -> AsyncIterator[ModelResponseStreamEvent]:
         """Stream the response as an async iterable of [`ModelResponseStreamEvent`][pydantic_ai.messages.ModelResponseStreamEvent]s."""
         if self._event_iterator is None:
             self._event_iterator = self._get_event_iterator()
+            if self.on_tool_call_complete is not None:
+                self._event_iterator = self._signal_completed_tool_calls(
+                    self._event_iterator, self.on_tool_call_complete
+                )
         return self._event_iterator
 
+    async def _signal_completed_tool_calls(
+        self, events: AsyncIterator[ModelResponseStreamEvent], on_tool_call_complete: Callable[[ToolCallPart], None]
+    ) -> AsyncIterator[ModelResponseStreamEvent]:
+        # parts before this index have been checked, and won't change any more
+        checked = 0
+        async for event in events:
+            # a new part completes the tool calls before it, signal them before the event is handled
+            if isinstance(event, PartStartEvent) and event.index > checked:
+                for call in self._get_completed_tool_calls(checked):
+                    on_tool_call_complete(call)
+                checked = event.index
+            yield event
+
+    def _get_completed_tool_calls(self, start: int) -> list[ToolCallPart]:
+        """Get the complete tool calls from index `start`, overridden by streams passing through another's events."""
+        return self._parts_manager.get_completed_tool_calls(start)
+
     @abstractmethod
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
         """Return an async iterator of [`ModelResponseStreamEvent`][pydantic_ai.messages.ModelResponseStreamEvent]s.
@@ -368,6 +403,19 @@ class StreamedResponse(ABC):
             parts=self._parts_manager.get_parts(), model_name=self.model_name, timestamp=self.timestamp
         )
 
+    def get_partial_tool_call_args(self, tool_call: ToolCallPart) -> dict[str, Any] | None:
+        """Get the arguments of a tool call in the response streamed so far, parsed incrementally as they're received.
+
+        This is used to validate structured output while it's streamed without parsing the whole of the arguments
+        each time.
+
+        Returns:
+            The partial arguments, as [`pydantic_core.from_json`][pydantic_core.from_json] with
+            `allow_partial='trailing-strings'` would parse them, or `None` if they weren't parsed incrementally,
+            e.g. because `tool_call` isn't from the [latest response][pydantic_ai.models.StreamedResponse.get].
+        """
+        return self._parts_manager.get_partial_args(tool_call)
+
     def usage(self) -> Usage:
         """Get the usage of the response so far. This will not be the final usage until the stream is exhausted."""
         return self._usage
@@ -385,6 +433,48 @@ class StreamedResponse(ABC):
         raise NotImplementedError()
 
 
+MappedT = TypeVar('MappedT')
+
+
+class MessageMappingCache(Generic[MappedT]):
+    """Messages mapped to a provider's format, so each message is only mapped once however many requests send it.
+
+    The whole history is sent on every request of a run, so models use this to only map new messages. Entries are keyed
+    on the identity of the message and its parts, and dropped once the message is garbage collected. Messages are
+    expected not to change after they've been sent, except for parts being replaced, e.g. re-evaluated system prompts.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[int, tuple[weakref.ref[ModelMessage], tuple[object, ...], MappedT]] = {}
+
+    def get(self, message: ModelMessage) -> MappedT | None:
+        """Get the mapped message, or `None` if it hasn't been mapped or its parts have changed since."""
+        entry = self._entries.get(id(message))
+        if entry is None:
+            return None
+        ref, parts, mapped = entry
+        if ref() is not message or len(parts) != len(message.parts):
+            return None
+        if any(cached is not part for cached, part in zip(parts, message.parts)):
+            return None
+        return mapped
+
+    def set(self, message: ModelMessage, mapped: MappedT) -> None:
+        """Store a mapped message."""
+        key = id(message)
+        entries = self._entries
+
+        def forget(ref: weakref.ref[ModelMessage]) -> None:
+            entry = entries.get(key)
+            if entry is not None and entry[0] is ref:
+                del entries[key]
+
+        self._entries[key] = weakref.ref(message, forget), tuple(message.parts), mapped
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 ALLOW_MODEL_REQUESTS = True
 """Whether to allow requests to models.
 
@@ -1,6 +1,5 @@
 from __future__ import annotations as _annotations
 
-import io
 from collections.abc import AsyncGenerator, AsyncIterable, AsyncIterator
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -12,6 +11,7 @@ from typing_extensions import assert_never
 
 from .. import ModelHTTPError, UnexpectedModelBehavior, _utils, usage
 from .._utils import guard_tool_call_id as _guard_tool_call_id
+from ..downloads import download, prefetch_prompt_files
 from ..messages import (
     BinaryContent,
     DocumentUrl,
@@ -32,10 +32,10 @@ from ..providers import Provider, infer_provider
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
-    cached_async_http_client,
     check_allow_model_requests,
     get_user_agent,
 )
@@ -101,6 +101,17 @@ class AnthropicModelSettings(ModelSettings, total=False):
 
     Contains `user_id`, an external identifier for the user who is associated with the request."""
 
+    anthropic_cache_system_prompt: bool
+    """Whether to add a [prompt caching](https://docs.anthropic.com/en/docs/build-with-claude/prompt-caching)
+    breakpoint after the system prompt, so it's cached along with the tool definitions before it."""
+
+    anthropic_cache_tool_definitions: bool
+    """Whether to add a prompt caching breakpoint after the tool definitions, so they're cached."""
+
+    anthropic_cache_messages: bool
+    """Whether to add a prompt caching breakpoint after the last message, so the conversation so far is cached and
+    read from the cache by the next request in the conversation, e.g. the next step of an agent run."""
+
 
 @dataclass(init=False)
 class AnthropicModel(Model):
@@ -115,6 +126,7 @@ class AnthropicModel(Model):
 
     _model_name: AnthropicModelName = field(repr=False)
     _system: str = field(default='anthropic', repr=False)
+    _mapped_messages: MessageMappingCache[tuple[str, MessageParam]] = field(repr=False)
 
     def __init__(
         self,
@@ -135,6 +147,7 @@ class AnthropicModel(Model):
         if isinstance(provider, str):
             provider = infer_provider(provider)
         self.client = provider.client
+        self._mapped_messages = MessageMappingCache()
 
     @property
     def base_url(self) -> str:
@@ -205,6 +218,8 @@ class AnthropicModel(Model):
     ) -> AnthropicMessage | AsyncStream[RawMessageStreamEvent]:
         # standalone function to make it easier to override
         tools = self._get_tools(model_request_parameters)
+        if tools and model_settings.get('anthropic_cache_tool_definitions'):
+            tools[-1]['cache_control'] = {'type': 'ephemeral'}
         tool_choice: ToolChoiceParam | None
 
         if not tools:
@@ -219,13 +234,18 @@ class AnthropicModel(Model):
                 tool_choice['disable_parallel_tool_use'] = not allow_parallel_tool_calls
 
         system_prompt, anthropic_messages = await self._map_message(messages)
+        system: str | list[TextBlockParam] = system_prompt
+        if system_prompt and model_settings.get('anthropic_cache_system_prompt'):
+            system = [TextBlockParam(type='text', text=system_prompt, cache_control={'type': 'ephemeral'})]
+        if model_settings.get('anthropic_cache_messages'):
+            anthropic_messages = _add_cache_breakpoint(anthropic_messages)
 
         try:
             extra_headers = model_settings.get('extra_headers', {})
             extra_headers.setdefault('User-Agent', get_user_agent())
             return await self.client.messages.create(
                 max_tokens=model_settings.get('max_tokens', 1024),
-                system=system_prompt or NOT_GIVEN,
+                system=system or NOT_GIVEN,
                 messages=anthropic_messages,
                 model=self._model_name,
                 tools=tools or NOT_GIVEN,
@@ -284,57 +304,69 @@ class AnthropicModel(Model):
         """Just maps a `pydantic_ai.Message` to a `anthropic.types.MessageParam`."""
         system_prompt: str = ''
         anthropic_messages: list[MessageParam] = []
+        await prefetch_prompt_files(
+            (m for m in messages if self._mapped_messages.get(m) is None),
+            lambda item: isinstance(item, DocumentUrl) and item.media_type == 'text/plain',
+        )
         for m in messages:
-            if isinstance(m, ModelRequest):
-                user_content_params: list[
-                    ToolResultBlockParam | TextBlockParam | ImageBlockParam | DocumentBlockParam
-                ] = []
-                for request_part in m.parts:
-                    if isinstance(request_part, SystemPromptPart):
-                        system_prompt += request_part.content
-                    elif isinstance(request_part, UserPromptPart):
-                        async for content in self._map_user_prompt(request_part):
-                            user_content_params.append(content)
-                    elif isinstance(request_part, ToolReturnPart):
-                        tool_result_block_param = ToolResultBlockParam(
-                            tool_use_id=_guard_tool_call_id(t=request_part),
-                            type='tool_result',
-                            content=request_part.model_response_str(),
-                            is_error=False,
-                        )
-                        user_content_params.append(tool_result_block_param)
-                    elif isinstance(request_part, RetryPromptPart):
-                        if request_part.tool_name is None:
-                            retry_param = TextBlockParam(type='text', text=request_part.model_response())
-                        else:
-                            retry_param = ToolResultBlockParam(
-                                tool_use_id=_guard_tool_call_id(t=request_part),
-                                type='tool_result',
-                                content=request_part.model_response(),
-                                is_error=True,
-                            )
-                        user_content_params.append(retry_param)
-                anthropic_messages.append(MessageParam(role='user', content=user_content_params))
-            elif isinstance(m, ModelResponse):
-                assistant_content_params: list[TextBlockParam | ToolUseBlockParam] = []
-                for response_part in m.parts:
-                    if isinstance(response_part, TextPart):
-                        assistant_content_params.append(TextBlockParam(text=response_part.content, type='text'))
-                    else:
-                        tool_use_block_param = ToolUseBlockParam(
-                            id=_guard_tool_call_id(t=response_part),
-                            type='tool_use',
-                            name=response_part.tool_name,
-                            input=response_part.args_as_dict(),
-                        )
-                        assistant_content_params.append(tool_use_block_param)
-                anthropic_messages.append(MessageParam(role='assistant', content=assistant_content_params))
-            else:
-                assert_never(m)
+            mapped = self._mapped_messages.get(m)
+            if mapped is None:
+                mapped = await self._map_model_message(m)
+                self._mapped_messages.set(m, mapped)
+            message_system_prompt, message_param = mapped
+            system_prompt += message_system_prompt
+            anthropic_messages.append(message_param)
         if instructions := self._get_instructions(messages):
             system_prompt = f'{instructions}\n\n{system_prompt}'
         return system_prompt, anthropic_messages
 
+    async def _map_model_message(self, m: ModelMessage) -> tuple[str, MessageParam]:
+        if isinstance(m, ModelRequest):
+            system_prompt: str = ''
+            user_content_params: list[ToolResultBlockParam | TextBlockParam | ImageBlockParam | DocumentBlockParam] = []
+            for request_part in m.parts:
+                if isinstance(request_part, SystemPromptPart):
+                    system_prompt += request_part.content
+                elif isinstance(request_part, UserPromptPart):
+                    async for content in self._map_user_prompt(request_part):
+                        user_content_params.append(content)
+                elif isinstance(request_part, ToolReturnPart):
+                    tool_result_block_param = ToolResultBlockParam(
+                        tool_use_id=_guard_tool_call_id(t=request_part),
+                        type='tool_result',
+                        content=request_part.model_response_str(),
+                        is_error=False,
+                    )
+                    user_content_params.append(tool_result_block_param)
+                elif isinstance(request_part, RetryPromptPart):
+                    if request_part.tool_name is None:
+                        retry_param = TextBlockParam(type='text', text=request_part.model_response())
+                    else:
+                        retry_param = ToolResultBlockParam(
+                            tool_use_id=_guard_tool_call_id(t=request_part),
+                            type='tool_result',
+                            content=request_part.model_response(),
+                            is_error=True,
+                        )
+                    user_content_params.append(retry_param)
+            return system_prompt, MessageParam(role='user', content=user_content_params)
+        elif isinstance(m, ModelResponse):
+            assistant_content_params: list[TextBlockParam | ToolUseBlockParam] = []
+            for response_part in m.parts:
+                if isinstance(response_part, TextPart):
+                    assistant_content_params.append(TextBlockParam(text=response_part.content, type='text'))
+                else:
+                    tool_use_block_param = ToolUseBlockParam(
+                        id=_guard_tool_call_id(t=response_part),
+                        type='tool_use',
+                        name=response_part.tool_name,
+                        input=response_part.args_as_dict(),
+                    )
+                    assistant_content_params.append(tool_use_block_param)
+            return '', MessageParam(role='assistant', content=assistant_content_params)
+        else:
+            assert_never(m)
+
     @staticmethod
     async def _map_user_prompt(
         part: UserPromptPart,
@@ -348,13 +380,13 @@ class AnthropicModel(Model):
                 elif isinstance(item, BinaryContent):
                     if item.is_image:
                         yield ImageBlockParam(
-                            source={'data': io.BytesIO(item.data), 'media_type': item.media_type, 'type': 'base64'},  # type: ignore
+                            source={'data': item.base64, 'media_type': item.media_type, 'type': 'base64'},  # type: ignore
                             type='image',
                         )
                     elif item.media_type == 'application/pdf':
                         yield DocumentBlockParam(
                             source=Base64PDFSourceParam(
-                                data=io.BytesIO(item.data),
+                                data=item.base64,
                                 media_type='application/pdf',
                                 type='base64',
                             ),
@@ -368,10 +400,9 @@ class AnthropicModel(Model):
                     if item.media_type == 'application/pdf':
                         yield DocumentBlockParam(source={'url': item.url, 'type': 'url'}, type='document')
                     elif item.media_type == 'text/plain':
-                        response = await cached_async_http_client().get(item.url)
-                        response.raise_for_status()
+                        downloaded = await download(item.url)
                         yield DocumentBlockParam(
-                            source=PlainTextSourceParam(data=response.text, media_type=item.media_type, type='text'),
+                            source=PlainTextSourceParam(data=downloaded.text, media_type=item.media_type, type='text'),
                             type='document',
                         )
                     else:  # pragma: no cover
@@ -388,6 +419,20 @@ class AnthropicModel(Model):
         }
 
 
+def _add_cache_breakpoint(messages: list[MessageParam]) -> list[MessageParam]:
+    """Add a prompt caching breakpoint to the last content block of the last message."""
+    if not messages:
+        return messages
+    last_message = messages[-1]
+    # mapped messages' content is always a list of blocks
+    blocks = list(cast('list[Any]', last_message['content']))
+    if not blocks:
+        return messages
+    # the mapped messages are reused by later requests, so they're copied rather than changed
+    blocks[-1] = {**blocks[-1], 'cache_control': {'type': 'ephemeral'}}
+    return [*messages[:-1], MessageParam(role=last_message['role'], content=blocks)]
+
+
 def _map_usage(message: AnthropicMessage | RawMessageStreamEvent) -> usage.Usage:
     if isinstance(message, AnthropicMessage):
         response_usage = message.usage
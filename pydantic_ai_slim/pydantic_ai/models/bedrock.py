@@ -14,6 +14,7 @@ import anyio.to_thread
 from typing_extensions import ParamSpec, assert_never
 
 from pydantic_ai import _utils, usage
+from pydantic_ai.downloads import download, prefetch_prompt_files
 from pydantic_ai.messages import (
     AudioUrl,
     BinaryContent,
@@ -32,7 +33,7 @@ from pydantic_ai.messages import (
     UserPromptPart,
     VideoUrl,
 )
-from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse, cached_async_http_client
+from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
 from pydantic_ai.providers import Provider, infer_provider
 from pydantic_ai.settings import ModelSettings
 from pydantic_ai.tools import ToolDefinition
@@ -371,6 +372,7 @@ class BedrockConverseModel(Model):
         system_prompt: list[SystemContentBlockTypeDef] = []
         bedrock_messages: list[MessageUnionTypeDef] = []
         document_count: Iterator[int] = count(1)
+        await prefetch_prompt_files(messages, lambda item: isinstance(item, (ImageUrl, DocumentUrl, VideoUrl)))
         for m in messages:
             if isinstance(m, ModelRequest):
                 for part in m.parts:
@@ -455,17 +457,16 @@ class BedrockConverseModel(Model):
                     else:
                         raise NotImplementedError('Binary content is not supported yet.')
                 elif isinstance(item, (ImageUrl, DocumentUrl, VideoUrl)):
-                    response = await cached_async_http_client().get(item.url)
-                    response.raise_for_status()
+                    downloaded = await download(item.url)
                     if item.kind == 'image-url':
                         format = item.media_type.split('/')[1]
                         assert format in ('jpeg', 'png', 'gif', 'webp'), f'Unsupported image format: {format}'
-                        image: ImageBlockTypeDef = {'format': format, 'source': {'bytes': response.content}}
+                        image: ImageBlockTypeDef = {'format': format, 'source': {'bytes': downloaded.content}}
                         content.append({'image': image})
 
                     elif item.kind == 'document-url':
                         name = f'Document {next(document_count)}'
-                        data = response.content
+                        data = downloaded.content
                         content.append({'document': {'name': name, 'format': item.format, 'source': {'bytes': data}}})
 
                     elif item.kind == 'video-url':
@@ -473,7 +474,7 @@ class BedrockConverseModel(Model):
                         assert format in ('mkv', 'mov', 'mp4', 'webm', 'flv', 'mpeg', 'mpg', 'wmv', 'three_gp'), (
                             f'Unsupported video format: {format}'
                         )
-                        video: VideoBlockTypeDef = {'format': format, 'source': {'bytes': response.content}}
+                        video: VideoBlockTypeDef = {'format': format, 'source': {'bytes': downloaded.content}}
                         content.append({'video': video})
                 elif isinstance(item, AudioUrl):  # pragma: no cover
                     raise NotImplementedError('Audio is not supported yet.')
@@ -0,0 +1,224 @@
+from __future__ import annotations as _annotations
+
+import dataclasses
+import hashlib
+import json
+from collections.abc import AsyncIterator, Awaitable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable
+
+from pydantic_core import to_jsonable_python
+
+from ..cache import CacheBackend, MemoryCache
+from ..messages import (
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    TextPart,
+    ToolCallPart,
+)
+from ..settings import ModelSettings
+from ..usage import Usage
+from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from .wrapper import WrapperModel
+
+__all__ = 'CachedModel', 'request_key'
+
+
+@dataclass(init=False)
+class CachedModel(WrapperModel):
+    """Model which caches the responses of the wrapped model.
+
+    Requests are keyed on the messages, model settings and request parameters, ignoring timestamps, so identical
+    requests return the stored response without calling the wrapped model. Streamed requests replay cached responses
+    as stream events, and responses are only stored once a stream has been consumed completely.
+
+    Responses served from the cache report no tokens, the usage has `cached_responses` and `cached_tokens` in
+    [`details`][pydantic_ai.usage.Usage.details] instead, the latter being the total tokens of the original response.
+
+    Example:
+    ```python
+    from pydantic_ai import Agent
+    from pydantic_ai.cache import MemoryCache
+    from pydantic_ai.models.cached import CachedModel
+
+    model = CachedModel('test', MemoryCache(ttl=60 * 60))
+    agent = Agent(model)
+
+    agent.run_sync('What is the capital of France?')
+    agent.run_sync('What is the capital of France?')
+    print(model.cache.stats)
+    #> CacheStats(hits=1, misses=1)
+    ```
+    """
+
+    cache: CacheBackend
+    """The store of cached responses, hit and miss counts are available from its `stats`."""
+
+    def __init__(self, wrapped: Model | KnownModelName, cache: CacheBackend | None = None):
+        """Initialize a cached model.
+
+        Args:
+            wrapped: The model to cache responses of.
+            cache: Where to store responses, defaults to an in-memory
+                [`MemoryCache`][pydantic_ai.cache.MemoryCache]. Use a [`SQLiteCache`][pydantic_ai.cache.SQLiteCache]
+                to share responses across processes and runs, and either backend's `ttl` to expire them.
+        """
+        super().__init__(wrapped)
+        self.cache = cache if cache is not None else MemoryCache()
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[ModelResponse, Usage]:
+        key = self.cache_key(messages, model_settings, model_request_parameters)
+        try:
+            return _load_cached(await self.cache.aget(key))
+        except KeyError:
+            pass
+        response, usage = await self.wrapped.request(messages, model_settings, model_request_parameters)
+        await self.cache.aset(key, _dump_cached(response, usage))
+        return response, usage
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        key = self.cache_key(messages, model_settings, model_request_parameters)
+        try:
+            response, usage = _load_cached(await self.cache.aget(key))
+        except KeyError:
+            pass
+        else:
+            yield CachedStreamedResponse(response, usage)
+            return
+
+        async def store(response: ModelResponse, usage: Usage) -> None:
+            await self.cache.aset(key, _dump_cached(response, usage))
+
+        async with self.wrapped.request_stream(messages, model_settings, model_request_parameters) as response_stream:
+            yield _RecordingStreamedResponse(response_stream, store)
+
+    def cache_key(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> str:
+        """Build the cache key for a request, see [`request_key`][pydantic_ai.models.cached.request_key]."""
+        return request_key(self, messages, model_settings, model_request_parameters)
+
+
+def request_key(
+    model: Model,
+    messages: list[ModelMessage],
+    model_settings: ModelSettings | None,
+    model_request_parameters: ModelRequestParameters,
+) -> str:
+    """Build a key identifying a request, a hash of the model name and the serialized request.
+
+    Timestamps are left out of the key, so rerunning the same conversation gives the same key.
+    """
+    request = {
+        'model': f'{model.system}:{model.model_name}',
+        'messages': _without_timestamps(ModelMessagesTypeAdapter.dump_python(messages, mode='json')),
+        'model_settings': to_jsonable_python(model_settings, fallback=repr),
+        'model_request_parameters': to_jsonable_python(model_request_parameters, fallback=repr),
+    }
+    data = json.dumps(request, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+@dataclass
+class CachedStreamedResponse(StreamedResponse):
+    """A streamed response replaying a cached response, each part is sent as a single event."""
+
+    _response: ModelResponse
+    _cached_usage: Usage = field(repr=False)
+
+    def __post_init__(self):
+        self._usage = self._cached_usage
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        for index, part in enumerate(self._response.parts):
+            if isinstance(part, TextPart):
+                yield self._parts_manager.handle_text_delta(vendor_part_id=index, content=part.content)
+            else:
+                yield self._parts_manager.handle_tool_call_part(
+                    vendor_part_id=index, tool_name=part.tool_name, args=part.args, tool_call_id=part.tool_call_id
+                )
+
+    @property
+    def model_name(self) -> str:
+        return self._response.model_name or ''
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._response.timestamp
+
+
+@dataclass
+class _RecordingStreamedResponse(StreamedResponse):
+    """Passes through a streamed response, calling `on_complete` once it has been consumed completely."""
+
+    _wrapped: StreamedResponse
+    _on_complete: Callable[[ModelResponse, Usage], Awaitable[None]] = field(repr=False)
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        async for event in self._wrapped:
+            yield event
+        await self._on_complete(self._wrapped.get(), self._wrapped.usage())
+
+    def get(self) -> ModelResponse:
+        return self._wrapped.get()
+
+    def _get_completed_tool_calls(self, start: int) -> list[ToolCallPart]:
+        return self._wrapped._get_completed_tool_calls(start)
+
+    def get_partial_tool_call_args(self, tool_call: ToolCallPart) -> dict[str, Any] | None:
+        return self._wrapped.get_partial_tool_call_args(tool_call)
+
+    def usage(self) -> Usage:
+        return self._wrapped.usage()
+
+    @property
+    def model_name(self) -> str:
+        return self._wrapped.model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        return self._wrapped.timestamp
+
+
+def _dump_cached(response: ModelResponse, usage: Usage) -> tuple[bytes, dict[str, Any]]:
+    return ModelMessagesTypeAdapter.dump_json([response]), dataclasses.asdict(usage)
+
+
+def _load_cached(value: tuple[bytes, dict[str, Any]]) -> tuple[ModelResponse, Usage]:
+    response_json, usage_fields = value
+    [response] = ModelMessagesTypeAdapter.validate_json(response_json)
+    assert isinstance(response, ModelResponse)
+    original_usage = Usage(**usage_fields)
+    details = {'cached_responses': 1}
+    if original_usage.total_tokens:
+        details['cached_tokens'] = original_usage.total_tokens
+    return response, Usage(details=details)
+
+
+def _without_timestamps(messages: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Remove the `timestamp` fields of the messages and their parts, leaving any in tool arguments and results."""
+    return [
+        {
+            **{k: v for k, v in message.items() if k != 'timestamp'},
+            'parts': [{k: v for k, v in part.items() if k != 'timestamp'} for part in message['parts']],
+        }
+        for message in messages
+    ]
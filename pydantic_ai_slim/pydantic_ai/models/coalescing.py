@@ -0,0 +1,232 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+import functools
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TypeVar
+
+from ..messages import (
+    ModelMessage,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+)
+from ..settings import ModelSettings
+from ..usage import Usage
+from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from .cached import request_key
+from .wrapper import WrapperModel
+
+__all__ = ('CoalescingModel',)
+
+_InFlightT = TypeVar('_InFlightT')
+
+
+@dataclass(init=False)
+class CoalescingModel(WrapperModel):
+    """Model which shares a single request to the wrapped model between identical concurrent requests.
+
+    Requests are identified with [`request_key`][pydantic_ai.models.cached.request_key]. While a request is in
+    flight, identical requests wait for its response instead of calling the wrapped model again. Streamed requests
+    are shared the same way, and requests joining a stream late receive all its events from the start.
+
+    Cancelling one of the waiting requests doesn't affect the others, the request to the wrapped model is only
+    cancelled once every request waiting for it has been cancelled.
+
+    Only the first request reports the usage of the response, the others report no tokens and have
+    `coalesced_requests` in [`details`][pydantic_ai.usage.Usage.details] instead, so usage isn't counted twice.
+    """
+
+    _requests: dict[str, _InFlightRequest] = field(repr=False)
+    _streams: dict[str, _InFlightStream] = field(repr=False)
+
+    def __init__(self, wrapped: Model | KnownModelName):
+        """Initialize a coalescing model.
+
+        Args:
+            wrapped: The model to share requests to.
+        """
+        super().__init__(wrapped)
+        self._requests = {}
+        self._streams = {}
+
+    async def request(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> tuple[ModelResponse, Usage]:
+        key = request_key(self, messages, model_settings, model_request_parameters)
+        in_flight = self._requests.get(key)
+        first = in_flight is None
+        if in_flight is None:
+            task = asyncio.create_task(self.wrapped.request(messages, model_settings, model_request_parameters))
+            in_flight = self._requests[key] = _InFlightRequest(task)
+            task.add_done_callback(functools.partial(_forget, self._requests, key, in_flight))
+
+        in_flight.waiters += 1
+        try:
+            response, usage = await asyncio.shield(in_flight.task)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                in_flight.task.cancel()
+                _forget(self._requests, key, in_flight)
+        return response, usage if first else _coalesced_usage()
+
+    @asynccontextmanager
+    async def request_stream(
+        self,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> AsyncIterator[StreamedResponse]:
+        key = request_key(self, messages, model_settings, model_request_parameters)
+        in_flight = self._streams.get(key)
+        first = in_flight is None
+        if in_flight is None:
+            in_flight = self._streams[key] = _InFlightStream()
+            in_flight.task = asyncio.create_task(
+                in_flight.run(self.wrapped, messages, model_settings, model_request_parameters)
+            )
+            in_flight.task.add_done_callback(functools.partial(_forget, self._streams, key, in_flight))
+
+        in_flight.waiters += 1
+        try:
+            await asyncio.shield(in_flight.started.wait())
+            if in_flight.stream is None:
+                assert in_flight.error is not None
+                raise in_flight.error
+            yield _CoalescedStreamedResponse(in_flight, first)
+        finally:
+            in_flight.waiters -= 1
+            if in_flight.waiters == 0 and not in_flight.task.done():
+                in_flight.task.cancel()
+                _forget(self._streams, key, in_flight)
+
+
+@dataclass
+class _InFlightRequest:
+    task: asyncio.Task[tuple[ModelResponse, Usage]]
+    waiters: int = 0
+
+
+@dataclass
+class _InFlightStream:
+    """A streamed request to the wrapped model, buffering its events for every request sharing it."""
+
+    task: asyncio.Task[None] = field(init=False)
+    waiters: int = 0
+    stream: StreamedResponse | None = None
+    events: list[ModelResponseStreamEvent] = field(default_factory=list)
+    done: bool = False
+    error: BaseException | None = None
+    started: asyncio.Event = field(default_factory=asyncio.Event)
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    async def run(
+        self,
+        model: Model,
+        messages: list[ModelMessage],
+        model_settings: ModelSettings | None,
+        model_request_parameters: ModelRequestParameters,
+    ) -> None:
+        try:
+            async with model.request_stream(messages, model_settings, model_request_parameters) as stream:
+                self.stream = stream
+                self.started.set()
+                async for event in stream:
+                    self.events.append(event)
+                    async with self.changed:
+                        self.changed.notify_all()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self.started.set()
+            async with self.changed:
+                self.changed.notify_all()
+
+
+@dataclass
+class _CoalescedStreamedResponse(StreamedResponse):
+    """One request's view of a shared stream, replaying the buffered events into its own parts."""
+
+    _in_flight: _InFlightStream
+    _first: bool
+
+    def __post_init__(self):
+        if not self._first:
+            self._usage = _coalesced_usage()
+
+    async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
+        in_flight = self._in_flight
+        index = 0
+        while True:
+            if index == len(in_flight.events):
+                if in_flight.done:
+                    break
+                async with in_flight.changed:
+                    await in_flight.changed.wait_for(lambda: index < len(in_flight.events) or in_flight.done)
+                continue
+            event = self._replay(in_flight.events[index])
+            index += 1
+            if event is not None:
+                yield event
+        if in_flight.error is not None:
+            raise in_flight.error
+
+    def _replay(self, event: ModelResponseStreamEvent) -> ModelResponseStreamEvent | None:
+        if isinstance(event, PartStartEvent):
+            part = event.part
+            if isinstance(part, TextPart):
+                return self._parts_manager.handle_text_delta(vendor_part_id=event.index, content=part.content)
+            else:
+                return self._parts_manager.handle_tool_call_part(
+                    vendor_part_id=event.index, tool_name=part.tool_name, args=part.args, tool_call_id=part.tool_call_id
+                )
+        elif isinstance(event, PartDeltaEvent):
+            delta = event.delta
+            if isinstance(delta, TextPartDelta):
+                return self._parts_manager.handle_text_delta(vendor_part_id=event.index, content=delta.content_delta)
+            else:
+                return self._parts_manager.handle_tool_call_delta(
+                    vendor_part_id=event.index,
+                    tool_name=delta.tool_name_delta,
+                    args=delta.args_delta,
+                    tool_call_id=delta.tool_call_id,
+                )
+        else:
+            return event
+
+    def usage(self) -> Usage:
+        if self._first:
+            assert self._in_flight.stream is not None
+            return self._in_flight.stream.usage()
+        return self._usage
+
+    @property
+    def model_name(self) -> str:
+        assert self._in_flight.stream is not None
+        return self._in_flight.stream.model_name
+
+    @property
+    def timestamp(self) -> datetime:
+        assert self._in_flight.stream is not None
+        return self._in_flight.stream.timestamp
+
+
+def _forget(in_flight_by_key: dict[str, _InFlightT], key: str, in_flight: _InFlightT, *_: object) -> None:
+    """Remove a finished or cancelled request, so later requests with the same key start a new one."""
+    if in_flight_by_key.get(key) is in_flight:
+        del in_flight_by_key[key]
+
+
+def _coalesced_usage() -> Usage:
+    return Usage(details={'coalesced_requests': 1})
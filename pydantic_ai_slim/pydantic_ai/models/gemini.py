@@ -1,6 +1,6 @@
 from __future__ import annotations as _annotations
 
-import base64
+import re
 import warnings
 from collections.abc import AsyncIterator, Sequence
 from contextlib import asynccontextmanager
@@ -17,6 +17,7 @@ from typing_extensions import NotRequired, TypedDict, assert_never
 from pydantic_ai.providers import Provider, infer_provider
 
 from .. import ModelHTTPError, UnexpectedModelBehavior, UserError, _utils, usage
+from ..downloads import download, prefetch_prompt_files
 from ..messages import (
     AudioUrl,
     BinaryContent,
@@ -38,10 +39,10 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
-    cached_async_http_client,
     check_allow_model_requests,
     get_user_agent,
 )
@@ -111,6 +112,7 @@ class GeminiModel(Model):
     _auth: AuthProtocol | None = field(repr=False)
     _url: str | None = field(repr=False)
     _system: str = field(default='gemini', repr=False)
+    _mapped_messages: MessageMappingCache[tuple[list[_GeminiTextPart], _GeminiContent | None]] = field(repr=False)
 
     def __init__(
         self,
@@ -134,6 +136,7 @@ class GeminiModel(Model):
         self._system = provider.name
         self.client = provider.client
         self._url = str(self.client.base_url)
+        self._mapped_messages = MessageMappingCache()
 
     @property
     def base_url(self) -> str:
@@ -274,61 +277,67 @@ class GeminiModel(Model):
     async def _process_streamed_response(self, http_response: HTTPResponse) -> StreamedResponse:
         """Process a streamed response, and prepare a streaming response to return."""
         aiter_bytes = http_response.aiter_bytes()
-        start_response: _GeminiResponse | None = None
-        content = bytearray()
+        splitter = _JsonArraySplitter()
+        responses: list[_GeminiResponse] = []
 
         async for chunk in aiter_bytes:
-            content.extend(chunk)
-            responses = _gemini_streamed_response_ta.validate_json(
-                _ensure_decodeable(content),
-                experimental_allow_partial='trailing-strings',
-            )
-            if responses:
-                last = responses[-1]
-                if last['candidates'] and last['candidates'][0].get('content', {}).get('parts'):
-                    start_response = last
-                    break
-
-        if start_response is None:
+            new_responses = [_gemini_response_ta.validate_json(element) for element in splitter.feed(chunk)]
+            responses.extend(new_responses)
+            if any(r['candidates'] and r['candidates'][0].get('content', {}).get('parts') for r in new_responses):
+                break
+        else:
             raise UnexpectedModelBehavior('Streamed response ended without content or tool calls')
 
-        return GeminiStreamedResponse(_model_name=self._model_name, _content=content, _stream=aiter_bytes)
+        return GeminiStreamedResponse(
+            _model_name=self._model_name, _responses=responses, _splitter=splitter, _stream=aiter_bytes
+        )
 
     async def _message_to_gemini_content(
         self, messages: list[ModelMessage]
     ) -> tuple[list[_GeminiTextPart], list[_GeminiContent]]:
         sys_prompt_parts: list[_GeminiTextPart] = []
         contents: list[_GeminiContent] = []
+        await prefetch_prompt_files((m for m in messages if self._mapped_messages.get(m) is None), lambda item: True)
         for m in messages:
-            if isinstance(m, ModelRequest):
-                message_parts: list[_GeminiPartUnion] = []
-
-                for part in m.parts:
-                    if isinstance(part, SystemPromptPart):
-                        sys_prompt_parts.append(_GeminiTextPart(text=part.content))
-                    elif isinstance(part, UserPromptPart):
-                        message_parts.extend(await self._map_user_prompt(part))
-                    elif isinstance(part, ToolReturnPart):
-                        message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
-                    elif isinstance(part, RetryPromptPart):
-                        if part.tool_name is None:
-                            message_parts.append(_GeminiTextPart(text=part.model_response()))
-                        else:
-                            response = {'call_error': part.model_response()}
-                            message_parts.append(_response_part_from_response(part.tool_name, response))
-                    else:
-                        assert_never(part)
-
-                if message_parts:
-                    contents.append(_GeminiContent(role='user', parts=message_parts))
-            elif isinstance(m, ModelResponse):
-                contents.append(_content_model_response(m))
-            else:
-                assert_never(m)
+            mapped = self._mapped_messages.get(m)
+            if mapped is None:
+                mapped = await self._map_message(m)
+                self._mapped_messages.set(m, mapped)
+            message_sys_prompt_parts, content = mapped
+            sys_prompt_parts.extend(message_sys_prompt_parts)
+            if content is not None:
+                contents.append(content)
         if instructions := self._get_instructions(messages):
             sys_prompt_parts.insert(0, _GeminiTextPart(text=instructions))
         return sys_prompt_parts, contents
 
+    async def _map_message(self, m: ModelMessage) -> tuple[list[_GeminiTextPart], _GeminiContent | None]:
+        if isinstance(m, ModelRequest):
+            sys_prompt_parts: list[_GeminiTextPart] = []
+            message_parts: list[_GeminiPartUnion] = []
+
+            for part in m.parts:
+                if isinstance(part, SystemPromptPart):
+                    sys_prompt_parts.append(_GeminiTextPart(text=part.content))
+                elif isinstance(part, UserPromptPart):
+                    message_parts.extend(await self._map_user_prompt(part))
+                elif isinstance(part, ToolReturnPart):
+                    message_parts.append(_response_part_from_response(part.tool_name, part.model_response_object()))
+                elif isinstance(part, RetryPromptPart):
+                    if part.tool_name is None:
+                        message_parts.append(_GeminiTextPart(text=part.model_response()))
+                    else:
+                        response = {'call_error': part.model_response()}
+                        message_parts.append(_response_part_from_response(part.tool_name, response))
+                else:
+                    assert_never(part)
+
+            return sys_prompt_parts, _GeminiContent(role='user', parts=message_parts) if message_parts else None
+        elif isinstance(m, ModelResponse):
+            return [], _content_model_response(m)
+        else:
+            assert_never(m)
+
     async def _map_user_prompt(self, part: UserPromptPart) -> list[_GeminiPartUnion]:
         if isinstance(part.content, str):
             return [{'text': part.content}]
@@ -338,17 +347,14 @@ class GeminiModel(Model):
                 if isinstance(item, str):
                     content.append({'text': item})
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
+                    base64_encoded = item.base64
                     content.append(
                         _GeminiInlineDataPart(inline_data={'data': base64_encoded, 'mime_type': item.media_type})
                     )
                 elif isinstance(item, (AudioUrl, ImageUrl, DocumentUrl, VideoUrl)):
-                    client = cached_async_http_client()
-                    response = await client.get(item.url, follow_redirects=True)
-                    response.raise_for_status()
-                    mime_type = response.headers['Content-Type'].split(';')[0]
+                    downloaded = await download(item.url)
                     inline_data = _GeminiInlineDataPart(
-                        inline_data={'data': base64.b64encode(response.content).decode('utf-8'), 'mime_type': mime_type}
+                        inline_data={'data': downloaded.base64, 'mime_type': downloaded.media_type}
                     )
                     content.append(inline_data)
                 else:
@@ -378,7 +384,9 @@ class GeminiStreamedResponse(StreamedResponse):
     """Implementation of `StreamedResponse` for the Gemini model."""
 
     _model_name: GeminiModelName
-    _content: bytearray
+    _responses: list[_GeminiResponse]
+    """Responses already received from the stream, while waiting for content."""
+    _splitter: _JsonArraySplitter
     _stream: AsyncIterator[bytes]
     _timestamp: datetime = field(default_factory=_utils.now_utc, init=False)
 
@@ -411,36 +419,18 @@ class GeminiStreamedResponse(StreamedResponse):
                     assert 'function_response' in gemini_part, f'Unexpected part: {gemini_part}'
 
     async def _get_gemini_responses(self) -> AsyncIterator[_GeminiResponse]:
-        # This method exists to ensure we only yield completed items, so we don't need to worry about
-        # partial gemini responses, which would make everything more complicated
+        # Each response is validated once it's complete, so we don't need to worry about partial gemini responses,
+        # which would make everything more complicated, and don't re-validate the whole stream on each chunk
+        for r in self._responses:
+            self._usage += _metadata_as_usage(r)
+            yield r
 
-        gemini_responses: list[_GeminiResponse] = []
-        current_gemini_response_index = 0
-        # Right now, there are some circumstances where we will have information that could be yielded sooner than it is
-        # But changing that would make things a lot more complicated.
         async for chunk in self._stream:
-            self._content.extend(chunk)
-
-            gemini_responses = _gemini_streamed_response_ta.validate_json(
-                _ensure_decodeable(self._content),
-                experimental_allow_partial='trailing-strings',
-            )
-
-            # The idea: yield only up to the latest response, which might still be partial.
-            # Note that if the latest response is complete, we could yield it immediately, but there's not a good
-            # allow_partial API to determine if the last item in the list is complete.
-            responses_to_yield = gemini_responses[:-1]
-            for r in responses_to_yield[current_gemini_response_index:]:
-                current_gemini_response_index += 1
+            for element in self._splitter.feed(chunk):
+                r = _gemini_response_ta.validate_json(element)
                 self._usage += _metadata_as_usage(r)
                 yield r
 
-        # Now yield the final response, which should be complete
-        if gemini_responses:
-            r = gemini_responses[-1]
-            self._usage += _metadata_as_usage(r)
-            yield r
-
     @property
     def model_name(self) -> GeminiModelName:
         """Get the model name of the response."""
@@ -867,17 +857,71 @@ class _GeminiJsonSchema(WalkJsonSchema):
         return schema
 
 
-def _ensure_decodeable(content: bytearray) -> bytearray:
-    """Trim any invalid unicode point bytes off the end of a bytearray.
+_ARRAY_SYNTAX = re.compile(rb'[\[\]{}"]')
+_STRING_SYNTAX = re.compile(rb'["\\]')
 
-    This is necessary before attempting to parse streaming JSON bytes.
 
-    This is a temporary workaround until https://github.com/pydantic/pydantic-core/issues/1633 is resolved
+class _JsonArraySplitter:
+    """Split a streamed JSON array into the JSON of its elements, as each one is completed.
+
+    Each byte is only scanned once, tracking the bracket depth and whether it's in a string across chunks.
+    The bytes of multi-byte UTF-8 characters are never ASCII, so they don't need decoding
+    and a chunk ending part way through one doesn't matter.
     """
-    while True:
-        try:
-            content.decode()
-        except UnicodeDecodeError:
-            content = content[:-1]  # this will definitely succeed before we run out of bytes
-        else:
-            return content
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._element_start: int | None = None
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add the next chunk of the array, returning the elements it completes."""
+        buffer = self._buffer
+        buffer.extend(chunk)
+        elements: list[bytes] = []
+        pos = self._pos
+        end = len(buffer)
+        while pos < end:
+            if self._in_string:
+                match = _STRING_SYNTAX.search(buffer, pos)
+                if match is None:
+                    pos = end
+                elif buffer[match.start()] == ord('"'):
+                    self._in_string = False
+                    pos = match.end()
+                elif match.end() < end:
+                    # skip the escaped character, which might be a quote
+                    pos = match.end() + 1
+                else:
+                    # the escaped character is in the next chunk
+                    pos = match.start()
+                    break
+                continue
+
+            match = _ARRAY_SYNTAX.search(buffer, pos)
+            if match is None:
+                pos = end
+                break
+            pos = match.end()
+            char = buffer[match.start()]
+            if char == ord('"'):
+                self._in_string = True
+            elif char == ord('[') or char == ord('{'):
+                if self._depth == 1:
+                    self._element_start = match.start()
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 1 and self._element_start is not None:
+                    elements.append(bytes(buffer[self._element_start : pos]))
+                    self._element_start = None
+
+        # drop what's been scanned, except the start of an incomplete element
+        keep_from = pos if self._element_start is None else self._element_start
+        del buffer[:keep_from]
+        self._pos = pos - keep_from
+        if self._element_start is not None:
+            self._element_start = 0
+        return elements
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import json
-from collections.abc import AsyncIterator, Iterator, Mapping
+from collections.abc import AsyncIterator, Iterator, Mapping, Set
 from contextlib import asynccontextmanager, contextmanager
 from dataclasses import dataclass, field
 from typing import Any, Callable, Literal
@@ -13,7 +13,7 @@ from opentelemetry._events import (
     EventLoggerProvider,  # pyright: ignore[reportPrivateImportUsage]
     get_event_logger_provider,  # pyright: ignore[reportPrivateImportUsage]
 )
-from opentelemetry.trace import Span, Tracer, TracerProvider, get_tracer_provider
+from opentelemetry.trace import Span, Tracer, TracerProvider, get_current_span, get_tracer_provider
 from opentelemetry.util.types import AttributeValue
 from pydantic import TypeAdapter
 
@@ -24,7 +24,7 @@ from ..messages import (
 )
 from ..settings import ModelSettings
 from ..usage import Usage
-from . import KnownModelName, Model, ModelRequestParameters, StreamedResponse
+from . import KnownModelName, MessageMappingCache, Model, ModelRequestParameters, StreamedResponse
 from .wrapper import WrapperModel
 
 MODEL_SETTING_ATTRIBUTES: tuple[
@@ -48,6 +48,18 @@ MODEL_SETTING_ATTRIBUTES: tuple[
 
 ANY_ADAPTER = TypeAdapter[Any](Any)
 
+# add the JSON schema so these attributes are formatted nicely in Logfire
+_REQUEST_JSON_SCHEMA = json.dumps({'type': 'object', 'properties': {'model_request_parameters': {'type': 'object'}}})
+_EVENTS_JSON_SCHEMA = json.dumps(
+    {
+        'type': 'object',
+        'properties': {
+            'events': {'type': 'array'},
+            'model_request_parameters': {'type': 'object'},
+        },
+    }
+)
+
 
 @dataclass(init=False)
 class InstrumentationSettings:
@@ -65,6 +77,8 @@ class InstrumentationSettings:
     tracer: Tracer = field(repr=False)
     event_logger: EventLogger = field(repr=False)
     event_mode: Literal['attributes', 'logs'] = 'attributes'
+    incremental_events: bool = False
+    max_event_content_length: int | None = None
 
     def __init__(
         self,
@@ -72,6 +86,8 @@ class InstrumentationSettings:
         event_mode: Literal['attributes', 'logs'] = 'attributes',
         tracer_provider: TracerProvider | None = None,
         event_logger_provider: EventLoggerProvider | None = None,
+        incremental_events: bool = False,
+        max_event_content_length: int | None = None,
     ):
         """Create instrumentation options.
 
@@ -85,6 +101,15 @@ class InstrumentationSettings:
                 If not provided, the global event logger provider is used.
                 Calling `logfire.configure()` sets the global event logger provider, so most users don't need this.
                 This is only used if `event_mode='logs'`.
+            incremental_events: Whether each model request in an agent run only emits events for the messages which
+                weren't already emitted by an earlier request in the run, rather than for the whole history, so the cost
+                of instrumenting a request doesn't grow with the length of the run. Events keep their
+                `gen_ai.message.index`, and the number of messages left out is recorded in the
+                `pydantic_ai.previous_messages` attribute of the request span; their events are on the earlier request
+                spans under the same agent run span. Requests made outside a span, e.g. with no instrumented agent run,
+                always emit events for the whole history.
+            max_event_content_length: The maximum length of strings in event bodies, such as message contents and tool
+                call arguments, longer strings are truncated. `None` means no limit.
         """
         from pydantic_ai import __version__
 
@@ -93,6 +118,8 @@ class InstrumentationSettings:
         self.tracer = tracer_provider.get_tracer('pydantic-ai', __version__)
         self.event_logger = event_logger_provider.get_event_logger('pydantic-ai', __version__)
         self.event_mode = event_mode
+        self.incremental_events = incremental_events
+        self.max_event_content_length = max_event_content_length
 
 
 GEN_AI_SYSTEM_ATTRIBUTE = 'gen_ai.system'
@@ -109,6 +136,11 @@ class InstrumentedModel(WrapperModel):
     settings: InstrumentationSettings
     """Configuration for instrumenting requests."""
 
+    _emitted_messages: MessageMappingCache[int] = field(repr=False)
+    """The span ID of the agent run each message's events were last emitted in, for incremental events."""
+    _serialized_parameters: tuple[ModelRequestParameters, str] | None = field(repr=False)
+    """The last request parameters and their serialization, reused while requests have the same parameters."""
+
     def __init__(
         self,
         wrapped: Model | KnownModelName,
@@ -116,6 +148,8 @@ class InstrumentedModel(WrapperModel):
     ) -> None:
         super().__init__(wrapped)
         self.settings = options or InstrumentationSettings()
+        self._emitted_messages = MessageMappingCache()
+        self._serialized_parameters = None
 
     async def request(
         self,
@@ -161,13 +195,6 @@ class InstrumentedModel(WrapperModel):
         attributes: dict[str, AttributeValue] = {
             'gen_ai.operation.name': operation,
             **self.model_attributes(self.wrapped),
-            'model_request_parameters': json.dumps(InstrumentedModel.serialize_any(model_request_parameters)),
-            'logfire.json_schema': json.dumps(
-                {
-                    'type': 'object',
-                    'properties': {'model_request_parameters': {'type': 'object'}},
-                }
-            ),
         }
 
         if model_settings:
@@ -175,14 +202,38 @@ class InstrumentedModel(WrapperModel):
                 if isinstance(value := model_settings.get(key), (float, int)):
                     attributes[f'gen_ai.request.{key}'] = value
 
+        # requests in an agent run are made within the run span
+        run_span_context = get_current_span().get_span_context()
+        run_span_id = run_span_context.span_id if run_span_context.is_valid else None
+
         with self.settings.tracer.start_as_current_span(span_name, attributes=attributes) as span:
+            if span.is_recording():
+                span.set_attributes(
+                    {
+                        'model_request_parameters': self._serialize_parameters(model_request_parameters),
+                        'logfire.json_schema': _REQUEST_JSON_SCHEMA,
+                    }
+                )
 
             def finish(response: ModelResponse, usage: Usage):
                 if not span.is_recording():
                     return
 
-                events = self.messages_to_otel_events(messages)
-                for event in self.messages_to_otel_events([response]):
+                max_content_length = self.settings.max_event_content_length
+                previous_messages: set[int] = set()
+                if self.settings.incremental_events and run_span_id is not None:
+                    for index, message in enumerate(messages):
+                        if self._emitted_messages.get(message) == run_span_id:
+                            previous_messages.add(index)
+                        else:
+                            self._emitted_messages.set(message, run_span_id)
+                    self._emitted_messages.set(response, run_span_id)
+                    span.set_attribute('pydantic_ai.previous_messages', len(previous_messages))
+
+                events = self.messages_to_otel_events(
+                    messages, exclude=previous_messages, max_content_length=max_content_length
+                )
+                for event in self.messages_to_otel_events([response], max_content_length=max_content_length):
                     events.append(
                         Event(
                             'gen_ai.choice',
@@ -208,24 +259,25 @@ class InstrumentedModel(WrapperModel):
 
             yield finish
 
+    def _serialize_parameters(self, model_request_parameters: ModelRequestParameters) -> str:
+        # the parameters are usually the same on every request of a run, and comparing them is much cheaper than
+        # serializing all the tool schemas again, as the schemas are the same objects
+        cached = self._serialized_parameters
+        if cached is not None and cached[0] == model_request_parameters:
+            return cached[1]
+        serialized = json.dumps(InstrumentedModel.serialize_any(model_request_parameters))
+        self._serialized_parameters = model_request_parameters, serialized
+        return serialized
+
     def _emit_events(self, span: Span, events: list[Event]) -> None:
         if self.settings.event_mode == 'logs':
             for event in events:
                 self.settings.event_logger.emit(event)
         else:
-            attr_name = 'events'
             span.set_attributes(
                 {
-                    attr_name: json.dumps([self.event_to_dict(event) for event in events]),
-                    'logfire.json_schema': json.dumps(
-                        {
-                            'type': 'object',
-                            'properties': {
-                                attr_name: {'type': 'array'},
-                                'model_request_parameters': {'type': 'object'},
-                            },
-                        }
-                    ),
+                    'events': json.dumps([self.event_to_dict(event) for event in events]),
+                    'logfire.json_schema': _EVENTS_JSON_SCHEMA,
                 }
             )
 
@@ -259,17 +311,28 @@ class InstrumentedModel(WrapperModel):
         return {**body, **(event.attributes or {})}
 
     @staticmethod
-    def messages_to_otel_events(messages: list[ModelMessage]) -> list[Event]:
+    def messages_to_otel_events(
+        messages: list[ModelMessage], *, exclude: Set[int] = frozenset(), max_content_length: int | None = None
+    ) -> list[Event]:
+        """Convert messages to OpenTelemetry events.
+
+        Args:
+            messages: The messages to convert.
+            exclude: Indexes of messages to leave out, e.g. because their events were already emitted.
+            max_content_length: The maximum length of strings in the event bodies, longer strings are truncated.
+        """
         events: list[Event] = []
         last_model_request: ModelRequest | None = None
         for message_index, message in enumerate(messages):
             message_events: list[Event] = []
             if isinstance(message, ModelRequest):
                 last_model_request = message
+                if message_index in exclude:
+                    continue
                 for part in message.parts:
                     if hasattr(part, 'otel_event'):
                         message_events.append(part.otel_event())
-            elif isinstance(message, ModelResponse):
+            elif isinstance(message, ModelResponse) and message_index not in exclude:
                 message_events = message.otel_events()
             for event in message_events:
                 event.attributes = {
@@ -283,6 +346,8 @@ class InstrumentedModel(WrapperModel):
             )
         for event in events:
             event.body = InstrumentedModel.serialize_any(event.body)
+            if max_content_length is not None:
+                event.body = _truncate_strings(event.body, max_content_length)
         return events
 
     @staticmethod
@@ -294,3 +359,17 @@ class InstrumentedModel(WrapperModel):
                 return str(value)
             except Exception as e:
                 return f'Unable to serialize: {e}'
+
+
+def _truncate_strings(value: Any, max_length: int) -> Any:
+    """Truncate the strings in a JSON-compatible value to a maximum length."""
+    if isinstance(value, str):
+        if len(value) > max_length:
+            return f'{value[:max_length]}... ({len(value) - max_length} characters truncated)'
+        return value
+    elif isinstance(value, dict):
+        return {k: _truncate_strings(v, max_length) for k, v in value.items()}  # pyright: ignore[reportUnknownVariableType]
+    elif isinstance(value, list):
+        return [_truncate_strings(v, max_length) for v in value]  # pyright: ignore[reportUnknownVariableType]
+    else:
+        return value
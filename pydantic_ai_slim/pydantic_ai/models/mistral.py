@@ -1,6 +1,5 @@
 from __future__ import annotations as _annotations
 
-import base64
 from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
@@ -12,6 +11,7 @@ from httpx import Timeout
 from typing_extensions import assert_never
 
 from .. import ModelHTTPError, UnexpectedModelBehavior, _utils
+from .._partial_json import IncrementalJsonParser
 from .._utils import generate_tool_call_id as _generate_tool_call_id, now_utc as _now_utc
 from ..messages import (
     BinaryContent,
@@ -510,7 +510,7 @@ class MistralModel(Model):
                 elif isinstance(item, ImageUrl):
                     content.append(MistralImageURLChunk(image_url=MistralImageURL(url=item.url)))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
+                    base64_encoded = item.base64
                     if item.is_image:
                         image_url = MistralImageURL(url=f'data:{item.media_type};base64,{base64_encoded}')
                         content.append(MistralImageURLChunk(image_url=image_url, type='image_url'))
@@ -537,7 +537,9 @@ class MistralStreamedResponse(StreamedResponse):
     _timestamp: datetime
     _output_tools: dict[str, ToolDefinition]
 
-    _delta_content: str = field(default='', init=False)
+    _output_parser: IncrementalJsonParser = field(default_factory=IncrementalJsonParser, init=False)
+    _output_text: list[str] = field(default_factory=list, init=False)
+    _output_tool: ToolDefinition | None = field(default=None, init=False)
 
     async def _get_event_iterator(self) -> AsyncIterator[ModelResponseStreamEvent]:
         chunk: MistralCompletionEvent
@@ -555,8 +557,7 @@ class MistralStreamedResponse(StreamedResponse):
             if text:
                 # Attempt to produce an output tool call from the received text
                 if self._output_tools:
-                    self._delta_content += text
-                    maybe_tool_call_part = self._try_get_output_tool_from_text(self._delta_content, self._output_tools)
+                    maybe_tool_call_part = self._try_get_output_tool_from_text(text)
                     if maybe_tool_call_part:
                         yield self._parts_manager.handle_tool_call_part(
                             vendor_part_id='output',
@@ -584,21 +585,33 @@ class MistralStreamedResponse(StreamedResponse):
         """Get the timestamp of the response."""
         return self._timestamp
 
-    @staticmethod
-    def _try_get_output_tool_from_text(text: str, output_tools: dict[str, ToolDefinition]) -> ToolCallPart | None:
-        output_json: dict[str, Any] | None = pydantic_core.from_json(text, allow_partial='trailing-strings')
-        if output_json:
-            for output_tool in output_tools.values():
+    def _try_get_output_tool_from_text(self, text: str) -> ToolCallPart | None:
+        # Parse just the new text, rather than all the text so far, so long outputs aren't quadratic
+        self._output_text.append(text)
+        self._output_parser.feed(text)
+        if self._output_parser.failed:
+            # e.g. `NaN`, which the incremental parser doesn't support, so parse all the text as before
+            output_json: Any = pydantic_core.from_json(''.join(self._output_text), allow_partial='trailing-strings')
+        else:
+            output_json = self._output_parser.value
+        if isinstance(output_json, _utils.Unset) or not output_json:
+            return None
+
+        if self._output_tool is None:
+            for output_tool in self._output_tools.values():
                 # NOTE: Additional verification to prevent JSON validation to crash
                 # Ensures required parameters in the JSON schema are respected, especially for stream-based return types.
                 # Example with BaseModel and required fields.
-                if not MistralStreamedResponse._validate_required_json_schema(
-                    output_json, output_tool.parameters_json_schema
-                ):
-                    continue
+                # The JSON only grows as it's streamed, so once a tool's required parameters are present they stay
+                # present, and we stick with that tool rather than checking the schemas again for each chunk.
+                if self._validate_required_json_schema(output_json, output_tool.parameters_json_schema):
+                    self._output_tool = output_tool
+                    break
+            else:
+                return None
 
-                # The following part_id will be thrown away
-                return ToolCallPart(tool_name=output_tool.name, args=output_json)
+        # The following part_id will be thrown away
+        return ToolCallPart(tool_name=self._output_tool.name, args=output_json)
 
     @staticmethod
     def _validate_required_json_schema(json_dict: dict[str, Any], json_schema: dict[str, Any]) -> bool:
@@ -1,6 +1,5 @@
 from __future__ import annotations as _annotations
 
-import base64
 import re
 import warnings
 from collections.abc import AsyncIterable, AsyncIterator, Sequence
@@ -15,6 +14,7 @@ from pydantic_ai.providers import Provider, infer_provider
 
 from .. import ModelHTTPError, UnexpectedModelBehavior, _utils, usage
 from .._utils import guard_tool_call_id as _guard_tool_call_id
+from ..downloads import download, prefetch_prompt_files
 from ..messages import (
     AudioUrl,
     BinaryContent,
@@ -36,10 +36,10 @@ from ..messages import (
 from ..settings import ModelSettings
 from ..tools import ToolDefinition
 from . import (
+    MessageMappingCache,
     Model,
     ModelRequestParameters,
     StreamedResponse,
-    cached_async_http_client,
     check_allow_model_requests,
     get_user_agent,
 )
@@ -159,6 +159,7 @@ class OpenAIModel(Model):
 
     _model_name: OpenAIModelName = field(repr=False)
     _system: str = field(default='openai', repr=False)
+    _mapped_messages: MessageMappingCache[list[chat.ChatCompletionMessageParam]] = field(repr=False)
 
     def __init__(
         self,
@@ -182,6 +183,7 @@ class OpenAIModel(Model):
             provider = infer_provider(provider)
         self.client = provider.client
         self.system_prompt_role = system_prompt_role
+        self._mapped_messages = MessageMappingCache()
 
     @property
     def base_url(self) -> str:
@@ -328,34 +330,44 @@ class OpenAIModel(Model):
     async def _map_messages(self, messages: list[ModelMessage]) -> list[chat.ChatCompletionMessageParam]:
         """Just maps a `pydantic_ai.Message` to a `openai.types.ChatCompletionMessageParam`."""
         openai_messages: list[chat.ChatCompletionMessageParam] = []
+        await prefetch_prompt_files(
+            (message for message in messages if self._mapped_messages.get(message) is None),
+            lambda item: isinstance(item, (AudioUrl, DocumentUrl)),
+        )
         for message in messages:
-            if isinstance(message, ModelRequest):
-                async for item in self._map_user_message(message):
-                    openai_messages.append(item)
-            elif isinstance(message, ModelResponse):
-                texts: list[str] = []
-                tool_calls: list[chat.ChatCompletionMessageToolCallParam] = []
-                for item in message.parts:
-                    if isinstance(item, TextPart):
-                        texts.append(item.content)
-                    elif isinstance(item, ToolCallPart):
-                        tool_calls.append(self._map_tool_call(item))
-                    else:
-                        assert_never(item)
-                message_param = chat.ChatCompletionAssistantMessageParam(role='assistant')
-                if texts:
-                    # Note: model responses from this model should only have one text item, so the following
-                    # shouldn't merge multiple texts into one unless you switch models between runs:
-                    message_param['content'] = '\n\n'.join(texts)
-                if tool_calls:
-                    message_param['tool_calls'] = tool_calls
-                openai_messages.append(message_param)
-            else:
-                assert_never(message)
+            mapped = self._mapped_messages.get(message)
+            if mapped is None:
+                mapped = await self._map_message(message)
+                self._mapped_messages.set(message, mapped)
+            openai_messages.extend(mapped)
         if instructions := self._get_instructions(messages):
             openai_messages.insert(0, chat.ChatCompletionSystemMessageParam(content=instructions, role='system'))
         return openai_messages
 
+    async def _map_message(self, message: ModelMessage) -> list[chat.ChatCompletionMessageParam]:
+        if isinstance(message, ModelRequest):
+            return [item async for item in self._map_user_message(message)]
+        elif isinstance(message, ModelResponse):
+            texts: list[str] = []
+            tool_calls: list[chat.ChatCompletionMessageToolCallParam] = []
+            for item in message.parts:
+                if isinstance(item, TextPart):
+                    texts.append(item.content)
+                elif isinstance(item, ToolCallPart):
+                    tool_calls.append(self._map_tool_call(item))
+                else:
+                    assert_never(item)
+            message_param = chat.ChatCompletionAssistantMessageParam(role='assistant')
+            if texts:
+                # Note: model responses from this model should only have one text item, so the following
+                # shouldn't merge multiple texts into one unless you switch models between runs:
+                message_param['content'] = '\n\n'.join(texts)
+            if tool_calls:
+                message_param['tool_calls'] = tool_calls
+            return [message_param]
+        else:
+            assert_never(message)
+
     @staticmethod
     def _map_tool_call(t: ToolCallPart) -> chat.ChatCompletionMessageToolCallParam:
         return chat.ChatCompletionMessageToolCallParam(
@@ -421,7 +433,7 @@ class OpenAIModel(Model):
                     image_url = ImageURL(url=item.url)
                     content.append(ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
+                    base64_encoded = item.base64
                     if item.is_image:
                         image_url = ImageURL(url=f'data:{item.media_type};base64,{base64_encoded}')
                         content.append(ChatCompletionContentPartImageParam(image_url=image_url, type='image_url'))
@@ -442,20 +454,13 @@ class OpenAIModel(Model):
                     else:  # pragma: no cover
                         raise RuntimeError(f'Unsupported binary content type: {item.media_type}')
                 elif isinstance(item, AudioUrl):
-                    client = cached_async_http_client()
-                    response = await client.get(item.url)
-                    response.raise_for_status()
-                    base64_encoded = base64.b64encode(response.content).decode('utf-8')
-                    audio_format: Any = response.headers['content-type'].removeprefix('audio/')
-                    audio = InputAudio(data=base64_encoded, format=audio_format)
+                    downloaded = await download(item.url)
+                    audio_format: Any = downloaded.media_type.removeprefix('audio/')
+                    audio = InputAudio(data=downloaded.base64, format=audio_format)
                     content.append(ChatCompletionContentPartInputAudioParam(input_audio=audio, type='input_audio'))
                 elif isinstance(item, DocumentUrl):
-                    client = cached_async_http_client()
-                    response = await client.get(item.url)
-                    response.raise_for_status()
-                    base64_encoded = base64.b64encode(response.content).decode('utf-8')
-                    media_type = response.headers.get('content-type').split(';')[0]
-                    file_data = f'data:{media_type};base64,{base64_encoded}'
+                    downloaded = await download(item.url)
+                    file_data = f'data:{downloaded.media_type};base64,{downloaded.base64}'
                     file = File(file=FileFile(file_data=file_data, filename=f'filename.{item.format}'), type='file')
                     content.append(file)
                 elif isinstance(item, VideoUrl):  # pragma: no cover
@@ -489,6 +494,7 @@ class OpenAIResponsesModel(Model):
 
     _model_name: OpenAIModelName = field(repr=False)
     _system: str = field(default='openai', repr=False)
+    _mapped_messages: MessageMappingCache[list[responses.ResponseInputItemParam]] = field(repr=False)
 
     def __init__(
         self,
@@ -506,6 +512,7 @@ class OpenAIResponsesModel(Model):
         if isinstance(provider, str):
             provider = infer_provider(provider)
         self.client = provider.client
+        self._mapped_messages = MessageMappingCache()
 
     @property
     def model_name(self) -> OpenAIModelName:
@@ -667,49 +674,62 @@ class OpenAIResponsesModel(Model):
     ) -> tuple[str | NotGiven, list[responses.ResponseInputItemParam]]:
         """Just maps a `pydantic_ai.Message` to a `openai.types.responses.ResponseInputParam`."""
         openai_messages: list[responses.ResponseInputItemParam] = []
+        await prefetch_prompt_files(
+            (message for message in messages if self._mapped_messages.get(message) is None),
+            lambda item: isinstance(item, (AudioUrl, DocumentUrl)),
+        )
         for message in messages:
-            if isinstance(message, ModelRequest):
-                for part in message.parts:
-                    if isinstance(part, SystemPromptPart):
-                        openai_messages.append(responses.EasyInputMessageParam(role='system', content=part.content))
-                    elif isinstance(part, UserPromptPart):
-                        openai_messages.append(await self._map_user_prompt(part))
-                    elif isinstance(part, ToolReturnPart):
+            mapped = self._mapped_messages.get(message)
+            if mapped is None:
+                mapped = await self._map_message(message)
+                self._mapped_messages.set(message, mapped)
+            openai_messages.extend(mapped)
+        instructions = self._get_instructions(messages) or NOT_GIVEN
+        return instructions, openai_messages
+
+    async def _map_message(self, message: ModelMessage) -> list[responses.ResponseInputItemParam]:
+        openai_messages: list[responses.ResponseInputItemParam] = []
+        if isinstance(message, ModelRequest):
+            for part in message.parts:
+                if isinstance(part, SystemPromptPart):
+                    openai_messages.append(responses.EasyInputMessageParam(role='system', content=part.content))
+                elif isinstance(part, UserPromptPart):
+                    openai_messages.append(await self._map_user_prompt(part))
+                elif isinstance(part, ToolReturnPart):
+                    openai_messages.append(
+                        FunctionCallOutput(
+                            type='function_call_output',
+                            call_id=_guard_tool_call_id(t=part),
+                            output=part.model_response_str(),
+                        )
+                    )
+                elif isinstance(part, RetryPromptPart):
+                    # TODO(Marcelo): How do we test this conditional branch?
+                    if part.tool_name is None:  # pragma: no cover
+                        openai_messages.append(
+                            Message(role='user', content=[{'type': 'input_text', 'text': part.model_response()}])
+                        )
+                    else:
                         openai_messages.append(
                             FunctionCallOutput(
                                 type='function_call_output',
                                 call_id=_guard_tool_call_id(t=part),
-                                output=part.model_response_str(),
+                                output=part.model_response(),
                             )
                         )
-                    elif isinstance(part, RetryPromptPart):
-                        # TODO(Marcelo): How do we test this conditional branch?
-                        if part.tool_name is None:  # pragma: no cover
-                            openai_messages.append(
-                                Message(role='user', content=[{'type': 'input_text', 'text': part.model_response()}])
-                            )
-                        else:
-                            openai_messages.append(
-                                FunctionCallOutput(
-                                    type='function_call_output',
-                                    call_id=_guard_tool_call_id(t=part),
-                                    output=part.model_response(),
-                                )
-                            )
-                    else:
-                        assert_never(part)
-            elif isinstance(message, ModelResponse):
-                for item in message.parts:
-                    if isinstance(item, TextPart):
-                        openai_messages.append(responses.EasyInputMessageParam(role='assistant', content=item.content))
-                    elif isinstance(item, ToolCallPart):
-                        openai_messages.append(self._map_tool_call(item))
-                    else:
-                        assert_never(item)
-            else:
-                assert_never(message)
-        instructions = self._get_instructions(messages) or NOT_GIVEN
-        return instructions, openai_messages
+                else:
+                    assert_never(part)
+        elif isinstance(message, ModelResponse):
+            for item in message.parts:
+                if isinstance(item, TextPart):
+                    openai_messages.append(responses.EasyInputMessageParam(role='assistant', content=item.content))
+                elif isinstance(item, ToolCallPart):
+                    openai_messages.append(self._map_tool_call(item))
+                else:
+                    assert_never(item)
+        else:
+            assert_never(message)
+        return openai_messages
 
     @staticmethod
     def _map_tool_call(t: ToolCallPart) -> responses.ResponseFunctionToolCallParam:
@@ -731,7 +751,7 @@ class OpenAIResponsesModel(Model):
                 if isinstance(item, str):
                     content.append(responses.ResponseInputTextParam(text=item, type='input_text'))
                 elif isinstance(item, BinaryContent):
-                    base64_encoded = base64.b64encode(item.data).decode('utf-8')
+                    base64_encoded = item.base64
                     if item.is_image:
                         content.append(
                             responses.ResponseInputImageParam(
@@ -760,26 +780,19 @@ class OpenAIResponsesModel(Model):
                         responses.ResponseInputImageParam(image_url=item.url, type='input_image', detail='auto')
                     )
                 elif isinstance(item, AudioUrl):  # pragma: no cover
-                    client = cached_async_http_client()
-                    response = await client.get(item.url)
-                    response.raise_for_status()
-                    base64_encoded = base64.b64encode(response.content).decode('utf-8')
+                    downloaded = await download(item.url)
                     content.append(
                         responses.ResponseInputFileParam(
                             type='input_file',
-                            file_data=f'data:{item.media_type};base64,{base64_encoded}',
+                            file_data=f'data:{item.media_type};base64,{downloaded.base64}',
                         )
                     )
                 elif isinstance(item, DocumentUrl):  # pragma: no cover
-                    client = cached_async_http_client()
-                    response = await client.get(item.url)
-                    response.raise_for_status()
-                    base64_encoded = base64.b64encode(response.content).decode('utf-8')
-                    media_type = response.headers.get('content-type').split(';')[0]
+                    downloaded = await download(item.url)
                     content.append(
                         responses.ResponseInputFileParam(
                             type='input_file',
-                            file_data=f'data:{media_type};base64,{base64_encoded}',
+                            file_data=f'data:{downloaded.media_type};base64,{downloaded.base64}',
                             filename=f'filename.{item.format}',
                         )
                     )
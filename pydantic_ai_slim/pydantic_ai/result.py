@@ -152,7 +152,12 @@ class AgentStream(Generic[AgentDepsT, OutputDataT]):
                 )
 
             call, output_tool = match
-            result_data = output_tool.validate(call, allow_partial=allow_partial, wrap_validation_errors=False)
+            result_data = output_tool.validate(
+                call,
+                allow_partial=allow_partial,
+                wrap_validation_errors=False,
+                partial_args=self._raw_stream_response.get_partial_tool_call_args(call) if allow_partial else None,
+            )
 
             for validator in self._output_validators:
                 result_data = await validator.validate(result_data, call, self._run_ctx)
@@ -466,7 +471,12 @@ class StreamedRunResult(Generic[AgentDepsT, OutputDataT]):
                 )
 
             call, output_tool = match
-            result_data = output_tool.validate(call, allow_partial=allow_partial, wrap_validation_errors=False)
+            result_data = output_tool.validate(
+                call,
+                allow_partial=allow_partial,
+                wrap_validation_errors=False,
+                partial_args=self._stream_response.get_partial_tool_call_args(call) if allow_partial else None,
+            )
 
             for validator in self._output_validators:
                 result_data = await validator.validate(result_data, call, self._run_ctx)
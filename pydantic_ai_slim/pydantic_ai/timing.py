@@ -0,0 +1,81 @@
+from __future__ import annotations as _annotations
+
+from dataclasses import dataclass, field
+
+__all__ = 'StepTiming', 'RunTiming'
+
+
+@dataclass
+class StepTiming:
+    """Time spent in one step of an agent run, i.e. a request to the model and the handling of its response.
+
+    All times are in seconds.
+    """
+
+    run_step: int
+    """The step of the run, matching [`RunContext.run_step`][pydantic_ai.tools.RunContext.run_step]."""
+    prepare: float = 0.0
+    """Time spent preparing the request, including preparing the tool definitions and running history processors."""
+    model_request: float = 0.0
+    """Time from making the request until the response was complete.
+
+    This includes mapping the messages to the model's format, and for streamed responses, consuming the stream.
+    """
+    time_to_first_token: float | None = None
+    """Time from making the request until the response started streaming, `None` for responses which weren't streamed."""
+    tools: dict[str, float] = field(default_factory=dict)
+    """Time spent running function tools, by tool name, adding up all the calls to each tool.
+
+    Tool calls run concurrently, so the total can be more than the time the step took.
+    """
+    output_validation: float = 0.0
+    """Time spent validating output, including running output validators."""
+    retries: int = 0
+    """Number of retry prompts sent back to the model for the response, e.g. for invalid output or tools raising
+    [`ModelRetry`][pydantic_ai.exceptions.ModelRetry]."""
+
+
+@dataclass
+class RunTiming:
+    """Time spent in an agent run, by step and by phase.
+
+    Timings are measured with [`time.perf_counter`][time.perf_counter] independently of OpenTelemetry, so they're
+    available whether or not the agent is instrumented. All times are in seconds.
+    """
+
+    steps: list[StepTiming] = field(default_factory=list)
+    """Timings of each step of the run."""
+    prompt_preparation: float = 0.0
+    """Time spent building the first request of the run, e.g. running system prompt functions."""
+    total: float | None = None
+    """Time taken by the whole run, `None` until the run has finished."""
+
+    @property
+    def model_request(self) -> float:
+        """Time spent in requests to the model, in all steps."""
+        return sum(step.model_request for step in self.steps)
+
+    @property
+    def tools(self) -> dict[str, float]:
+        """Time spent running function tools, by tool name, in all steps."""
+        tools: dict[str, float] = {}
+        for step in self.steps:
+            for name, duration in step.tools.items():
+                tools[name] = tools.get(name, 0.0) + duration
+        return tools
+
+    @property
+    def output_validation(self) -> float:
+        """Time spent validating output, in all steps."""
+        return sum(step.output_validation for step in self.steps)
+
+    @property
+    def retries(self) -> int:
+        """Number of retry prompts sent back to the model, in all steps."""
+        return sum(step.retries for step in self.steps)
+
+    def step(self, run_step: int) -> StepTiming:
+        """Get the timing of a step, adding it if it's not there yet."""
+        if not self.steps or self.steps[-1].run_step != run_step:
+            self.steps.append(StepTiming(run_step))
+        return self.steps[-1]
@@ -3,18 +3,22 @@ from __future__ import annotations as _annotations
 import dataclasses
 import inspect
 import json
+import pickle
 from collections.abc import Awaitable, Sequence
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Any, Callable, Generic, Literal, Union, cast
 
+import anyio
 from opentelemetry.trace import Tracer
 from pydantic import ValidationError
 from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
-from pydantic_core import SchemaValidator, core_schema
-from typing_extensions import Concatenate, ParamSpec, TypeAlias, TypeVar
+from pydantic_core import PydanticSerializationError, SchemaValidator, core_schema, to_jsonable_python
+from typing_extensions import Concatenate, ParamSpec, TypeAlias, TypeVar, deprecated
 
 from . import _pydantic, _utils, messages as _messages, models
-from .exceptions import ModelRetry, UnexpectedModelBehavior
+from .cache import CacheBackend
+from .exceptions import ModelRetry, UnexpectedModelBehavior, UserError
 
 if TYPE_CHECKING:
     from .result import Usage
@@ -29,6 +33,7 @@ __all__ = (
     'ToolFuncEither',
     'ToolParams',
     'ToolPrepareFunc',
+    'ToolExecutor',
     'Tool',
     'ObjectJsonSchema',
     'ToolDefinition',
@@ -58,6 +63,8 @@ class RunContext(Generic[AgentDepsT]):
     """Name of the tool being called."""
     retry: int = 0
     """Number of retries so far."""
+    retries: dict[str, int] = field(default_factory=dict)
+    """Number of retries for each tool so far in the current run."""
     run_step: int = 0
     """The current step in the run."""
 
@@ -142,8 +149,29 @@ DocstringFormat = Literal['google', 'numpy', 'sphinx', 'auto']
 * `'auto'` — Automatically infer the format based on the structure of the docstring.
 """
 
+ToolExecutor = Literal['thread', 'process']
+"""Where sync tool functions are run.
+
+* `'thread'` — in a worker thread, the default.
+* `'process'` — in the agent's process pool, for CPU-bound functions which would otherwise hold the GIL.
+  The function and its arguments must be picklable, and the function can't take a
+  [`RunContext`][pydantic_ai.tools.RunContext].
+"""
+
 A = TypeVar('A')
 
+# add the JSON schema so the attributes of tool spans are formatted nicely in Logfire
+_TOOL_SPAN_JSON_SCHEMA = json.dumps(
+    {
+        'type': 'object',
+        'properties': {
+            'tool_arguments': {'type': 'object'},
+            'gen_ai.tool.name': {},
+            'gen_ai.tool.call.id': {},
+        },
+    }
+)
+
 
 class GenerateToolJsonSchema(GenerateJsonSchema):
     def typed_dict_schema(self, schema: core_schema.TypedDictSchema) -> JsonSchemaValue:
@@ -174,6 +202,12 @@ class Tool(Generic[AgentDepsT]):
     docstring_format: DocstringFormat
     require_parameter_descriptions: bool
     strict: bool | None
+    max_concurrency: int | None
+    executor: ToolExecutor
+    cache: CacheBackend | Literal[False] | None
+    cache_key_prefix: str
+    concurrency_limiter: anyio.CapacityLimiter | None = field(init=False, repr=False, compare=False)
+    """Limiter shared by all calls of this tool, set when `max_concurrency` is not `None`."""
     _is_async: bool = field(init=False)
     _single_arg_name: str | None = field(init=False)
     _positional_fields: list[str] = field(init=False)
@@ -186,10 +220,6 @@ class Tool(Generic[AgentDepsT]):
     This schema may be modified by the `prepare` function or by the Model class prior to including it in an API request.
     """
 
-    # TODO: Move this state off the Tool class, which is otherwise stateless.
-    #   This should be tracked inside a specific agent run, not the tool.
-    current_retry: int = field(default=0, init=False)
-
     def __init__(
         self,
         function: ToolFuncEither[AgentDepsT],
@@ -203,6 +233,10 @@ class Tool(Generic[AgentDepsT]):
         require_parameter_descriptions: bool = False,
         schema_generator: type[GenerateJsonSchema] = GenerateToolJsonSchema,
         strict: bool | None = None,
+        max_concurrency: int | None = None,
+        executor: ToolExecutor = 'thread',
+        cache: CacheBackend | Literal[False] | None = None,
+        cache_key_prefix: str | None = None,
     ):
         """Create a new tool instance.
 
@@ -255,9 +289,19 @@ class Tool(Generic[AgentDepsT]):
             schema_generator: The JSON schema generator class to use. Defaults to `GenerateToolJsonSchema`.
             strict: Whether to enforce JSON schema compliance (only affects OpenAI).
                 See [`ToolDefinition`][pydantic_ai.tools.ToolDefinition] for more info.
+            max_concurrency: The maximum number of concurrent calls of this tool, shared by all runs using this
+                instance, `None` means unlimited.
+            executor: Where to run the function if it's not async, see [`ToolExecutor`][pydantic_ai.tools.ToolExecutor].
+            cache: Where to cache the tool's results, keyed by `cache_key_prefix`, its name and arguments. If `None`,
+                the agent's `tool_cache` is used unless the tool takes a [`RunContext`][pydantic_ai.tools.RunContext].
+                If `False`, results are never cached.
+            cache_key_prefix: Prefix of the tool's cache keys, defaults to the function's module and qualified name.
+                Set it to keep apart the results of tools created from the same function, e.g. by a factory.
         """
         if takes_ctx is None:
             takes_ctx = _pydantic.takes_ctx(function)
+        if executor == 'process':
+            _check_process_executor(function, takes_ctx)
 
         f = _pydantic.function_schema(
             function, takes_ctx, docstring_format, require_parameter_descriptions, schema_generator
@@ -271,6 +315,13 @@ class Tool(Generic[AgentDepsT]):
         self.docstring_format = docstring_format
         self.require_parameter_descriptions = require_parameter_descriptions
         self.strict = strict
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+        self.cache = cache
+        if cache_key_prefix is None:
+            cache_key_prefix = f'{function.__module__}.{getattr(function, "__qualname__", self.name)}'
+        self.cache_key_prefix = cache_key_prefix
+        self.concurrency_limiter = anyio.CapacityLimiter(max_concurrency) if max_concurrency is not None else None
         self._is_async = inspect.iscoroutinefunction(self.function)
         self._single_arg_name = f['single_arg_name']
         self._positional_fields = f['positional_fields']
@@ -278,6 +329,17 @@ class Tool(Generic[AgentDepsT]):
         self._validator = f['validator']
         self._base_parameters_json_schema = f['json_schema']
 
+    @property
+    @deprecated('`current_retry` is deprecated, retries are counted per run, use `RunContext.retry` instead.')
+    def current_retry(self) -> int:
+        """Always `0`, as a tool is shared by all runs of an agent, which count their own retries."""
+        return 0
+
+    @current_retry.setter
+    @deprecated('`current_retry` is deprecated, retries are counted per run, use `RunContext.retry` instead.')
+    def current_retry(self, value: int) -> None:
+        pass
+
     async def prepare_tool_def(self, ctx: RunContext[AgentDepsT]) -> ToolDefinition | None:
         """Get the tool definition.
 
@@ -299,37 +361,43 @@ class Tool(Generic[AgentDepsT]):
             return tool_def
 
     async def run(
-        self, message: _messages.ToolCallPart, run_context: RunContext[AgentDepsT], tracer: Tracer
+        self,
+        message: _messages.ToolCallPart,
+        run_context: RunContext[AgentDepsT],
+        tracer: Tracer,
+        process_pool: Executor | None = None,
+        default_cache: CacheBackend | None = None,
     ) -> _messages.ToolReturnPart | _messages.RetryPromptPart:
         """Run the tool function asynchronously.
 
         This method wraps `_run` in an OpenTelemetry span.
 
+        If the tool's `executor` is `'process'`, sync functions are run in `process_pool`,
+        falling back to a worker thread if no pool is given.
+
+        Results are cached in the tool's `cache` if set, otherwise in `default_cache` unless the tool
+        takes a [`RunContext`][pydantic_ai.tools.RunContext].
+
         See <https://opentelemetry.io/docs/specs/semconv/gen-ai/gen-ai-spans/#execute-tool-span>.
         """
         span_attributes = {
             'gen_ai.tool.name': self.name,
             # NOTE: this means `gen_ai.tool.call.id` will be included even if it was generated by pydantic-ai
             'gen_ai.tool.call.id': message.tool_call_id,
-            'tool_arguments': message.args_as_json_str(),
             'logfire.msg': f'running tool: {self.name}',
-            # add the JSON schema so these attributes are formatted nicely in Logfire
-            'logfire.json_schema': json.dumps(
-                {
-                    'type': 'object',
-                    'properties': {
-                        'tool_arguments': {'type': 'object'},
-                        'gen_ai.tool.name': {},
-                        'gen_ai.tool.call.id': {},
-                    },
-                }
-            ),
+            'logfire.json_schema': _TOOL_SPAN_JSON_SCHEMA,
         }
-        with tracer.start_as_current_span('running tool', attributes=span_attributes):
-            return await self._run(message, run_context)
+        with tracer.start_as_current_span('running tool', attributes=span_attributes) as span:
+            if span.is_recording():
+                span.set_attribute('tool_arguments', message.args_as_json_str())
+            return await self._run(message, run_context, process_pool, default_cache)
 
     async def _run(
-        self, message: _messages.ToolCallPart, run_context: RunContext[AgentDepsT]
+        self,
+        message: _messages.ToolCallPart,
+        run_context: RunContext[AgentDepsT],
+        process_pool: Executor | None = None,
+        default_cache: CacheBackend | None = None,
     ) -> _messages.ToolReturnPart | _messages.RetryPromptPart:
         try:
             if isinstance(message.args, str):
@@ -337,7 +405,22 @@ class Tool(Generic[AgentDepsT]):
             else:
                 args_dict = self._validator.validate_python(message.args)
         except ValidationError as e:
-            return self._on_error(e, message)
+            return self._on_error(e, message, run_context)
+
+        cache = self._get_cache(default_cache)
+        cache_key = self._cache_key(args_dict) if cache is not None else None
+        if cache is not None and cache_key is not None:
+            try:
+                response_content = await cache.aget(cache_key)
+            except KeyError:
+                pass
+            else:
+                run_context.retries.pop(self.name, None)
+                return _messages.ToolReturnPart(
+                    tool_name=message.tool_name,
+                    content=response_content,
+                    tool_call_id=message.tool_call_id,
+                )
 
         args, kwargs = self._call_args(args_dict, message, run_context)
         try:
@@ -346,17 +429,41 @@ class Tool(Generic[AgentDepsT]):
                 response_content = await function(*args, **kwargs)
             else:
                 function = cast(Callable[[Any], str], self.function)
-                response_content = await _utils.run_in_executor(function, *args, **kwargs)
+                if self.executor == 'process' and process_pool is not None:
+                    response_content = await _utils.run_in_process(process_pool, function, *args, **kwargs)
+                else:
+                    response_content = await _utils.run_in_executor(function, *args, **kwargs)
         except ModelRetry as e:
-            return self._on_error(e, message)
+            return self._on_error(e, message, run_context)
 
-        self.current_retry = 0
+        if cache is not None and cache_key is not None:
+            await cache.aset(cache_key, response_content)
+        run_context.retries.pop(self.name, None)
         return _messages.ToolReturnPart(
             tool_name=message.tool_name,
             content=response_content,
             tool_call_id=message.tool_call_id,
         )
 
+    def _get_cache(self, default_cache: CacheBackend | None) -> CacheBackend | None:
+        if self.cache is False:
+            return None
+        elif self.cache is not None:
+            return self.cache
+        elif self.takes_ctx:
+            # the result of tools taking `RunContext` may depend on it, so they're only cached when asked explicitly
+            return None
+        else:
+            return default_cache
+
+    def _cache_key(self, args_dict: dict[str, Any]) -> str | None:
+        """Build a cache key from the prefix, tool name and validated arguments, `None` if they can't be serialized."""
+        try:
+            args_json = json.dumps(to_jsonable_python(args_dict), sort_keys=True, separators=(',', ':'))
+        except (PydanticSerializationError, TypeError, ValueError):
+            return None
+        return f'{self.cache_key_prefix}:{self.name}:{args_json}'
+
     def _call_args(
         self,
         args_dict: dict[str, Any],
@@ -368,7 +475,7 @@ class Tool(Generic[AgentDepsT]):
 
         ctx = dataclasses.replace(
             run_context,
-            retry=self.current_retry,
+            retry=run_context.retries.get(self.name, 0),
             tool_name=message.tool_name,
             tool_call_id=message.tool_call_id,
         )
@@ -381,10 +488,13 @@ class Tool(Generic[AgentDepsT]):
         return args, args_dict
 
     def _on_error(
-        self, exc: ValidationError | ModelRetry, call_message: _messages.ToolCallPart
+        self,
+        exc: ValidationError | ModelRetry,
+        call_message: _messages.ToolCallPart,
+        run_context: RunContext[AgentDepsT],
     ) -> _messages.RetryPromptPart:
-        self.current_retry += 1
-        if self.max_retries is None or self.current_retry > self.max_retries:
+        current_retry = run_context.retries[self.name] = run_context.retries.get(self.name, 0) + 1
+        if self.max_retries is None or current_retry > self.max_retries:
             raise UnexpectedModelBehavior(f'Tool exceeded max retries count of {self.max_retries}') from exc
         else:
             if isinstance(exc, ValidationError):
@@ -398,6 +508,19 @@ class Tool(Generic[AgentDepsT]):
             )
 
 
+def _check_process_executor(function: Callable[..., Any], takes_ctx: bool) -> None:
+    """Check a tool function can be sent to a worker process."""
+    name = getattr(function, '__qualname__', repr(function))
+    if takes_ctx:
+        raise UserError(f"Tool {name!r} takes a `RunContext` so it can't be run with `executor='process'`")
+    if inspect.iscoroutinefunction(function):
+        raise UserError(f"Tool {name!r} is async so it can't be run with `executor='process'`")
+    try:
+        pickle.dumps(function)
+    except Exception as e:
+        raise UserError(f"Tool {name!r} can't be pickled so it can't be run with `executor='process'`: {e}") from e
+
+
 ObjectJsonSchema: TypeAlias = dict[str, Any]
 """Type representing JSON schema of an object, e.g. where `"type": "object"`.
 
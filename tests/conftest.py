@@ -21,6 +21,7 @@ from typing_extensions import TypeAlias
 from vcr import VCR
 
 import pydantic_ai.models
+from pydantic_ai.downloads import set_download_cache
 from pydantic_ai.messages import BinaryContent
 from pydantic_ai.models import Model, cached_async_http_client
 
@@ -216,6 +217,12 @@ async def close_cached_httpx_client() -> AsyncIterator[None]:
         await cached_async_http_client(provider=provider).aclose()
 
 
+@pytest.fixture(autouse=True)
+def reset_download_cache() -> Iterator[None]:
+    yield
+    set_download_cache(None)
+
+
 @pytest.fixture(scope='session')
 def assets_path() -> Path:
     return Path(__file__).parent / 'assets'
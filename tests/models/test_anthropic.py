@@ -214,6 +214,73 @@ async def test_async_request_prompt_caching(allow_model_requests: None):
     )
 
 
+async def test_prompt_caching_breakpoints(allow_model_requests: None):
+    responses = [
+        completion_message(
+            [ToolUseBlock(id='1', input={'x': 1}, name='my_tool', type='tool_use')],
+            usage=AnthropicUsage(input_tokens=2, output_tokens=1),
+        ),
+        completion_message(
+            [TextBlock(text='done', type='text')], usage=AnthropicUsage(input_tokens=3, output_tokens=1)
+        ),
+    ]
+    mock_client = MockAnthropic.create_mock(responses)
+    m = AnthropicModel('claude-3-5-haiku-latest', provider=AnthropicProvider(anthropic_client=mock_client))
+    settings = AnthropicModelSettings(
+        anthropic_cache_system_prompt=True, anthropic_cache_tool_definitions=True, anthropic_cache_messages=True
+    )
+    agent = Agent(m, system_prompt='You are helpful.', model_settings=settings)
+
+    @agent.tool_plain
+    def other_tool() -> str:
+        return 'other'  # pragma: no cover
+
+    @agent.tool_plain
+    def my_tool(x: int) -> str:
+        return f'{x}'
+
+    result = await agent.run('hello')
+    assert result.output == 'done'
+
+    first, second = get_mock_chat_completion_kwargs(mock_client)
+    assert first['system'] == [{'type': 'text', 'text': 'You are helpful.', 'cache_control': {'type': 'ephemeral'}}]
+    assert [tool.get('cache_control') for tool in first['tools']] == [None, {'type': 'ephemeral'}]
+    assert first['messages'] == [
+        {'role': 'user', 'content': [{'text': 'hello', 'type': 'text', 'cache_control': {'type': 'ephemeral'}}]}
+    ]
+    # the breakpoint moves to the end of the conversation, without changing the earlier messages
+    assert second['messages'] == [
+        {'role': 'user', 'content': [{'text': 'hello', 'type': 'text'}]},
+        {'role': 'assistant', 'content': [{'id': '1', 'type': 'tool_use', 'name': 'my_tool', 'input': {'x': 1}}]},
+        {
+            'role': 'user',
+            'content': [
+                {
+                    'tool_use_id': '1',
+                    'type': 'tool_result',
+                    'content': '1',
+                    'is_error': False,
+                    'cache_control': {'type': 'ephemeral'},
+                }
+            ],
+        },
+    ]
+
+
+async def test_prompt_caching_disabled(allow_model_requests: None):
+    c = completion_message(
+        [TextBlock(text='world', type='text')], usage=AnthropicUsage(input_tokens=3, output_tokens=5)
+    )
+    mock_client = MockAnthropic.create_mock(c)
+    m = AnthropicModel('claude-3-5-haiku-latest', provider=AnthropicProvider(anthropic_client=mock_client))
+    agent = Agent(m, system_prompt='You are helpful.')
+
+    await agent.run('hello')
+    kwargs = get_mock_chat_completion_kwargs(mock_client)[0]
+    assert kwargs['system'] == 'You are helpful.'
+    assert kwargs['messages'] == [{'role': 'user', 'content': [{'text': 'hello', 'type': 'text'}]}]
+
+
 async def test_async_request_text_response(allow_model_requests: None):
     c = completion_message(
         [TextBlock(text='world', type='text')],
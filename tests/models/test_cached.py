@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent
+from pydantic_ai.cache import MemoryCache, SQLiteCache
+from pydantic_ai.messages import (
+    FinalResultEvent,
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    PartStartEvent,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.cached import CachedModel
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.settings import ModelSettings
+from pydantic_ai.usage import Usage
+
+pytestmark = pytest.mark.anyio
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.calls += 1
+        if len(messages) == 1 and info.function_tools:
+            return ModelResponse(parts=[ToolCallPart('get_capital', {'country': 'France'}, tool_call_id='1')])
+        return ModelResponse(parts=[TextPart(f'response {self.calls}')])
+
+    async def stream(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        self.calls += 1
+        yield 'streamed '
+        yield f'response {self.calls}'
+
+
+def test_request_cached():
+    counter = CountingModel()
+    model = CachedModel(FunctionModel(counter.respond))
+    agent = Agent(model)
+
+    result1 = agent.run_sync('Hello')
+    assert result1.output == 'response 1'
+    assert result1.usage() == snapshot(
+        Usage(requests=1, request_tokens=51, response_tokens=2, total_tokens=53, details=None)
+    )
+
+    result2 = agent.run_sync('Hello')
+    assert result2.output == 'response 1'
+    assert result2.usage() == snapshot(Usage(requests=1, details={'cached_responses': 1, 'cached_tokens': 53}))
+    assert counter.calls == 1
+    assert model.cache.stats.hits == 1
+    assert model.cache.stats.misses == 1
+
+    assert agent.run_sync('Goodbye').output == 'response 2'
+    assert counter.calls == 2
+
+
+def test_request_with_tools_cached():
+    counter = CountingModel()
+    model = CachedModel(FunctionModel(counter.respond))
+    agent = Agent(model)
+
+    @agent.tool_plain
+    def get_capital(country: str) -> str:
+        return 'Paris'
+
+    assert agent.run_sync('What is the capital of France?').output == 'response 2'
+    assert agent.run_sync('What is the capital of France?').output == 'response 2'
+    assert counter.calls == 2
+    assert model.cache.stats.hits == 2
+
+
+def test_cache_key():
+    model = CachedModel(FunctionModel(CountingModel().respond))
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello')])]
+    key = model.cache_key(messages, None, params)
+
+    # timestamps are ignored
+    later_messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello')])]
+    assert later_messages != messages
+    assert model.cache_key(later_messages, None, params) == key
+
+    assert model.cache_key([ModelRequest(parts=[UserPromptPart('Goodbye')])], None, params) != key
+    assert model.cache_key(messages, ModelSettings(temperature=0.5), params) != key
+    assert model.cache_key(messages, None, replace(params, allow_text_output=False)) != key
+    other_model = CachedModel(FunctionModel(CountingModel().respond, model_name='other'))
+    assert other_model.cache_key(messages, None, params) != key
+
+
+def test_cache_key_timestamps_in_tool_calls():
+    model = CachedModel(FunctionModel(CountingModel().respond))
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+
+    def messages(timestamp: str) -> list[ModelMessage]:
+        return [
+            ModelRequest(parts=[UserPromptPart('When?')]),
+            ModelResponse(parts=[ToolCallPart('schedule', {'timestamp': timestamp}, tool_call_id='1')]),
+            ModelRequest(parts=[ToolReturnPart('schedule', {'timestamp': timestamp}, tool_call_id='1')]),
+        ]
+
+    # only the timestamps of the messages and parts are ignored, not those in tool arguments and results
+    assert model.cache_key(messages('2025-01-01'), None, params) != model.cache_key(
+        messages('2025-01-02'), None, params
+    )
+    assert model.cache_key(messages('2025-01-01'), None, params) == model.cache_key(
+        messages('2025-01-01'), None, params
+    )
+
+
+def test_separate_models_share_cache():
+    cache = MemoryCache()
+    counter = CountingModel()
+    agent = Agent(CachedModel(FunctionModel(counter.respond), cache))
+    other_agent = Agent(CachedModel(FunctionModel(counter.respond, model_name='other'), cache))
+
+    agent.run_sync('Hello')
+    agent.run_sync('Hello')
+    other_agent.run_sync('Hello')
+    assert counter.calls == 2
+    assert len(cache) == 2
+
+
+def test_sqlite_cache(tmp_path: Path):
+    counter = CountingModel()
+    path = tmp_path / 'responses.db'
+
+    cache = SQLiteCache(path)
+    assert Agent(CachedModel(FunctionModel(counter.respond), cache)).run_sync('Hello').output == 'response 1'
+    cache.close()
+
+    cache = SQLiteCache(path)
+    assert Agent(CachedModel(FunctionModel(counter.respond), cache)).run_sync('Hello').output == 'response 1'
+    assert counter.calls == 1
+    cache.close()
+
+
+def test_ttl():
+    counter = CountingModel()
+    agent = Agent(CachedModel(FunctionModel(counter.respond), MemoryCache(ttl=0)))
+
+    assert agent.run_sync('Hello').output == 'response 1'
+    assert agent.run_sync('Hello').output == 'response 2'
+
+
+async def test_stream_cached():
+    counter = CountingModel()
+    model = CachedModel(FunctionModel(stream_function=counter.stream))
+    agent = Agent(model)
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == ['streamed ', 'streamed response 1']
+    assert result.usage() == snapshot(
+        Usage(requests=1, request_tokens=50, response_tokens=3, total_tokens=53, details=None)
+    )
+
+    async with agent.run_stream('Hello') as result:
+        assert [c async for c in result.stream_text(debounce_by=None)] == ['streamed response 1']
+    assert result.usage() == snapshot(Usage(requests=1, details={'cached_responses': 1, 'cached_tokens': 53}))
+    assert counter.calls == 1
+
+    # non-streamed requests share the cached response
+    assert (await agent.run('Hello')).output == 'streamed response 1'
+    assert counter.calls == 1
+
+
+async def test_stream_replay_events():
+    model = CachedModel(FunctionModel(CountingModel().respond))
+    agent = Agent(model)
+
+    @agent.tool_plain
+    def get_capital(country: str) -> str:
+        return 'Paris'
+
+    await agent.run('Hello')
+
+    events: list[object] = []
+    async with agent.iter('Hello') as run:
+        async for node in run:
+            if Agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as stream:
+                    events.extend([event async for event in stream])
+    assert events == snapshot(
+        [
+            PartStartEvent(
+                index=0,
+                part=ToolCallPart(tool_name='get_capital', args={'country': 'France'}, tool_call_id='1'),
+            ),
+            PartStartEvent(index=0, part=TextPart(content='response 2')),
+            FinalResultEvent(tool_name=None, tool_call_id=None),
+        ]
+    )
+
+
+async def test_incomplete_stream_not_cached():
+    counter = CountingModel()
+    cache = MemoryCache()
+    model = CachedModel(FunctionModel(stream_function=counter.stream), cache)
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello')])]
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+
+    async with model.request_stream(messages, None, params) as stream:
+        async for event in stream:
+            assert event == PartStartEvent(index=0, part=TextPart(content='streamed '))
+            break
+    assert len(cache) == 0
+
+    async with model.request_stream(messages, None, params) as stream:
+        assert len([event async for event in stream]) == 2
+    assert len(cache) == 1
+    assert stream.get().parts == [TextPart(content='streamed response 2')]
+
+    async with model.request_stream(messages, None, params) as stream:
+        assert len([event async for event in stream]) == 1
+    assert stream.get().parts == [TextPart(content='streamed response 2')]
+    assert counter.calls == 2
+
+
+async def test_stream_signals_completed_tool_calls():
+    async def stream_tool_calls(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        yield {0: DeltaToolCall(name='a', json_args='{"x": ', tool_call_id='1')}
+        yield {0: DeltaToolCall(json_args='1}')}
+        yield {1: DeltaToolCall(name='b', json_args='{"y": 2}', tool_call_id='2')}
+        yield {2: DeltaToolCall(name='c', json_args='{"z": 3}', tool_call_id='3')}
+
+    model = CachedModel(FunctionModel(stream_function=stream_tool_calls))
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello')])]
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+
+    # the hook fires both while recording the response and when replaying it from the cache
+    for _ in range(2):
+        completed: list[str] = []
+        async with model.request_stream(messages, None, params) as stream:
+            stream.on_tool_call_complete = lambda call: completed.append(call.tool_name)
+            async for _event in stream:
+                pass
+        assert completed == ['a', 'b']
+
+
+async def test_stream_partial_tool_call_args():
+    async def stream_tool_call(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        yield {0: DeltaToolCall(name='a', json_args='{"x": 1, ', tool_call_id='1')}
+        yield {0: DeltaToolCall(json_args='"y": "ab')}
+
+    model = CachedModel(FunctionModel(stream_function=stream_tool_call))
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('Hello')])]
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+
+    # partial arguments are available both while recording the response and when replaying it from the cache
+    for _ in range(2):
+        async with model.request_stream(messages, None, params) as stream:
+            async for _event in stream:
+                pass
+            [call] = stream.get().parts
+            assert isinstance(call, ToolCallPart)
+            assert stream.get_partial_tool_call_args(call) == {'x': 1, 'y': 'ab'}
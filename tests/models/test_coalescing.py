@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ModelResponseStreamEvent,
+    PartDeltaEvent,
+    PartStartEvent,
+    TextPart,
+    TextPartDelta,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models import ModelRequestParameters
+from pydantic_ai.models.coalescing import CoalescingModel
+from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
+from pydantic_ai.usage import Usage
+
+pytestmark = pytest.mark.anyio
+
+PARAMS = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+
+
+def user_messages(prompt: str) -> list[ModelMessage]:
+    return [ModelRequest(parts=[UserPromptPart(prompt)])]
+
+
+class SlowModel:
+    def __init__(self):
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def respond(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        prompt = messages[0].parts[0]
+        assert isinstance(prompt, UserPromptPart)
+        if prompt.content == 'fail':
+            raise ValueError('failed')
+        return ModelResponse(parts=[TextPart(f'response to {prompt.content}')])
+
+    async def stream(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        self.calls += 1
+        yield 'hello '
+        await self.release.wait()
+        yield 'world'
+        yield {0: DeltaToolCall(name='my_tool', json_args='{"x": 1}', tool_call_id='1')}
+
+
+async def test_identical_requests_coalesced():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(slow.respond))
+
+    tasks = [asyncio.create_task(model.request(user_messages('a'), None, PARAMS)) for _ in range(5)]
+    other_task = asyncio.create_task(model.request(user_messages('b'), None, PARAMS))
+    await asyncio.sleep(0)
+    slow.release.set()
+    results = await asyncio.gather(*tasks)
+    other_response, _ = await other_task
+
+    assert slow.calls == 2
+    assert [response.parts for response, _ in results] == [[TextPart('response to a')]] * 5
+    assert other_response.parts == [TextPart('response to b')]
+    assert [usage for _, usage in results] == snapshot(
+        [
+            Usage(request_tokens=51, response_tokens=3, total_tokens=54),
+            Usage(details={'coalesced_requests': 1}),
+            Usage(details={'coalesced_requests': 1}),
+            Usage(details={'coalesced_requests': 1}),
+            Usage(details={'coalesced_requests': 1}),
+        ]
+    )
+
+    # finished requests aren't reused
+    await model.request(user_messages('a'), None, PARAMS)
+    assert slow.calls == 3
+
+
+async def test_errors_shared():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(slow.respond))
+
+    tasks = [asyncio.create_task(model.request(user_messages('fail'), None, PARAMS)) for _ in range(3)]
+    await asyncio.sleep(0)
+    slow.release.set()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert [str(result) for result in results] == ['failed', 'failed', 'failed']
+    assert slow.calls == 1
+
+
+async def test_cancelling_one_waiter():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(slow.respond))
+
+    first = asyncio.create_task(model.request(user_messages('a'), None, PARAMS))
+    second = asyncio.create_task(model.request(user_messages('a'), None, PARAMS))
+    await asyncio.sleep(0.01)
+    first.cancel()
+    await asyncio.sleep(0.01)
+    assert first.cancelled()
+    assert slow.cancelled == 0
+
+    slow.release.set()
+    response, _ = await second
+    assert response.parts == [TextPart('response to a')]
+    assert slow.calls == 1
+
+
+async def test_cancelling_all_waiters():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(slow.respond))
+
+    tasks = [asyncio.create_task(model.request(user_messages('a'), None, PARAMS)) for _ in range(2)]
+    await asyncio.sleep(0.01)
+    for task in tasks:
+        task.cancel()
+    await asyncio.sleep(0.01)
+    assert slow.cancelled == 1
+
+    # the cancelled request is forgotten, so the next one starts afresh
+    slow.release.set()
+    response, _ = await model.request(user_messages('a'), None, PARAMS)
+    assert response.parts == [TextPart('response to a')]
+    assert slow.calls == 2
+
+
+async def test_stream_late_joiner():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(stream_function=slow.stream))
+
+    async def collect(
+        joined: asyncio.Event | None = None,
+    ) -> tuple[list[ModelResponseStreamEvent], ModelResponse, Usage]:
+        async with model.request_stream(user_messages('a'), None, PARAMS) as stream:
+            events: list[ModelResponseStreamEvent] = []
+            async for event in stream:
+                events.append(event)
+                if joined is not None:
+                    # wait for the second request to join after the first event
+                    joined.set()
+        return events, stream.get(), stream.usage()
+
+    joined = asyncio.Event()
+    first = asyncio.create_task(collect(joined))
+    await joined.wait()
+    second = asyncio.create_task(collect())
+    await asyncio.sleep(0.01)
+    slow.release.set()
+    (first_events, first_response, first_usage), (second_events, second_response, second_usage) = await asyncio.gather(
+        first, second
+    )
+
+    assert slow.calls == 1
+    assert first_events == second_events
+    assert first_events == snapshot(
+        [
+            PartStartEvent(index=0, part=TextPart(content='hello ')),
+            PartDeltaEvent(index=0, delta=TextPartDelta(content_delta='world')),
+            PartStartEvent(index=1, part=ToolCallPart(tool_name='my_tool', args='{"x": 1}', tool_call_id='1')),
+        ]
+    )
+    assert first_response.parts == second_response.parts
+    assert first_usage == snapshot(Usage(request_tokens=50, response_tokens=5, total_tokens=55))
+    assert second_usage == snapshot(Usage(details={'coalesced_requests': 1}))
+
+
+async def test_stream_partial_tool_call_args():
+    slow = SlowModel()
+    slow.release.set()
+    model = CoalescingModel(FunctionModel(stream_function=slow.stream))
+
+    async with model.request_stream(user_messages('a'), None, PARAMS) as stream:
+        async for _event in stream:
+            pass
+        call = stream.get().parts[-1]
+        assert isinstance(call, ToolCallPart)
+        assert stream.get_partial_tool_call_args(call) == {'x': 1}
+
+
+async def test_stream_error():
+    async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        yield 'hello'
+        await asyncio.sleep(0.01)
+        raise ValueError('stream failed')
+
+    model = CoalescingModel(FunctionModel(stream_function=stream))
+
+    async def collect() -> list[ModelResponseStreamEvent]:
+        async with model.request_stream(user_messages('a'), None, PARAMS) as response:
+            return [event async for event in response]
+
+    results = await asyncio.gather(collect(), collect(), return_exceptions=True)
+    assert [str(result) for result in results] == ['stream failed', 'stream failed']
+
+
+async def test_stream_error_on_start():
+    async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        raise ValueError('stream failed')
+        yield 'hello'
+
+    model = CoalescingModel(FunctionModel(stream_function=stream))
+
+    with pytest.raises(ValueError, match='stream failed'):
+        async with model.request_stream(user_messages('a'), None, PARAMS):
+            pass
+
+
+async def test_stream_all_waiters_leave():
+    slow = SlowModel()
+    model = CoalescingModel(FunctionModel(stream_function=slow.stream))
+
+    async with model.request_stream(user_messages('a'), None, PARAMS) as stream:
+        async for event in stream:
+            assert event == PartStartEvent(index=0, part=TextPart(content='hello '))
+            break
+
+    slow.release.set()
+    async with model.request_stream(user_messages('a'), None, PARAMS) as stream:
+        assert len([event async for event in stream]) == 3
+    assert slow.calls == 2
+
+
+async def test_agent_runs_coalesced():
+    slow = SlowModel()
+    agent = Agent(CoalescingModel(FunctionModel(slow.respond)))
+
+    tasks = [asyncio.create_task(agent.run('a')) for _ in range(3)]
+    await asyncio.sleep(0.01)
+    slow.release.set()
+    results = await asyncio.gather(*tasks)
+    assert [result.output for result in results] == ['response to a'] * 3
+    assert slow.calls == 1
@@ -6,7 +6,7 @@ import json
 from collections.abc import AsyncIterator, Callable, Sequence
 from dataclasses import dataclass
 from datetime import timezone
-from typing import Annotated
+from typing import Annotated, Any
 
 import httpx
 import pytest
@@ -46,6 +46,7 @@ from pydantic_ai.models.gemini import (
     _GeminiToolConfig,
     _GeminiTools,
     _GeminiUsageMetaData,
+    _JsonArraySplitter,
 )
 from pydantic_ai.providers.google_gla import GoogleGLAProvider
 from pydantic_ai.result import Usage
@@ -670,6 +671,42 @@ async def test_stream_invalid_unicode_text(get_gemini_client: GetGeminiClient):
     assert result.usage() == snapshot(Usage(requests=1, request_tokens=2, response_tokens=4, total_tokens=6))
 
 
+def test_json_array_splitter():
+    elements: list[Any] = [
+        {'text': 'brackets ] } [ { in a string, and an escaped quote \\" and backslash \\'},
+        {'nested': [{'a': []}, {}], 'text': '€ 😀'},
+        [1, {'b': '"'}],
+        {},
+    ]
+    json_data = ('[' + ',\n  '.join(json.dumps(e, ensure_ascii=False) for e in elements) + ']\n').encode()
+    expected = [json.dumps(e, ensure_ascii=False).encode() for e in elements]
+
+    for i in range(len(json_data) + 1):
+        splitter = _JsonArraySplitter()
+        assert splitter.feed(json_data[:i]) + splitter.feed(json_data[i:]) == expected
+
+    splitter = _JsonArraySplitter()
+    assert [e for i in range(len(json_data)) for e in splitter.feed(json_data[i : i + 1])] == expected
+
+
+async def test_stream_text_long(get_gemini_client: GetGeminiClient):
+    text = 'lorem ipsum € ' * 100
+    responses = [gemini_response(_content_model_response(ModelResponse(parts=[TextPart(text)])))] * 1_000
+    json_data = _gemini_streamed_response_ta.dump_json(responses, by_alias=True)
+    assert len(json_data) > 1_000_000
+    stream = AsyncByteStreamList([json_data[i : i + 1_000] for i in range(0, len(json_data), 1_000)])
+    gemini_client = get_gemini_client(stream)
+    m = GeminiModel('gemini-1.5-flash', provider=GoogleGLAProvider(http_client=gemini_client))
+    agent = Agent(m)
+
+    async with agent.run_stream('Hello') as result:
+        chunks = [chunk async for chunk in result.stream_text(delta=True, debounce_by=None)]
+    assert chunks == [text] * 1_000
+    assert result.usage() == snapshot(
+        Usage(requests=1, request_tokens=1_000, response_tokens=2_000, total_tokens=3_000)
+    )
+
+
 async def test_stream_text_no_data(get_gemini_client: GetGeminiClient):
     responses = [_GeminiResponse(candidates=[], usage_metadata=example_usage())]
     json_data = _gemini_streamed_response_ta.dump_json(responses, by_alias=True)
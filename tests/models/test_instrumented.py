@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Any
 
 import pytest
 from dirty_equals import IsJson
@@ -11,6 +13,7 @@ from logfire_api import DEFAULT_LOGFIRE_INSTANCE
 from opentelemetry._events import NoOpEventLoggerProvider
 from opentelemetry.trace import NoOpTracerProvider
 
+from pydantic_ai import Agent
 from pydantic_ai.messages import (
     AudioUrl,
     BinaryContent,
@@ -32,8 +35,10 @@ from pydantic_ai.messages import (
     VideoUrl,
 )
 from pydantic_ai.models import Model, ModelRequestParameters, StreamedResponse
+from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.instrumented import InstrumentationSettings, InstrumentedModel
 from pydantic_ai.settings import ModelSettings
+from pydantic_ai.tools import ToolDefinition
 from pydantic_ai.usage import Usage
 
 from ..conftest import try_import
@@ -819,3 +824,125 @@ def test_messages_to_otel_events_image_url(document_content: BinaryContent):
             },
         ]
     )
+
+
+def test_messages_to_otel_events_exclude_and_truncate():
+    messages: list[ModelMessage] = [
+        ModelRequest(parts=[UserPromptPart('user_prompt')]),
+        ModelResponse(parts=[TextPart('a long response'), ToolCallPart('tool', {'x': 'a long argument'}, 'call_1')]),
+        ModelRequest(parts=[ToolReturnPart('tool', 'short', 'call_1')]),
+    ]
+    assert [
+        InstrumentedModel.event_to_dict(e)
+        for e in InstrumentedModel.messages_to_otel_events(messages, exclude={0}, max_content_length=10)
+    ] == snapshot(
+        [
+            {
+                'role': 'assistant',
+                'content': 'a long res... (5 characters truncated)',
+                'tool_calls': [
+                    {
+                        'id': 'call_1',
+                        'type': 'function',
+                        'function': {'name': 'tool', 'arguments': {'x': 'a long arg... (5 characters truncated)'}},
+                    }
+                ],
+                'gen_ai.message.index': 1,
+                'event.name': 'gen_ai.assistant.message',
+            },
+            {
+                'content': 'short',
+                'role': 'tool',
+                'id': 'call_1',
+                'name': 'tool',
+                'gen_ai.message.index': 2,
+                'event.name': 'gen_ai.tool.message',
+            },
+        ]
+    )
+
+
+async def test_instrumented_model_incremental_events(capfire: CaptureLogfire):
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) < 5:
+            return ModelResponse(parts=[ToolCallPart('my_tool', {'x': len(messages)}, f'call_{len(messages)}')])
+        return ModelResponse(parts=[TextPart('done')])
+
+    agent = Agent(FunctionModel(respond), instrument=InstrumentationSettings(incremental_events=True))
+
+    @agent.tool_plain
+    def my_tool(x: int) -> int:
+        return x
+
+    for _ in range(2):
+        result = await agent.run('hello')
+        assert result.output == 'done'
+
+    request_spans = [
+        span['attributes'] for span in capfire.exporter.exported_spans_as_dict() if span['name'].startswith('chat ')
+    ]
+    # each request only emits events for the messages sent since the previous request in the same run
+    assert [
+        (
+            attributes['pydantic_ai.previous_messages'],
+            [event.get('gen_ai.message.index', event['event.name']) for event in json.loads(attributes['events'])],
+        )
+        for attributes in request_spans
+    ] == snapshot(
+        [
+            (0, [0, 'gen_ai.choice']),
+            (2, [2, 'gen_ai.choice']),
+            (4, [4, 'gen_ai.choice']),
+            (0, [0, 'gen_ai.choice']),
+            (2, [2, 'gen_ai.choice']),
+            (4, [4, 'gen_ai.choice']),
+        ]
+    )
+
+
+async def test_instrumented_model_incremental_events_outside_run(capfire: CaptureLogfire):
+    model = InstrumentedModel(MyModel(), InstrumentationSettings(incremental_events=True))
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('user_prompt')])]
+    params = ModelRequestParameters(function_tools=[], allow_text_output=True, output_tools=[])
+    for _ in range(2):
+        await model.request(messages, model_settings=None, model_request_parameters=params)
+
+    # without an agent run span, every request emits events for the whole history
+    spans = capfire.exporter.exported_spans_as_dict()
+    assert [json.loads(span['attributes']['events'])[0]['content'] for span in spans] == ['user_prompt', 'user_prompt']
+    assert all('pydantic_ai.previous_messages' not in span['attributes'] for span in spans)
+
+
+@pytest.mark.parametrize('recording', [True, False])
+async def test_instrumented_model_parameters_serialized_once(
+    capfire: CaptureLogfire, monkeypatch: pytest.MonkeyPatch, recording: bool
+):
+    serialized: list[ModelRequestParameters] = []
+    serialize_any = InstrumentedModel.serialize_any
+
+    def counting_serialize_any(value: Any) -> Any:
+        if isinstance(value, ModelRequestParameters):
+            serialized.append(value)
+        return serialize_any(value)
+
+    monkeypatch.setattr(InstrumentedModel, 'serialize_any', counting_serialize_any)
+    settings = InstrumentationSettings() if recording else InstrumentationSettings(tracer_provider=NoOpTracerProvider())
+    model = InstrumentedModel(MyModel(), settings)
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart('user_prompt')])]
+    schema = {'type': 'object', 'properties': {'x': {'type': 'integer'}}}
+
+    for description in ['a tool', 'a tool', 'a changed tool']:
+        # the parameters are created afresh for each request, as in an agent run
+        params = ModelRequestParameters(
+            function_tools=[ToolDefinition('my_tool', description, schema)], allow_text_output=True, output_tools=[]
+        )
+        await model.request(messages, model_settings=None, model_request_parameters=params)
+
+    if recording:
+        assert [params.function_tools[0].description for params in serialized] == ['a tool', 'a changed tool']
+        assert [
+            json.loads(span['attributes']['model_request_parameters'])['function_tools'][0]['description']
+            for span in capfire.exporter.exported_spans_as_dict()
+        ] == ['a tool', 'a tool', 'a changed tool']
+    else:
+        assert serialized == []
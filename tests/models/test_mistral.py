@@ -1,6 +1,7 @@
 from __future__ import annotations as _annotations
 
 import json
+import math
 from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
@@ -748,6 +749,27 @@ async def test_stream_result_type_primitif_int(allow_model_requests: None):
         assert result.usage().response_tokens == len(stream)
 
 
+async def test_stream_result_type_primitif_float_nan(allow_model_requests: None):
+    """NaN isn't JSON, so the incremental parser gives up and the text is parsed by `from_json` instead."""
+
+    stream = [
+        text_chunk('{"resp'),
+        text_chunk('onse": 1.5'),
+        text_chunk(', "response": NaN'),
+        text_chunk('}'),
+        chunk([]),
+    ]
+
+    mock_client = MockMistralAI.create_stream_mock(stream)
+    model = MistralModel('mistral-large-latest', provider=MistralProvider(mistral_client=mock_client))
+    agent = Agent(model=model, output_type=float)
+
+    async with agent.run_stream('User prompt value') as result:
+        v = [c async for c in result.stream(debounce_by=None)]
+        assert v[0] == 1.5
+        assert len(v) == 4 and all(math.isnan(c) for c in v[1:])
+
+
 async def test_stream_result_type_primitif_array(allow_model_requests: None):
     """This test tests the primitif result with the pydantic ai format model response"""
 
@@ -1,9 +1,12 @@
+import gc
+from dataclasses import replace
 from importlib import import_module
 
 import pytest
 
 from pydantic_ai import UserError
-from pydantic_ai.models import infer_model
+from pydantic_ai.messages import ModelRequest, SystemPromptPart, UserPromptPart
+from pydantic_ai.models import MessageMappingCache, infer_model
 
 from ..conftest import TestEnv
 
@@ -113,3 +116,25 @@ def test_infer_model(
 def test_infer_str_unknown():
     with pytest.raises(UserError, match='Unknown model: foobar'):
         infer_model('foobar')
+
+
+def test_message_mapping_cache():
+    cache = MessageMappingCache[str]()
+    message = ModelRequest(parts=[SystemPromptPart('Be helpful'), UserPromptPart('Hello')])
+    assert cache.get(message) is None
+
+    cache.set(message, 'mapped')
+    assert cache.get(message) == 'mapped'
+    # equal messages aren't the same message
+    assert cache.get(replace(message)) is None
+
+    # replacing a part invalidates the mapped message, e.g. when a dynamic system prompt is re-evaluated
+    message.parts[0] = SystemPromptPart('Be very helpful')
+    assert cache.get(message) is None
+    cache.set(message, 'mapped again')
+    message.parts.append(UserPromptPart('Goodbye'))
+    assert cache.get(message) is None
+
+    del message
+    gc.collect()
+    assert len(cache) == 0
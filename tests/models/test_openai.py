@@ -807,6 +807,42 @@ async def test_document_as_binary_content_input(
     assert result.output == snapshot('The main content of the document is "Dummy PDF file."')
 
 
+async def test_mapped_messages_reused(allow_model_requests: None):
+    def tool_call(call_id: str) -> chat.ChatCompletion:
+        return completion_message(
+            ChatCompletionMessage(
+                content=None,
+                role='assistant',
+                tool_calls=[
+                    chat.ChatCompletionMessageToolCall(
+                        id=call_id, function=Function(arguments='{}', name='get_time'), type='function'
+                    )
+                ],
+            )
+        )
+
+    responses = [tool_call(str(i)) for i in range(3)]
+    responses.append(completion_message(ChatCompletionMessage(content='final response', role='assistant')))
+    mock_client = MockOpenAI.create_mock(responses)
+    m = OpenAIModel('gpt-4o', provider=OpenAIProvider(openai_client=mock_client))
+    agent = Agent(m)
+
+    @agent.tool_plain
+    def get_time() -> str:
+        return '12:00'
+
+    image = BinaryContent(data=b'\x89PNG image data', media_type='image/png')
+    result = await agent.run(['What is in this image?', image])
+    assert result.output == 'final response'
+
+    # each step only maps the new messages, the earlier ones, including the base64 encoded image, are reused
+    sent_messages = [kwargs['messages'] for kwargs in get_mock_chat_completion_kwargs(mock_client)]
+    assert [len(messages) for messages in sent_messages] == [1, 3, 5, 7]
+    for previous, current in zip(sent_messages, sent_messages[1:]):
+        assert all(a is b for a, b in zip(previous, current))
+    assert len(m._mapped_messages) == 7  # pyright: ignore[reportPrivateUsage]
+
+
 def test_model_status_error(allow_model_requests: None) -> None:
     mock_client = MockOpenAI.create_mock(
         APIStatusError(
@@ -1,3 +1,4 @@
+import asyncio
 import json
 import re
 import sys
@@ -8,7 +9,7 @@ import httpx
 import pytest
 from dirty_equals import IsJson
 from inline_snapshot import snapshot
-from pydantic import BaseModel, TypeAdapter, field_validator
+from pydantic import BaseModel, TypeAdapter, create_model, field_validator
 from pydantic_core import to_json
 
 from pydantic_ai import Agent, ModelRetry, RunContext, UnexpectedModelBehavior, UserError, capture_run_messages
@@ -29,7 +30,7 @@ from pydantic_ai.messages import (
 )
 from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.test import TestModel
-from pydantic_ai.result import Usage
+from pydantic_ai.result import ToolOutput, Usage
 from pydantic_ai.tools import ToolDefinition
 
 from .conftest import IsDatetime, IsNow, IsStr, TestEnv
@@ -1674,6 +1675,59 @@ def test_custom_output_type_invalid() -> None:
         agent.run_sync('Hello', output_type=int)
 
 
+async def test_graph_and_output_schema_cached() -> None:
+    agent = Agent('test', name='cached_agent')
+
+    graphs: list[Any] = []
+    output_schemas: list[Any] = []
+    for output_type in (Foo, Foo, ToolOutput(type_=Foo, name='foo'), ToolOutput(type_=Foo, name='foo')):
+        async with agent.iter('Hello', output_type=output_type) as agent_run:
+            pass
+        graphs.append(agent_run._graph_run.graph)  # pyright: ignore[reportPrivateUsage]
+        output_schemas.append(agent_run.ctx.deps.output_schema)
+
+    assert graphs[0] is graphs[1]
+    assert graphs[2] is graphs[3]
+    assert graphs[0] is not graphs[2]
+    assert output_schemas[0] is output_schemas[1]
+    assert output_schemas[2] is output_schemas[3]
+    assert output_schemas[0] is not output_schemas[2]
+
+    # the cache is keyed on the name, which may be inferred or changed between runs
+    agent.name = 'renamed_agent'
+    graph = agent._get_graph(Foo)  # pyright: ignore[reportPrivateUsage]
+    assert graph is not graphs[0]
+    assert graph.name == 'renamed_agent'
+
+    # registering a tool clears the caches
+    @agent.tool_plain
+    def my_tool() -> str:
+        return 'hello'
+
+    assert agent._get_graph(Foo) is not graph  # pyright: ignore[reportPrivateUsage]
+    result = await agent.run('Hello', output_type=Foo)
+    assert result.output == snapshot(Foo(a=0, b='a'))
+
+
+async def test_output_schema_cache_bounded() -> None:
+    agent = Agent('test')
+
+    output_types = [create_model(f'Output{i}', value=(int, ...)) for i in range(100)]
+    for output_type in output_types:
+        result = await agent.run('Hello', output_type=output_type)
+        assert result.output == output_type(value=0)
+
+    # only the most recently used output types are kept
+    assert len(agent._output_schema_cache) == len(agent._graph_cache) == 64  # pyright: ignore[reportPrivateUsage]
+    assert output_types[-65] not in agent._output_schema_cache  # pyright: ignore[reportPrivateUsage]
+
+    # using a cached output type keeps it, the least recently used one is evicted instead
+    await agent.run('Hello', output_type=output_types[-64])
+    await agent.run('Hello', output_type=output_types[0])
+    assert output_types[-64] in agent._output_schema_cache  # pyright: ignore[reportPrivateUsage]
+    assert output_types[-63] not in agent._output_schema_cache  # pyright: ignore[reportPrivateUsage]
+
+
 def test_binary_content_all_messages_json():
     agent = Agent('test')
 
@@ -1900,3 +1954,123 @@ def test_agent_run_result_serialization() -> None:
     # Check that we can load the data back
     deserialized_result = adapter.validate_json(serialized_data)
     assert deserialized_result == result
+
+
+def batch_model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    prompt = messages[0].parts[0]
+    assert isinstance(prompt, UserPromptPart) and isinstance(prompt.content, str)
+    if prompt.content == 'fail':
+        raise ValueError('failed')
+    return ModelResponse(parts=[TextPart(f'echo {prompt.content}')])
+
+
+@pytest.mark.anyio
+async def test_run_many():
+    agent = Agent(FunctionModel(batch_model_function))
+    prompts = (str(i) if i % 1000 != 999 else 'fail' for i in range(10_000))
+
+    batch = await agent.run_many(prompts, max_concurrency=50)
+
+    assert len(batch.items) == 10_000
+    assert [item.index for item in batch.items] == list(range(10_000))
+    assert batch.items[0].result is not None
+    assert batch.items[0].result.output == 'echo 0'
+    assert batch.items[0].error is None
+    assert batch.items[0].duration > 0
+
+    assert [item.index for item in batch.failures] == list(range(999, 10_000, 1000))
+    assert all(item.result is None and isinstance(item.error, ValueError) for item in batch.failures)
+
+    usage = batch.usage()
+    assert usage.requests == 9_990
+    assert usage.total_tokens == sum(item.result.usage().total_tokens or 0 for item in batch.items if item.result)
+    assert batch.duration > 0
+
+
+@pytest.mark.anyio
+async def test_iter_many_concurrency_and_order():
+    running = 0
+    peak = 0
+
+    async def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        prompt = messages[0].parts[0]
+        assert isinstance(prompt, UserPromptPart) and isinstance(prompt.content, str)
+        # later prompts finish first
+        await asyncio.sleep(0.001 * (10 - int(prompt.content)))
+        running -= 1
+        return ModelResponse(parts=[TextPart(prompt.content)])
+
+    agent = Agent(FunctionModel(model_function))
+    prompts = [str(i) for i in range(10)]
+
+    in_completion_order = [item.index async for item in agent.iter_many(prompts, max_concurrency=10)]
+    assert sorted(in_completion_order) == list(range(10))
+    assert in_completion_order != list(range(10))
+    assert peak == 10
+
+    peak = 0
+    in_input_order = [item.index async for item in agent.iter_many(prompts, max_concurrency=3, ordered=True)]
+    assert in_input_order == list(range(10))
+    assert peak == 3
+
+    with pytest.raises(UserError, match='`max_concurrency` must be at least 1'):
+        await agent.run_many(prompts, max_concurrency=0)
+
+
+@pytest.mark.anyio
+async def test_iter_many_stop_early():
+    started: list[str] = []
+    cancelled: list[str] = []
+
+    async def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompt = messages[0].parts[0]
+        assert isinstance(prompt, UserPromptPart) and isinstance(prompt.content, str)
+        started.append(prompt.content)
+        try:
+            await asyncio.sleep(0 if prompt.content == '0' else 10)
+        except asyncio.CancelledError:
+            cancelled.append(prompt.content)
+            raise
+        return ModelResponse(parts=[TextPart(prompt.content)])
+
+    agent = Agent(FunctionModel(model_function))
+    results = agent.iter_many((str(i) for i in range(100)), max_concurrency=3)
+    item = await results.__anext__()
+    assert item.index == 0
+    assert item.error is None
+
+    # closing the iterator cancels the runs in progress and doesn't start any more
+    await results.aclose()
+    assert started == ['0', '1', '2', '3']
+    assert sorted(cancelled) == ['1', '2', '3']
+
+
+@pytest.mark.anyio
+async def test_iter_many_ordered_backpressure():
+    first_done = asyncio.Event()
+    started: list[int] = []
+
+    async def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        prompt = messages[0].parts[0]
+        assert isinstance(prompt, UserPromptPart) and isinstance(prompt.content, str)
+        started.append(int(prompt.content))
+        if prompt.content == '0':
+            await first_done.wait()
+        return ModelResponse(parts=[TextPart(prompt.content)])
+
+    agent = Agent(FunctionModel(model_function))
+    results = agent.iter_many((str(i) for i in range(100)), max_concurrency=2, ordered=True)
+    next_item = asyncio.ensure_future(results.__anext__())
+    await asyncio.sleep(0.01)
+
+    # while the first run is slow, at most `max_concurrency` results each are running, queued and waiting for it
+    assert not next_item.done()
+    assert 0 in started
+    assert len(started) <= 6
+
+    first_done.set()
+    assert (await next_item).index == 0
+    assert [item.index async for item in results] == list(range(1, 100))
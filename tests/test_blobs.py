@@ -0,0 +1,151 @@
+from __future__ import annotations as _annotations
+
+import json
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from pydantic_ai import Agent
+from pydantic_ai.blobs import BlobStore, FileBlobStore, MemoryBlobStore
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+IMAGE = BinaryContent(data=b'\x89PNG image data', media_type='image/png')
+IMAGE_KEY = BlobStore.blob_key(IMAGE.data)
+
+
+def conversation(prompt: str) -> list[ModelMessage]:
+    return [
+        ModelRequest(parts=[UserPromptPart([prompt, IMAGE])]),
+        ModelResponse(parts=[TextPart('An image')]),
+        ModelRequest(parts=[ToolReturnPart('get_file', 'See file abc', tool_call_id='1'), UserPromptPart([IMAGE])]),
+    ]
+
+
+def test_dump_and_load():
+    store = MemoryBlobStore()
+    messages = conversation('Describe this')
+
+    dumped = store.dump_messages(messages)
+    assert len(store) == 1
+    assert store[IMAGE_KEY] == IMAGE.data
+    assert IMAGE_KEY in store
+    dumped_parts = [part['content'] for message in json.loads(dumped) for part in message['parts']]
+    reference = {'media_type': 'image/png', 'kind': 'binary', 'blob': IMAGE_KEY}
+    assert dumped_parts == [['Describe this', reference], 'An image', 'See file abc', [reference]]
+    assert store.load_messages(dumped) == messages
+
+
+class CountingBlobStore(MemoryBlobStore):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_blob(self, key: str) -> bytes:
+        self.reads += 1
+        return super().get_blob(key)
+
+
+def test_load_is_lazy():
+    store = CountingBlobStore()
+    messages = conversation('Describe this')
+    dumped = store.dump_messages(messages)
+    request = store.load_messages(dumped)[0]
+    assert isinstance(request, ModelRequest)
+    assert isinstance(request.parts[0], UserPromptPart)
+    content = request.parts[0].content[1]
+    assert isinstance(content, BinaryContent)
+    assert content.media_type == 'image/png'
+    assert content.is_image
+    assert store.reads == 0
+
+    # dumping again doesn't read the data
+    assert store.dump_messages([request]) == store.dump_messages(messages[:1])
+    assert store.reads == 0
+
+    # nor does comparing content loaded from the same blob
+    assert store.load_messages(dumped)[0] == request
+    assert store.reads == 0
+
+    # the data is only read once
+    assert content.data == IMAGE.data
+    assert content.data == IMAGE.data
+    assert content == IMAGE
+    assert store.reads == 1
+
+    copied = replace(content, media_type='image/jpeg')
+    assert copied == BinaryContent(data=IMAGE.data, media_type='image/jpeg')
+    assert store.reads == 1
+
+    content.data = b'other data'
+    assert content.base64 == 'b3RoZXIgZGF0YQ=='
+    assert content != IMAGE
+
+
+def test_missing_blob():
+    dumped = MemoryBlobStore().dump_messages(conversation('Hi'))
+    messages = MemoryBlobStore().load_messages(dumped)
+    request = messages[0]
+    assert isinstance(request, ModelRequest)
+    assert isinstance(request.parts[0], UserPromptPart)
+    content = request.parts[0].content[1]
+    assert isinstance(content, BinaryContent)
+    with pytest.raises(KeyError):
+        content.data
+    with pytest.raises(KeyError):
+        content.size
+
+
+def test_load_inline_data():
+    messages = conversation('Describe this')
+    assert MemoryBlobStore().load_messages(ModelMessagesTypeAdapter.dump_json(messages)) == messages
+
+
+def test_file_blob_store(tmp_path: Path):
+    store = FileBlobStore(tmp_path / 'blobs')
+    messages = conversation('Describe this')
+    dumped = store.dump_messages(messages)
+    store.dump_messages(conversation('Something else'))
+    assert [path.name for path in (tmp_path / 'blobs').glob('*/*')] == [IMAGE_KEY]
+
+    # a new store sharing the directory, e.g. in another process
+    other_store = FileBlobStore(tmp_path / 'blobs')
+    assert other_store.load_messages(dumped) == messages
+
+    assert other_store.blob_size(IMAGE_KEY) == len(IMAGE.data)
+    with pytest.raises(KeyError):
+        other_store.blob_size('0' * 64)
+    with pytest.raises(KeyError):
+        other_store['0' * 64]
+    with pytest.raises(ValueError, match="Invalid blob key: '../etc'"):
+        other_store['../etc']
+
+
+def test_loaded_messages_sent_to_model():
+    store = MemoryBlobStore()
+    dumped = store.dump_messages(conversation('Describe this'))
+
+    def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        sizes = [
+            len(content.data)
+            for message in messages
+            for part in message.parts
+            if isinstance(part, UserPromptPart) and not isinstance(part.content, str)
+            for content in part.content
+            if isinstance(content, BinaryContent)
+        ]
+        return ModelResponse(parts=[TextPart(f'{sizes}')])
+
+    agent = Agent(FunctionModel(respond))
+    result = agent.run_sync('And now?', message_history=store.load_messages(dumped))
+    assert result.output == '[15, 15]'
@@ -0,0 +1,141 @@
+from __future__ import annotations as _annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from pydantic_ai.cache import CacheStats, MemoryCache, SQLiteCache
+
+
+def test_memory_cache():
+    cache = MemoryCache()
+    with pytest.raises(KeyError):
+        cache['a']
+    cache['a'] = {'x': 1}
+    cache['b'] = None
+    assert cache['a'] == {'x': 1}
+    assert cache['b'] is None
+    assert cache.stats == CacheStats(hits=2, misses=1)
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_memory_cache_lru_eviction():
+    cache = MemoryCache(max_size=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1
+    cache['c'] = 3
+
+    assert len(cache) == 2
+    assert cache['a'] == 1
+    assert cache['c'] == 3
+    with pytest.raises(KeyError):
+        cache['b']
+
+
+def test_memory_cache_max_bytes():
+    cache = MemoryCache(max_size=None, max_bytes=10, sizeof=len)
+    cache['a'] = b'12345'
+    cache['b'] = b'1234'
+    assert cache['a'] == b'12345'
+    cache['c'] = b'12'
+
+    # the least recently used values are evicted until the total size fits
+    assert len(cache) == 2
+    with pytest.raises(KeyError):
+        cache['b']
+
+    # replacing a value frees its size, and values larger than the limit aren't stored
+    cache['a'] = b'1'
+    cache['d'] = b'1234567'
+    assert sorted(cache._values) == ['a', 'c', 'd']  # pyright: ignore[reportPrivateUsage]
+    cache['e'] = b'12345678901'
+    with pytest.raises(KeyError):
+        cache['e']
+    assert len(cache) == 3
+
+
+def test_memory_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = time.monotonic()
+    monkeypatch.setattr(time, 'monotonic', lambda: now)
+    cache = MemoryCache(ttl=10)
+    cache['a'] = 1
+    assert cache['a'] == 1
+
+    now += 10
+    with pytest.raises(KeyError):
+        cache['a']
+    assert len(cache) == 0
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_sqlite_cache(tmp_path: Path):
+    path = tmp_path / 'cache.db'
+    cache = SQLiteCache(path)
+    with pytest.raises(KeyError):
+        cache['a']
+    cache['a'] = {'x': [1, 2]}
+    cache['a'] = {'x': [1, 2, 3]}
+    assert cache['a'] == {'x': [1, 2, 3]}
+    assert cache.stats == CacheStats(hits=1, misses=1)
+    cache.close()
+
+    # values persist, and tables keep caches sharing a database apart
+    cache = SQLiteCache(path)
+    assert cache['a'] == {'x': [1, 2, 3]}
+    other_cache = SQLiteCache(path, table='other')
+    with pytest.raises(KeyError):
+        other_cache['a']
+
+    cache.clear()
+    with pytest.raises(KeyError):
+        cache['a']
+
+
+def test_sqlite_cache_ttl(monkeypatch: pytest.MonkeyPatch):
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now)
+    cache = SQLiteCache(':memory:', ttl=10)
+    cache['a'] = 1
+    assert cache['a'] == 1
+
+    now += 10
+    with pytest.raises(KeyError):
+        cache['a']
+
+
+@pytest.mark.anyio
+async def test_sqlite_cache_async(monkeypatch: pytest.MonkeyPatch):
+    cache = SQLiteCache(':memory:')
+    threads: set[int] = set()
+    get_value = cache.get_value
+
+    def recording_get_value(key: str) -> Any:
+        threads.add(threading.get_ident())
+        return get_value(key)
+
+    monkeypatch.setattr(cache, 'get_value', recording_get_value)
+
+    with pytest.raises(KeyError):
+        await cache.aget('a')
+    await cache.aset('a', {'x': 1})
+    assert await cache.aget('a') == {'x': 1}
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+    # the database is read in a worker thread, not on the event loop
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.anyio
+async def test_memory_cache_async():
+    cache = MemoryCache()
+    await cache.aset('a', 1)
+    assert await cache.aget('a') == 1
+    with pytest.raises(KeyError):
+        await cache.aget('b')
+    assert cache.stats == CacheStats(hits=1, misses=1)
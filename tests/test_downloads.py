@@ -0,0 +1,226 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from pydantic_ai import Agent
+from pydantic_ai.cache import CacheStats, MemoryCache, SQLiteCache
+from pydantic_ai.downloads import DownloadCache, DownloadedFile, get_download_cache, set_download_cache
+from pydantic_ai.messages import DocumentUrl, ImageUrl, ModelRequest, UserPromptPart
+from pydantic_ai.models.gemini import GeminiModel
+from pydantic_ai.providers.google_gla import GoogleGLAProvider
+
+pytestmark = pytest.mark.anyio
+
+
+class FileServer:
+    def __init__(self, headers: dict[str, str] | None = None):
+        self.headers = headers if headers is not None else {'cache-control': 'max-age=3600'}
+        self.requests: list[httpx.Request] = []
+        self.delay = 0.0
+        self.active = 0
+        self.peak_active = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        await asyncio.sleep(self.delay)
+        self.active -= 1
+        if request.url.path == '/missing':
+            return httpx.Response(404)
+        etag = self.headers.get('etag')
+        if etag is not None and request.headers.get('if-none-match') == etag:
+            return httpx.Response(304, headers=self.headers)
+        content_type = 'text/plain; charset=latin-1' if request.url.path.endswith('.txt') else 'image/png'
+        return httpx.Response(
+            200,
+            content=f'{request.url.path} é'.encode('latin-1'),
+            headers={'content-type': content_type, **self.headers},
+        )
+
+    def cache(self, **kwargs: float | None) -> DownloadCache:
+        client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+        return DownloadCache(http_client=client, **kwargs)  # pyright: ignore[reportArgumentType]
+
+
+async def test_download_cached():
+    server = FileServer()
+    cache = server.cache()
+
+    downloaded = await cache.get('https://example.com/image.png')
+    assert downloaded == DownloadedFile(b'/image.png \xe9', 'image/png')
+    assert downloaded.media_type == 'image/png'
+    assert downloaded.base64 == 'L2ltYWdlLnBuZyDp'
+    assert await cache.get('https://example.com/image.png') is downloaded
+    assert len(server.requests) == 1
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+async def test_download_text():
+    cache = FileServer().cache()
+    downloaded = await cache.get('https://example.com/file.txt')
+    assert downloaded.media_type == 'text/plain'
+    assert downloaded.text == '/file.txt é'
+    assert DownloadedFile(b'caf\xc3\xa9').text == 'café'
+
+
+async def test_download_error():
+    cache = FileServer().cache()
+    with pytest.raises(httpx.HTTPStatusError):
+        await cache.get('https://example.com/missing')
+
+
+async def test_concurrent_downloads_shared():
+    server = FileServer()
+    server.delay = 0.01
+    cache = server.cache()
+    urls = ['https://example.com/a.png', 'https://example.com/b.png', 'https://example.com/a.png']
+
+    await asyncio.gather(cache.prefetch(urls), cache.get('https://example.com/b.png'))
+    assert sorted(request.url.path for request in server.requests) == ['/a.png', '/b.png']
+
+
+@pytest.mark.parametrize(
+    'headers,requests',
+    [
+        ({'cache-control': 'no-store'}, 3),
+        ({'cache-control': 'max-age=3600'}, 1),
+        ({'cache-control': 'max-age=0'}, 3),
+        ({'cache-control': 'max-age=invalid'}, 3),
+        ({'expires': 'Thu, 01 Jan 2099 00:00:00 GMT'}, 1),
+        ({'expires': 'Thu, 01 Jan 1970 00:00:00 GMT'}, 3),
+        ({'expires': 'never'}, 3),
+        # without freshness headers, downloads are only kept to be revalidated
+        ({}, 3),
+        ({'etag': '"v1"'}, 3),
+    ],
+)
+async def test_cache_control(headers: dict[str, str], requests: int):
+    server = FileServer(headers)
+    cache = server.cache()
+    for _ in range(3):
+        await cache.get('https://example.com/image.png')
+    assert len(server.requests) == requests
+
+
+@pytest.mark.parametrize('default_ttl,requests', [(None, 2), (0, 2), (3600, 1)])
+async def test_default_ttl(default_ttl: float | None, requests: int):
+    server = FileServer({})
+    cache = server.cache(default_ttl=default_ttl)
+    await cache.get('https://example.com/image.png')
+    await cache.get('https://example.com/image.png')
+    assert len(server.requests) == requests
+
+
+async def test_revalidation_without_freshness_headers():
+    server = FileServer({'etag': '"v1"'})
+    cache = server.cache()
+    first = await cache.get('https://example.com/image.png')
+    assert await cache.get('https://example.com/image.png') is first
+    assert [request.headers.get('if-none-match') for request in server.requests] == [None, '"v1"']
+
+
+async def test_memory_bounded_by_size():
+    server = FileServer()
+    cache = server.cache()
+    assert isinstance(cache.memory, MemoryCache)
+    cache.memory.max_bytes = 20
+
+    # each download is 9 bytes, so only the two most recent fit
+    for name in ['a', 'b', 'c']:
+        await cache.get(f'https://example.com/{name}.png')
+    assert len(cache.memory) == 2
+    await cache.get('https://example.com/a.png')
+    assert len(server.requests) == 4
+
+
+async def test_revalidation():
+    server = FileServer({'cache-control': 'no-cache', 'etag': '"v1"', 'last-modified': 'Thu, 01 Jan 2025 00:00:00 GMT'})
+    cache = server.cache()
+
+    first = await cache.get('https://example.com/image.png')
+    assert await cache.get('https://example.com/image.png') is first
+    assert [request.headers.get('if-none-match') for request in server.requests] == [None, '"v1"']
+    assert server.requests[1].headers['if-modified-since'] == 'Thu, 01 Jan 2025 00:00:00 GMT'
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+    # a changed file is downloaded again
+    server.headers['etag'] = '"v2"'
+    assert await cache.get('https://example.com/image.png') is not first
+    assert cache.stats == CacheStats(hits=1, misses=2)
+
+
+async def test_persistent_cache(tmp_path: Path):
+    server = FileServer()
+    persistent = SQLiteCache(tmp_path / 'downloads.db')
+    await server.cache(persistent=persistent).get('https://example.com/image.png')  # pyright: ignore[reportArgumentType]
+
+    # a new cache, e.g. in another process, finds the download on disk
+    cache = server.cache(persistent=persistent)  # pyright: ignore[reportArgumentType]
+    assert (await cache.get('https://example.com/image.png')).content == b'/image.png \xe9'
+    assert len(server.requests) == 1
+
+    cache.clear()
+    await cache.get('https://example.com/image.png')
+    assert len(server.requests) == 2
+    persistent.close()
+
+
+async def test_default_download_cache():
+    cache = get_download_cache()
+    assert get_download_cache() is cache
+    set_download_cache(None)
+    assert get_download_cache() is not cache
+
+
+async def test_model_prefetches_prompt_urls(allow_model_requests: None):
+    server = FileServer()
+    server.delay = 0.01
+    set_download_cache(server.cache())
+
+    def gemini_handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                'candidates': [
+                    {
+                        'content': {'role': 'model', 'parts': [{'text': 'Two images'}]},
+                        'index': 0,
+                        'finish_reason': 'STOP',
+                    }
+                ],
+                'usage_metadata': {'prompt_token_count': 1, 'candidates_token_count': 2, 'total_token_count': 3},
+                'model_version': 'gemini-1.5-flash',
+            },
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(gemini_handler))
+    model = GeminiModel('gemini-1.5-flash', provider=GoogleGLAProvider(api_key='test', http_client=http_client))
+    agent = Agent(model)
+    prompt = [
+        'Compare these',
+        ImageUrl('https://example.com/a.png'),
+        ImageUrl('https://example.com/b.png'),
+        DocumentUrl('https://example.com/a.png'),
+    ]
+
+    result = await agent.run(prompt)
+    await agent.run(prompt)
+    # one request per unique URL, made concurrently
+    assert sorted(request.url.path for request in server.requests) == ['/a.png', '/b.png']
+    assert server.peak_active == 2
+
+    # the files of all the user prompts in the history are downloaded at once
+    server.requests.clear()
+    server.peak_active = 0
+    history = [
+        ModelRequest(parts=[UserPromptPart(['First', ImageUrl('https://example.com/c.png')])]),
+        *result.new_messages()[1:],
+    ]
+    await agent.run(['Second', ImageUrl('https://example.com/d.png')], message_history=history)
+    assert sorted(request.url.path for request in server.requests) == ['/c.png', '/d.png']
+    assert server.peak_active == 2
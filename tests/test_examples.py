@@ -33,6 +33,7 @@ from pydantic_ai.messages import (
     UserPromptPart,
 )
 from pydantic_ai.models import KnownModelName, Model, infer_model
+from pydantic_ai.models.cached import CachedModel
 from pydantic_ai.models.fallback import FallbackModel
 from pydantic_ai.models.function import AgentInfo, DeltaToolCall, DeltaToolCalls, FunctionModel
 from pydantic_ai.models.test import TestModel
@@ -654,6 +655,10 @@ def mock_infer_model(model: Model | KnownModelName) -> Model:
             else:
                 mock_fallback_models.append(mock_infer_model(m))
         return FallbackModel(*mock_fallback_models)
+    if isinstance(model, CachedModel):
+        # Keep the cache, and mock the model being cached.
+        model.wrapped = mock_infer_model(model.wrapped)
+        return model
     if isinstance(model, (FunctionModel, TestModel)):
         return model
     else:
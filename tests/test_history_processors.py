@@ -0,0 +1,201 @@
+from __future__ import annotations as _annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai import Agent, UserError
+from pydantic_ai.blobs import MemoryBlobStore
+from pydantic_ai.history_processors import KeepLastTurns, StripBinaryContent, TokenBudget, estimate_tokens
+from pydantic_ai.messages import (
+    BinaryContent,
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    SystemPromptPart,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+from .conftest import IsDatetime
+
+pytestmark = pytest.mark.anyio
+
+
+def build_history(turns: int) -> list[ModelMessage]:
+    """Build a history where each turn is a user prompt, a tool call, its return and a text response."""
+    messages: list[ModelMessage] = []
+    for turn in range(turns):
+        parts: list[SystemPromptPart | UserPromptPart] = [UserPromptPart(f'question {turn}')]
+        if turn == 0:
+            parts.insert(0, SystemPromptPart('be helpful'))
+        messages.append(ModelRequest(parts=list(parts)))
+        messages.append(ModelResponse(parts=[ToolCallPart('lookup', {'turn': turn}, tool_call_id=f'call-{turn}')]))
+        messages.append(ModelRequest(parts=[ToolReturnPart('lookup', f'result {turn}', tool_call_id=f'call-{turn}')]))
+        messages.append(ModelResponse(parts=[TextPart(f'answer {turn}')]))
+    return messages
+
+
+def assert_valid_history(messages: list[ModelMessage]) -> None:
+    assert isinstance(messages[0], ModelRequest)
+    assert isinstance(messages[0].parts[0], SystemPromptPart)
+    call_ids: set[str] = set()
+    for message in messages:
+        for part in message.parts:
+            if isinstance(part, ToolCallPart):
+                call_ids.add(part.tool_call_id)
+            elif isinstance(part, ToolReturnPart):
+                assert part.tool_call_id in call_ids
+
+
+def user_prompts(messages: list[ModelMessage]) -> list[str]:
+    return [
+        part.content
+        for message in messages
+        for part in message.parts
+        if isinstance(part, UserPromptPart) and isinstance(part.content, str)
+    ]
+
+
+def test_keep_last_turns():
+    history = build_history(1000)
+    processed = KeepLastTurns(3)(history)
+
+    assert_valid_history(processed)
+    assert user_prompts(processed) == ['question 997', 'question 998', 'question 999']
+    assert len(processed) == 12
+    # the original history isn't modified
+    assert len(history) == 4000
+    assert len(history[-12].parts) == 1
+
+    assert KeepLastTurns(1000)(history) is history
+
+
+def test_keep_last_turns_keeps_tool_calls_with_returns():
+    history = build_history(2)
+    # a tool returning binary content adds a user prompt to the tool return request, which can't start a turn
+    request = history[2]
+    assert isinstance(request, ModelRequest)
+    request.parts.append(UserPromptPart(['This is file abc:', BinaryContent(b'abc', media_type='image/png')]))
+
+    processed = KeepLastTurns(1)(history[:4])
+    assert processed is not history
+    assert processed == history[:4]
+
+
+def test_token_budget():
+    history = build_history(1000)
+    budget = 200
+    processed = TokenBudget(budget)(history)
+
+    assert_valid_history(processed)
+    assert sum(estimate_tokens(message) for message in processed) <= budget
+    prompts = user_prompts(processed)
+    assert prompts[-1] == 'question 999'
+    assert len(prompts) == snapshot(14)
+
+    # a bigger budget keeps more turns, the current turn is always kept
+    assert len(user_prompts(TokenBudget(2000)(history))) > len(prompts)
+    assert user_prompts(TokenBudget(0)(history)) == ['question 999']
+    assert TokenBudget(1_000_000)(history) is history
+
+
+def test_token_budget_lazy_binary_content(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    class UnreadableBlobStore(MemoryBlobStore):
+        def get_blob(self, key: str) -> bytes:
+            raise AssertionError('the blob was loaded')
+
+    def read_bytes(self: Path) -> bytes:
+        raise AssertionError('the file was read')
+
+    store = UnreadableBlobStore()
+    image = store.load_binary_content(store.put(b'\x89PNG' * 1000), 'image/png')
+    path = tmp_path / 'video.mp4'
+    path.write_bytes(bytes(8000))
+    video = BinaryContent.from_path(path)
+    monkeypatch.setattr(Path, 'read_bytes', read_bytes)
+
+    history: list[ModelMessage] = [
+        ModelRequest(parts=[UserPromptPart(['Describe this', image])]),
+        ModelResponse(parts=[TextPart('An image')]),
+        ModelRequest(parts=[UserPromptPart(['And this', video])]),
+    ]
+    # the sizes are used without loading the data
+    assert [estimate_tokens(message) for message in history] == [1004, 2, 2002]
+    assert TokenBudget(10_000)(history) is history
+    assert TokenBudget(2500)(history) == history[2:]
+
+
+def test_strip_binary_content():
+    image = BinaryContent(b'\x89PNG' * 1000, media_type='image/png')
+    history: list[ModelMessage] = [
+        ModelRequest(parts=[UserPromptPart(['first', image])]),
+        ModelResponse(parts=[TextPart('a picture')]),
+        ModelRequest(parts=[UserPromptPart(['second', image])]),
+    ]
+
+    processed = StripBinaryContent()(history)
+    assert processed == [
+        ModelRequest(parts=[UserPromptPart(['first', '[binary content removed: image/png]'], timestamp=IsDatetime())]),
+        history[1],
+        history[2],
+    ]
+    assert estimate_tokens(processed[0]) < estimate_tokens(history[0])
+    assert history[0] == ModelRequest(parts=[UserPromptPart(['first', image], timestamp=IsDatetime())])
+
+    assert StripBinaryContent(keep_last_turns=2)(history) is history
+    assert StripBinaryContent(keep_last_turns=0)(history)[2] == ModelRequest(
+        parts=[UserPromptPart(['second', '[binary content removed: image/png]'], timestamp=IsDatetime())]
+    )
+
+
+@dataclass
+class RecordingModel:
+    sent: list[list[ModelMessage]] = field(default_factory=list)
+
+    def request(self, messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        self.sent.append(messages)
+        if len(self.sent) == 1:
+            return ModelResponse(parts=[ToolCallPart('get_value', {})])
+        return ModelResponse(parts=[TextPart('done')])
+
+
+async def test_agent_history_processors():
+    recorder = RecordingModel()
+
+    async def drop_nothing(messages: list[ModelMessage]) -> list[ModelMessage]:
+        return messages
+
+    agent = Agent(
+        FunctionModel(recorder.request),
+        system_prompt='be helpful',
+        history_processors=[drop_nothing, StripBinaryContent(), KeepLastTurns(2)],
+    )
+
+    @agent.tool_plain
+    def get_value() -> int:
+        return 42
+
+    history = build_history(1000)
+    result = await agent.run('new question', message_history=history)
+
+    assert result.output == 'done'
+    # the model only sees the last two turns, but the full history is kept
+    assert [user_prompts(messages) for messages in recorder.sent] == [
+        ['question 999', 'new question'],
+        ['question 999', 'new question'],
+    ]
+    assert_valid_history(recorder.sent[1])
+    assert len(result.all_messages()) == 4000 + 4
+
+
+async def test_history_processor_returns_no_messages():
+    agent = Agent(FunctionModel(RecordingModel().request), history_processors=[lambda messages: []])
+
+    with pytest.raises(UserError, match='History processors returned no messages to send to the model.'):
+        await agent.run('Hello')
@@ -4,11 +4,13 @@ from pathlib import Path
 
 import pytest
 from inline_snapshot import snapshot
+from pytest_mock import MockerFixture
 
 from pydantic_ai.agent import Agent
 from pydantic_ai.exceptions import UserError
 from pydantic_ai.messages import (
     BinaryContent,
+    ModelMessage,
     ModelRequest,
     ModelResponse,
     RetryPromptPart,
@@ -17,10 +19,13 @@ from pydantic_ai.messages import (
     ToolReturnPart,
     UserPromptPart,
 )
+from pydantic_ai.models.function import AgentInfo, FunctionModel
 
 from .conftest import IsDatetime, try_import
 
 with try_import() as imports_successful:
+    from mcp.types import ServerNotification, ToolListChangedNotification
+
     from pydantic_ai.mcp import MCPServerHTTP, MCPServerStdio
     from pydantic_ai.models.openai import OpenAIModel
     from pydantic_ai.providers.openai import OpenAIProvider
@@ -61,6 +66,56 @@ async def test_stdio_server_with_cwd():
         assert len(tools) == 10
 
 
+async def test_stdio_server_cache_tools(mocker: MockerFixture):
+    server = MCPServerStdio('python', ['-m', 'tests.mcp_server'], cache_tools=True)
+    async with server:
+        list_tools = mocker.spy(server._client, 'list_tools')  # pyright: ignore[reportPrivateUsage]
+        tools = await server.list_tools()
+        assert len(tools) == 10
+        assert await server.list_tools() is tools
+        assert list_tools.call_count == 1
+
+        notification = ServerNotification(ToolListChangedNotification(method='notifications/tools/list_changed'))
+        await server._handle_message(notification)  # pyright: ignore[reportPrivateUsage]
+        assert await server.list_tools() == tools
+        assert list_tools.call_count == 2
+
+    async with server:
+        list_tools = mocker.spy(server._client, 'list_tools')  # pyright: ignore[reportPrivateUsage]
+        await server.list_tools()
+        assert list_tools.call_count == 1
+
+
+async def test_stdio_server_cache_tools_ttl(mocker: MockerFixture):
+    server = MCPServerStdio('python', ['-m', 'tests.mcp_server'], cache_tools=True, cache_tools_ttl=0)
+    async with server:
+        list_tools = mocker.spy(server._client, 'list_tools')  # pyright: ignore[reportPrivateUsage]
+        await server.list_tools()
+        await server.list_tools()
+        assert list_tools.call_count == 2
+
+
+async def test_tool_calls_reuse_tool_listing(mocker: MockerFixture):
+    def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(
+                parts=[
+                    ToolCallPart('celsius_to_fahrenheit', {'celsius': 0}),
+                    ToolCallPart('celsius_to_fahrenheit', {'celsius': 100}),
+                ]
+            )
+        return ModelResponse(parts=[TextPart('done')])
+
+    server = MCPServerStdio('python', ['-m', 'tests.mcp_server'])
+    agent = Agent(FunctionModel(model_function), mcp_servers=[server])
+    async with agent.run_mcp_servers():
+        list_tools = mocker.spy(server._client, 'list_tools')  # pyright: ignore[reportPrivateUsage]
+        result = await agent.run('Convert 0 and 100 degrees celsius')
+        assert result.output == 'done'
+        # one listing per model request, none per tool call
+        assert list_tools.call_count == 2
+
+
 def test_sse_server():
     sse_server = MCPServerHTTP(url='http://localhost:8000/sse')
     assert sse_server.url == 'http://localhost:8000/sse'
@@ -1,6 +1,22 @@
-import pytest
+import pickle
+import tracemalloc
+from base64 import b64encode
+from dataclasses import replace
+from pathlib import Path
 
-from pydantic_ai.messages import BinaryContent, DocumentUrl, ImageUrl, VideoUrl
+import pytest
+from inline_snapshot import snapshot
+
+from pydantic_ai.messages import (
+    BinaryContent,
+    DocumentUrl,
+    ImageUrl,
+    ModelMessage,
+    ModelMessagesTypeAdapter,
+    ModelRequest,
+    UserPromptPart,
+    VideoUrl,
+)
 
 
 def test_image_url():
@@ -93,3 +109,83 @@ def test_binary_content_document(media_type: str, format: str):
     binary_content = BinaryContent(data=b'Hello, world!', media_type=media_type)
     assert binary_content.is_document
     assert binary_content.format == format
+
+
+def test_binary_content_base64():
+    content = BinaryContent(data=b'Hello', media_type='text/plain')
+    assert content.base64 == 'SGVsbG8='
+    # the encoding isn't kept with the content, where it would be pickled and copied with it
+    assert (
+        pickle.loads(pickle.dumps(content)).__dict__
+        == content.__dict__
+        == snapshot({'data': b'Hello', 'media_type': 'text/plain', 'kind': 'binary'})
+    )
+
+    content.data = b'Goodbye'
+    assert content.base64 == 'R29vZGJ5ZQ=='
+
+
+def test_binary_content_from_path(tmp_path: Path):
+    path = tmp_path / 'video.mp4'
+    data = bytes(range(256)) * 40_000
+    path.write_bytes(data)
+
+    content = BinaryContent.from_path(path)
+    assert content.media_type == 'video/mp4'
+    assert content.format == 'mp4'
+    assert content.base64 == b64encode(data).decode()
+    assert content.data == data
+    assert content == BinaryContent(data=data, media_type='video/mp4')
+    assert BinaryContent(data=data, media_type='video/mp4') == content
+    assert content != BinaryContent(data=data, media_type='video/webm')
+    assert content == BinaryContent.from_path(path)
+    # the repr doesn't read the file
+    assert repr(content) == (
+        f"BinaryContent(data=<loaded by _FileLoader(path={path!r})>, media_type='video/mp4', kind='binary')"
+    )
+
+    messages: list[ModelMessage] = [ModelRequest(parts=[UserPromptPart([content])])]
+    assert ModelMessagesTypeAdapter.validate_json(ModelMessagesTypeAdapter.dump_json(messages)) == messages
+
+    copied = replace(content, media_type='application/octet-stream')
+    assert copied == BinaryContent(data=data, media_type='application/octet-stream')
+    assert copied.base64 == b64encode(data).decode()
+
+    # the data isn't kept with the content, so it's read again
+    path.write_bytes(b'changed')
+    assert content.data == b'changed'
+    assert copied.data == data
+
+    assert BinaryContent.from_path(str(path), media_type='application/octet-stream').media_type == (
+        'application/octet-stream'
+    )
+    (tmp_path / 'file.potato').write_bytes(data)
+    with pytest.raises(ValueError, match='Unknown media type for file:'):
+        BinaryContent.from_path(tmp_path / 'file.potato')
+    with pytest.raises(FileNotFoundError, match='No such file:'):
+        BinaryContent.from_path(tmp_path / 'missing.mp4')
+
+
+def test_binary_content_from_path_memory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # a smaller file and chunks than in practice, in the same proportion, keep the test fast
+    monkeypatch.setattr('pydantic_ai.messages._FileLoader.chunk_size', 3 * 16 * 1024)
+    size = 4 * 1024 * 1024
+    path = tmp_path / 'large.pdf'
+    with path.open('wb') as f:
+        f.truncate(size)
+
+    tracemalloc.start()
+    try:
+        content = BinaryContent.from_path(path)
+        assert content.is_document
+        encoded = content.base64
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(encoded) == size // 3 * 4 + 4
+    # encoding the file in memory would take the data, the encoded bytes and the string, i.e. more than 3.6 times its
+    # size, while encoding it in chunks only takes the chunks and the string
+    assert peak < 2.7 * size
+    # once encoded, only the string is held
+    assert current < 1.34 * size
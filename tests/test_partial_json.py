@@ -0,0 +1,132 @@
+from __future__ import annotations as _annotations
+
+import json
+from typing import Any
+
+import pytest
+from pydantic_core import from_json
+
+from pydantic_ai._partial_json import IncrementalJsonParser
+from pydantic_ai._parts_manager import ModelResponsePartsManager
+from pydantic_ai._utils import UNSET
+from pydantic_ai.messages import ToolCallPart
+
+DOCUMENTS = [
+    '{"a": [1, 2.5, -3e2, true, false, null, "x\\n\\u00e9\\ud83d\\ude00 y"], "b": {"c": {}, "d": []}, "f": 0}',
+    '[{"name": "\\"quoted\\" \\\\ \\/ \\b\\f\\r\\t", "price": -0.25E+3, "tags": ["a", "b"]}]',
+    '  {"nested": [[[["deep"]]]], "k": "v"}  ',
+    '"just a string"',
+    '-12.5e-3',
+    'null',
+    '[]',
+    json.dumps({'text': 'lorem ipsum ' * 10, 'unicode': '😀 é'}, ensure_ascii=False),
+]
+
+
+def partial_from_json(text: str) -> Any:
+    try:
+        return from_json(text, allow_partial='trailing-strings')
+    except ValueError:
+        return UNSET
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7])
+@pytest.mark.parametrize('document', DOCUMENTS)
+def test_matches_from_json(document: str, chunk_size: int):
+    parser = IncrementalJsonParser()
+    for end in range(chunk_size, len(document) + chunk_size, chunk_size):
+        parser.feed(document[end - chunk_size : end])
+        # compare the JSON so `NaN`s and ints and floats which compare equal are told apart
+        assert json.dumps(parser.value, default=repr) == json.dumps(partial_from_json(document[:end]), default=repr)
+    assert parser.length == len(document)
+    assert not parser.failed
+
+
+def test_partial_values():
+    parser = IncrementalJsonParser()
+    values: list[Any] = []
+    for chunk in ['{"a": "hel', 'lo", "b": [1', '2, tr', 'ue], "c', '": 1.', '5}']:
+        parser.feed(chunk)
+        values.append(parser.value)
+    assert parser.complete
+    assert values == [
+        {'a': 'hel'},
+        {'a': 'hello', 'b': [1]},
+        {'a': 'hello', 'b': [12]},
+        {'a': 'hello', 'b': [12, True]},
+        {'a': 'hello', 'b': [12, True]},
+        {'a': 'hello', 'b': [12, True], 'c': 1.5},
+    ]
+
+
+def test_value_is_a_snapshot():
+    parser = IncrementalJsonParser()
+    parser.feed('{"items": [{"name": "a"}, {"name": "b')
+    value = parser.value
+    assert parser.value is value
+    parser.feed('c"}, {"name": "d"}]}')
+    assert value == {'items': [{'name': 'a'}, {'name': 'b'}]}
+    assert parser.value == {'items': [{'name': 'a'}, {'name': 'bc'}, {'name': 'd'}]}
+
+
+def test_no_value_yet():
+    parser = IncrementalJsonParser()
+    assert parser.value is UNSET
+    parser.feed(' tr')
+    assert parser.value is UNSET
+    assert not parser.failed
+
+
+@pytest.mark.parametrize(
+    'document',
+    [
+        '[1,]',
+        '{"a": 1,}',
+        '[01]',
+        '{"a" 1}',
+        '{1: 2}',
+        '{"a": tru}',
+        '["\\x"]',
+        '"\x01"',
+        '["\\udc00"]',
+        '[NaN]',
+        '1 2',
+    ],
+)
+def test_invalid(document: str):
+    parser = IncrementalJsonParser()
+    parser.feed(document)
+    assert parser.failed
+    assert parser.value is UNSET
+    parser.feed('more')
+    assert parser.value is UNSET
+    assert parser.length == len(document) + 4
+
+
+def test_parts_manager_partial_args():
+    manager = ModelResponsePartsManager()
+    manager.handle_tool_call_delta(vendor_part_id=0, tool_name=None, args='{"a": ', tool_call_id=None)
+    manager.handle_tool_call_delta(vendor_part_id=0, tool_name='tool', args='"b', tool_call_id=None)
+    [part] = manager.get_parts()
+    assert isinstance(part, ToolCallPart)
+    assert manager.get_partial_args(part) == {'a': 'b'}
+
+    manager.handle_tool_call_delta(vendor_part_id=0, tool_name=None, args='c"}', tool_call_id=None)
+    # the part has been replaced, so the arguments parsed so far don't match it
+    assert manager.get_partial_args(part) is None
+    [part] = manager.get_parts()
+    assert isinstance(part, ToolCallPart)
+    assert manager.get_partial_args(part) == {'a': 'bc'}
+
+    # string arguments of whole parts are parsed too, e.g. for responses replayed from a cache
+    manager.handle_tool_call_part(vendor_part_id=0, tool_name='tool', args='{"a": "d"}')
+    [part] = manager.get_parts()
+    assert isinstance(part, ToolCallPart)
+    assert manager.get_partial_args(part) == {'a': 'd'}
+
+    manager.handle_tool_call_delta(vendor_part_id=1, tool_name='tool', args='[1, 2', tool_call_id=None)
+    manager.handle_tool_call_delta(vendor_part_id=2, tool_name='tool', args={'a': 1}, tool_call_id=None)
+    array_part, dict_part = manager.get_parts()[1:]
+    assert isinstance(array_part, ToolCallPart) and isinstance(dict_part, ToolCallPart)
+    assert manager.get_partial_args(array_part) is None
+    assert manager.get_partial_args(dict_part) is None
@@ -388,3 +388,60 @@ def test_apply_tool_delta_variants(
         tool_call_part = manager.get_parts()[0]
         assert isinstance(tool_call_part, ToolCallPart)
         assert tool_call_part.args == result
+
+
+def test_get_completed_tool_calls():
+    manager = ModelResponsePartsManager()
+    manager.handle_tool_call_delta(vendor_part_id=0, tool_name='tool1', args='{"x": ', tool_call_id='a')
+    assert manager.get_completed_tool_calls() == []
+
+    manager.handle_tool_call_delta(vendor_part_id=0, tool_name=None, args='1}', tool_call_id=None)
+    # the last part may still receive arguments
+    assert manager.get_completed_tool_calls() == []
+
+    manager.handle_tool_call_delta(vendor_part_id=1, tool_name='tool2', args='{"y": ', tool_call_id='b')
+    manager.handle_text_delta(vendor_part_id=2, content='hello')
+    manager.handle_tool_call_part(vendor_part_id=3, tool_name='tool3', args={'z': 3}, tool_call_id='c')
+    manager.handle_tool_call_delta(vendor_part_id=4, tool_name='tool4', args='', tool_call_id='d')
+    manager.handle_text_delta(vendor_part_id=5, content='world')
+    assert manager.get_completed_tool_calls() == snapshot(
+        [
+            ToolCallPart(tool_name='tool1', args='{"x": 1}', tool_call_id='a'),
+            ToolCallPart(tool_name='tool3', args={'z': 3}, tool_call_id='c'),
+            ToolCallPart(tool_name='tool4', args='', tool_call_id='d'),
+        ]
+    )
+    # parts before `start` aren't checked again
+    assert manager.get_completed_tool_calls(start=3) == snapshot(
+        [
+            ToolCallPart(tool_name='tool3', args={'z': 3}, tool_call_id='c'),
+            ToolCallPart(tool_name='tool4', args='', tool_call_id='d'),
+        ]
+    )
+
+
+def test_deltas_applied_when_parts_are_needed():
+    manager = ModelResponsePartsManager()
+    manager.handle_text_delta(vendor_part_id='text', content='hello')
+    manager.handle_tool_call_delta(vendor_part_id='tool', tool_name='tool', args='{"x": ', tool_call_id='a')
+    for _ in range(3):
+        manager.handle_text_delta(vendor_part_id='text', content=' hello')
+        manager.handle_tool_call_delta(vendor_part_id='tool', tool_name=None, args='1', tool_call_id=None)
+
+    parts = manager.get_parts()
+    assert parts == snapshot(
+        [
+            TextPart(content='hello hello hello hello'),
+            ToolCallPart(tool_name='tool', args='{"x": 111', tool_call_id='a'),
+        ]
+    )
+    # the parts are only rebuilt after more deltas
+    assert all(p is q for p, q in zip(manager.get_parts(), parts))
+    assert isinstance(parts[1], ToolCallPart)
+    assert manager.get_partial_args(parts[1]) == {'x': 111}
+
+    manager.handle_tool_call_delta(vendor_part_id='tool', tool_name=None, args='}', tool_call_id=None)
+    # a delta which isn't just more arguments is applied to the arguments so far
+    manager.handle_tool_call_delta(vendor_part_id='tool', tool_name='_v2', args=None, tool_call_id=None)
+    assert manager.get_parts()[1] == snapshot(ToolCallPart(tool_name='tool_v2', args='{"x": 111}', tool_call_id='a'))
+    assert manager.get_parts()[0] is parts[0]
@@ -1,16 +1,17 @@
 from __future__ import annotations as _annotations
 
+import asyncio
 import datetime
 import json
 import re
 from collections.abc import AsyncIterator
 from copy import deepcopy
 from datetime import timezone
-from typing import Union
+from typing import Any, Union
 
 import pytest
 from inline_snapshot import snapshot
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from pydantic_ai import Agent, UnexpectedModelBehavior, UserError, capture_run_messages
 from pydantic_ai.agent import AgentRun
@@ -147,6 +148,60 @@ async def test_structured_response_iter():
                 pass
 
 
+class Event(BaseModel, strict=True):
+    day: datetime.date
+    names: list[str] = []
+
+
+async def test_structured_response_parsed_incrementally():
+    async def stream(_messages: list[ModelMessage], agent_info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        assert agent_info.output_tools is not None
+        yield {0: DeltaToolCall(name=agent_info.output_tools[0].name, json_args='{"day": "2025-01-01", ')}
+        for chunk in ['"names": ["Al', 'ice", "B', 'ob"', ']}']:
+            yield {0: DeltaToolCall(json_args=chunk)}
+
+    agent = Agent(FunctionModel(stream_function=stream), output_type=Event)
+    async with agent.run_stream('') as result:
+        # the strict model doesn't accept a string date in python mode, so that's validated as JSON instead
+        outputs = [output async for output in result.stream(debounce_by=None)]
+
+    assert outputs == snapshot(
+        [
+            Event(day=datetime.date(2025, 1, 1)),
+            Event(day=datetime.date(2025, 1, 1), names=['Al']),
+            Event(day=datetime.date(2025, 1, 1), names=['Alice', 'B']),
+            Event(day=datetime.date(2025, 1, 1), names=['Alice', 'Bob']),
+            Event(day=datetime.date(2025, 1, 1), names=['Alice', 'Bob']),
+            Event(day=datetime.date(2025, 1, 1), names=['Alice', 'Bob']),
+        ]
+    )
+
+
+async def test_structured_response_strict_partial_args(monkeypatch: pytest.MonkeyPatch):
+    async def stream(_messages: list[ModelMessage], agent_info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        assert agent_info.output_tools is not None
+        yield {0: DeltaToolCall(name=agent_info.output_tools[0].name, json_args='{"day": "2025-01-01", ')}
+        for chunk in ['"names": ["Al', 'ice", "B', 'ob"', ']}']:
+            yield {0: DeltaToolCall(json_args=chunk)}
+
+    validated_python: list[object] = []
+    validate_python = TypeAdapter[Any].validate_python
+
+    def spy_validate_python(self: TypeAdapter[Any], obj: object, **kwargs: Any) -> Any:
+        validated_python.append(obj)
+        return validate_python(self, obj, **kwargs)
+
+    monkeypatch.setattr(TypeAdapter, 'validate_python', spy_validate_python)
+
+    agent = Agent(FunctionModel(stream_function=stream), output_type=Event)
+    async with agent.run_stream('') as result:
+        outputs = [output async for output in result.stream(debounce_by=None)]
+    assert outputs[-1] == Event(day=datetime.date(2025, 1, 1), names=['Alice', 'Bob'])
+
+    # once the partial arguments fail python validation which their JSON passes, only JSON validation is used
+    assert validated_python == snapshot([{'day': '2025-01-01'}])
+
+
 async def test_streamed_text_stream():
     m = TestModel(custom_output_text='The cat sat on the mat.')
 
@@ -898,3 +953,75 @@ async def test_stream_iter_structured_validator() -> None:
                     async for output in stream.stream_output(debounce_by=None):
                         outputs.append(output)
     assert outputs == [OutputType(value='a (validated)'), OutputType(value='a (validated)')]
+
+
+class SpeculativeToolsModel:
+    def __init__(self):
+        self.log: list[str] = []
+
+    async def stream(self, messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str | DeltaToolCalls]:
+        if len(messages) > 1:
+            yield 'done'
+            return
+        yield {0: DeltaToolCall(name='get_location', json_args='{"city": "Paris"}', tool_call_id='1')}
+        yield {1: DeltaToolCall(name='get_location', json_args='{"city": ', tool_call_id='2')}
+        await asyncio.sleep(0.01)
+        yield {1: DeltaToolCall(json_args='"London"}')}
+        self.log.append('stream finished')
+
+
+@pytest.mark.parametrize('speculative', [True, False])
+async def test_speculative_tool_calls(speculative: bool):
+    model = SpeculativeToolsModel()
+    agent = Agent(FunctionModel(stream_function=model.stream), speculative_tool_calls=speculative)
+
+    @agent.tool_plain
+    async def get_location(city: str) -> str:
+        model.log.append(f'get_location {city}')
+        return f'{city} location'
+
+    async with agent.run_stream('Hello') as result:
+        assert await result.get_output() == 'done'
+
+    if speculative:
+        # the first call is complete once the second starts, so runs before the stream finishes
+        assert model.log == ['get_location Paris', 'stream finished', 'get_location London']
+    else:
+        assert model.log == ['stream finished', 'get_location Paris', 'get_location London']
+    assert [
+        part for message in result.all_messages() for part in message.parts if isinstance(part, ToolReturnPart)
+    ] == [
+        ToolReturnPart(
+            tool_name='get_location', content='Paris location', tool_call_id='1', timestamp=IsNow(tz=timezone.utc)
+        ),
+        ToolReturnPart(
+            tool_name='get_location', content='London location', tool_call_id='2', timestamp=IsNow(tz=timezone.utc)
+        ),
+    ]
+
+
+async def test_speculative_tool_calls_cancelled():
+    cancelled: list[str] = []
+
+    async def stream_function(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[DeltaToolCalls]:
+        yield {0: DeltaToolCall(name='slow_tool', json_args='{}', tool_call_id='1')}
+        yield {1: DeltaToolCall(name='final_result', json_args='{"response": ', tool_call_id='2')}
+        await asyncio.sleep(0.01)
+        yield {1: DeltaToolCall(json_args='1}')}
+
+    agent = Agent(FunctionModel(stream_function=stream_function), output_type=int, speculative_tool_calls=True)
+
+    @agent.tool_plain
+    async def slow_tool() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append('slow_tool')
+            raise
+        return 'never'  # pragma: no cover
+
+    # with the default 'early' end strategy, tools after a final result aren't run, so the started call is cancelled
+    async with agent.run_stream('Hello') as result:
+        assert await result.get_output() == 1
+    await asyncio.sleep(0)
+    assert cancelled == ['slow_tool']
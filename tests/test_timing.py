@@ -0,0 +1,106 @@
+from __future__ import annotations as _annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+import pytest
+
+from pydantic_ai import Agent, ModelRetry
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+from pydantic_ai.timing import RunTiming, StepTiming
+
+pytestmark = pytest.mark.anyio
+
+DELAY = 0.02
+
+
+async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+    await asyncio.sleep(DELAY)
+    if len(messages) == 1:
+        return ModelResponse(
+            parts=[
+                ToolCallPart('slow_tool', {}, '1'),
+                ToolCallPart('slow_tool', {}, '2'),
+                ToolCallPart('fast_tool', {}, '3'),
+            ]
+        )
+    return ModelResponse(parts=[TextPart(f'answer {len(messages)}')])
+
+
+def build_agent(model: FunctionModel) -> Agent[None, str]:
+    agent = Agent(model)
+
+    @agent.system_prompt
+    async def system_prompt() -> str:
+        await asyncio.sleep(DELAY)
+        return 'You are helpful.'
+
+    @agent.tool_plain
+    async def slow_tool() -> str:
+        await asyncio.sleep(DELAY)
+        return 'slow'
+
+    @agent.tool_plain
+    def fast_tool() -> str:
+        return 'fast'
+
+    @agent.output_validator
+    def validate_output(output: str) -> str:
+        if output == 'answer 3':
+            raise ModelRetry('Try again')
+        return output
+
+    return agent
+
+
+async def test_run_timing():
+    result = await build_agent(FunctionModel(respond)).run('Hello')
+    assert result.output == 'answer 5'
+
+    timing = result.timing()
+    assert isinstance(timing, RunTiming)
+    assert [step.run_step for step in timing.steps] == [1, 2, 3]
+    assert all(isinstance(step, StepTiming) for step in timing.steps)
+    assert timing.prompt_preparation >= DELAY
+    assert all(step.model_request >= DELAY for step in timing.steps)
+    assert all(step.time_to_first_token is None for step in timing.steps)
+    assert all(step.prepare >= 0 for step in timing.steps)
+
+    first, second, third = timing.steps
+    # both calls to the slow tool are added up, even though they run concurrently
+    assert set(first.tools) == {'slow_tool', 'fast_tool'}
+    assert first.tools['slow_tool'] >= 2 * DELAY
+    assert (first.retries, second.retries, third.retries) == (0, 1, 0)
+    assert first.output_validation == 0
+    assert second.output_validation > 0 and third.output_validation > 0
+
+    assert timing.model_request == sum(step.model_request for step in timing.steps)
+    assert timing.tools == first.tools
+    assert timing.output_validation == second.output_validation + third.output_validation
+    assert timing.retries == 1
+    assert timing.total is not None
+    assert timing.total >= timing.prompt_preparation + timing.model_request + timing.tools['slow_tool'] / 2
+
+
+async def test_stream_timing():
+    async def stream(messages: list[ModelMessage], info: AgentInfo) -> AsyncIterator[str]:
+        await asyncio.sleep(DELAY)
+        yield 'hello '
+        await asyncio.sleep(DELAY)
+        yield 'world'
+
+    agent = Agent(FunctionModel(stream_function=stream))
+    async with agent.iter('Hello') as run:
+        async for node in run:
+            if agent.is_model_request_node(node):
+                async with node.stream(run.ctx) as agent_stream:
+                    async for _ in agent_stream:
+                        pass
+        assert run.result is not None
+        [step] = run.timing().steps
+        assert step.time_to_first_token is not None
+        assert step.time_to_first_token >= DELAY
+        assert step.model_request >= step.time_to_first_token + DELAY
+        assert run.timing().total is None
+    assert run.timing().total is not None
@@ -1,7 +1,14 @@
+import asyncio
 import json
+import os
+import threading
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Annotated, Any, Callable, Literal, Union
 
+import anyio
 import pydantic_core
 import pytest
 from _pytest.logging import LogCaptureFixture
@@ -11,7 +18,9 @@ from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
 from pydantic_core import PydanticSerializationError, core_schema
 from typing_extensions import TypedDict
 
-from pydantic_ai import Agent, RunContext, Tool, ToolOutput, UserError
+from pydantic_ai import Agent, ModelRetry, RunContext, Tool, ToolOutput, UserError
+from pydantic_ai._utils import run_in_process
+from pydantic_ai.cache import CacheStats, MemoryCache, SQLiteCache
 from pydantic_ai.messages import ModelMessage, ModelRequest, ModelResponse, TextPart, ToolCallPart, ToolReturnPart
 from pydantic_ai.models.function import AgentInfo, FunctionModel
 from pydantic_ai.models.test import TestModel
@@ -954,3 +963,272 @@ def test_tool_parameters_with_attribute_docstrings():
             'strict': None,
         }
     )
+
+
+@pytest.mark.anyio
+async def test_tool_retries_isolated_between_concurrent_runs():
+    agent = Agent(TestModel(), deps_type=int, retries=1)
+    retries_seen: dict[int, list[int]] = {}
+
+    @agent.tool
+    async def flaky(ctx: RunContext[int]) -> str:
+        retries_seen.setdefault(ctx.deps, []).append(ctx.retry)
+        # yield to the event loop so that calls from different runs interleave
+        await asyncio.sleep(0)
+        if ctx.retry == 0:
+            raise ModelRetry('try again')
+        return f'ok {ctx.deps}'
+
+    results = await asyncio.gather(*(agent.run('Hello', deps=i) for i in range(1000)))
+
+    assert [r.output for r in results] == [f'{{"flaky":"ok {i}"}}' for i in range(1000)]
+    assert retries_seen == {i: [0, 1] for i in range(1000)}
+
+
+def test_tool_current_retry_deprecated():
+    tool = Tool(ctx_tool)
+    with pytest.warns(DeprecationWarning, match='`current_retry` is deprecated'):
+        assert tool.current_retry == 0  # pyright: ignore[reportDeprecated]
+    with pytest.warns(DeprecationWarning, match='`current_retry` is deprecated'):
+        tool.current_retry = 1  # pyright: ignore[reportDeprecated]
+
+
+@dataclass
+class ConcurrencyTracker:
+    running: int = 0
+    peak: int = 0
+
+    async def run(self) -> str:
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return 'done'
+
+
+def parallel_calls_model(*tool_names: str, count: int) -> FunctionModel:
+    def model_function(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        if len(messages) == 1:
+            return ModelResponse(parts=[ToolCallPart(name, {}) for name in tool_names for _ in range(count)])
+        return ModelResponse(parts=[TextPart('finished')])
+
+    return FunctionModel(model_function)
+
+
+@pytest.mark.anyio
+async def test_agent_max_concurrent_tool_calls():
+    tracker = ConcurrencyTracker()
+    agent = Agent(parallel_calls_model('slow', count=10), max_concurrent_tool_calls=3)
+    agent.tool_plain(name='slow')(tracker.run)
+
+    result = await agent.run('Hello')
+    assert result.output == 'finished'
+    tool_returns = [part for part in result.all_messages()[2].parts if isinstance(part, ToolReturnPart)]
+    assert [part.content for part in tool_returns] == ['done'] * 10
+    assert tracker.peak == 3
+
+
+@pytest.mark.anyio
+async def test_tool_max_concurrency():
+    limited = ConcurrencyTracker()
+    unlimited = ConcurrencyTracker()
+    agent = Agent(
+        parallel_calls_model('limited', 'unlimited', count=8),
+        tools=[Tool(limited.run, name='limited', max_concurrency=2), Tool(unlimited.run, name='unlimited')],
+    )
+
+    await asyncio.gather(agent.run('Hello'), agent.run('Hello'))
+    # the limit is shared by both runs, and doesn't hold back other tools
+    assert limited.peak == 2
+    assert unlimited.peak == 16
+
+
+@pytest.mark.anyio
+async def test_tool_concurrency_limiter_shared_between_agents():
+    tracker = ConcurrencyTracker()
+    limiter = anyio.CapacityLimiter(4)
+    agents = [
+        Agent(parallel_calls_model('slow', count=10), tool_concurrency_limiter=limiter, max_concurrent_tool_calls=3)
+        for _ in range(2)
+    ]
+    for agent in agents:
+        agent.tool_plain(name='slow')(tracker.run)
+
+    await asyncio.gather(*(agent.run('Hello') for agent in agents))
+    assert tracker.peak == 4
+
+
+def current_pid(x: int) -> int:
+    return os.getpid() + x
+
+
+# captured when the module is imported, before any test configures logfire, which patches `submit` to send its
+# config to the worker processes, including the unpicklable exporters of the `capfire` fixture
+PROCESS_POOL_SUBMIT = ProcessPoolExecutor.submit
+
+
+def test_process_executor(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(ProcessPoolExecutor, 'submit', PROCESS_POOL_SUBMIT)
+    agent = Agent(TestModel(), tool_process_pool_size=1)
+    agent.tool_plain(executor='process')(current_pid)
+
+    result = agent.run_sync('Hello')
+    pid = json.loads(result.output)['current_pid']
+    assert pid != os.getpid()
+
+    # the pool is shared between runs
+    result = agent.run_sync('Hello')
+    assert json.loads(result.output)['current_pid'] == pid
+
+    # once shut down, a new pool is started on the next call
+    agent.shutdown_tool_process_pool()
+    result = agent.run_sync('Hello')
+    assert json.loads(result.output)['current_pid'] not in (pid, os.getpid())
+    agent.shutdown_tool_process_pool()
+    agent.shutdown_tool_process_pool()
+
+
+def test_process_executor_unsupported_tools():
+    def local_function(x: int) -> int:
+        return x  # pragma: no cover
+
+    async def async_function(x: int) -> int:
+        return x  # pragma: no cover
+
+    def ctx_function(ctx: RunContext[None], x: int) -> int:
+        return x  # pragma: no cover
+
+    with pytest.raises(UserError, match="can't be pickled so it can't be run with `executor='process'`"):
+        Tool(local_function, executor='process')
+    with pytest.raises(UserError, match="is async so it can't be run with `executor='process'`"):
+        Tool(async_function, executor='process')
+    with pytest.raises(UserError, match="takes a `RunContext` so it can't be run with `executor='process'`"):
+        Tool(ctx_function, executor='process')
+
+
+def test_process_executor_fallback(monkeypatch: pytest.MonkeyPatch):
+    def no_processes(**kwargs: Any):
+        raise NotImplementedError('no multiprocessing here')
+
+    monkeypatch.setattr('pydantic_ai.agent.ProcessPoolExecutor', no_processes)
+    agent = Agent(TestModel())
+    agent.tool_plain(executor='process')(current_pid)
+
+    with pytest.warns(RuntimeWarning, match="Can't start a process pool, tools will be run in threads instead"):
+        result = agent.run_sync('Hello')
+    assert json.loads(result.output) == {'current_pid': os.getpid()}
+
+    # the failure is remembered, so the warning is only emitted once
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        result = agent.run_sync('Hello')
+    assert json.loads(result.output) == {'current_pid': os.getpid()}
+
+
+@pytest.mark.anyio
+async def test_run_in_process_unpicklable_args():
+    with ThreadPoolExecutor() as executor:
+        assert await run_in_process(executor, current_pid, 1) == os.getpid() + 1
+        with pytest.raises(UserError, match="Arguments to 'current_pid' could not be pickled"):
+            await run_in_process(executor, current_pid, threading.Lock())  # type: ignore[arg-type]
+
+
+class UnpicklableSubmitExecutor(ThreadPoolExecutor):
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        # like instrumentation adding unpicklable context to the call
+        raise TypeError("cannot pickle '_thread.lock' object")
+
+
+@pytest.mark.anyio
+async def test_run_in_process_unpicklable_submit():
+    with UnpicklableSubmitExecutor() as executor:
+        with pytest.raises(UserError, match="The call to 'current_pid' could not be sent to a worker process"):
+            await run_in_process(executor, current_pid, 1)
+
+
+def test_tool_cache():
+    calls: list[int] = []
+
+    def lookup(x: int) -> str:
+        calls.append(x)
+        return f'value {x}'
+
+    cache = MemoryCache()
+    agent = Agent(TestModel(), tools=[Tool(lookup, cache=cache)])
+
+    assert agent.run_sync('Hello').output == '{"lookup":"value 0"}'
+    assert agent.run_sync('Hello').output == '{"lookup":"value 0"}'
+    assert calls == [0]
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_agent_tool_cache_exempts_ctx_tools(tmp_path: Path):
+    calls: list[str] = []
+    cache = SQLiteCache(tmp_path / 'cache.db')
+    agent = Agent(TestModel(), deps_type=int, tool_cache=cache)
+
+    @agent.tool_plain
+    def plain(x: int) -> int:
+        calls.append('plain')
+        return x
+
+    @agent.tool_plain(cache=False)
+    def uncached(x: int) -> int:
+        calls.append('uncached')
+        return x
+
+    @agent.tool
+    def with_ctx(ctx: RunContext[int], x: int) -> int:
+        calls.append('with_ctx')
+        return ctx.deps + x
+
+    assert agent.run_sync('Hello', deps=1).output == '{"plain":0,"uncached":0,"with_ctx":1}'
+    assert agent.run_sync('Hello', deps=2).output == '{"plain":0,"uncached":0,"with_ctx":2}'
+    assert sorted(calls) == ['plain', 'uncached', 'uncached', 'with_ctx', 'with_ctx']
+    assert cache.stats == CacheStats(hits=1, misses=1)
+
+
+def test_tool_cache_skips_retries():
+    calls: list[int] = []
+
+    def flaky(x: int) -> str:
+        calls.append(x)
+        if len(calls) == 1:
+            raise ModelRetry('try again')
+        return 'ok'
+
+    cache = MemoryCache()
+    agent = Agent(TestModel(), tools=[Tool(flaky, cache=cache)])
+
+    assert agent.run_sync('Hello').output == '{"flaky":"ok"}'
+    assert agent.run_sync('Hello').output == '{"flaky":"ok"}'
+    assert calls == [0, 0]
+    assert cache.stats == CacheStats(hits=1, misses=2)
+
+
+def test_tool_cache_key_prefix():
+    def make_lookup(source: str) -> Tool:
+        def lookup(x: int) -> str:
+            return f'{source} {x}'
+
+        return Tool(lookup, cache_key_prefix=f'lookup-{source}')
+
+    def other_lookup(x: int) -> str:
+        return f'other {x}'
+
+    cache = MemoryCache()
+    db_agent = Agent(TestModel(), tools=[make_lookup('db')], tool_cache=cache)
+    api_agent = Agent(TestModel(), tools=[make_lookup('api')], tool_cache=cache)
+    other_agent = Agent(TestModel(), tools=[Tool(other_lookup, name='lookup')], tool_cache=cache)
+
+    # tools with the same name and arguments sharing a cache don't share results
+    assert db_agent.run_sync('Hello').output == '{"lookup":"db 0"}'
+    assert api_agent.run_sync('Hello').output == '{"lookup":"api 0"}'
+    assert other_agent.run_sync('Hello').output == '{"lookup":"other 0"}'
+    assert db_agent.run_sync('Hello').output == '{"lookup":"db 0"}'
+    assert cache.stats == CacheStats(hits=1, misses=3)
+
+    # by default, keys are prefixed by the function's module and qualified name
+    assert Tool(other_lookup, name='lookup').cache_key_prefix == (
+        'tests.test_tools.test_tool_cache_key_prefix.<locals>.other_lookup'
+    )
@@ -41,6 +41,60 @@ async def test_group_by_temporal(interval: float | None, expected: list[list[int
         assert groups == expected
 
 
+async def test_group_by_temporal_error():
+    async def yield_then_fail() -> AsyncIterator[int]:
+        yield 1
+        await asyncio.sleep(0.02)
+        raise ValueError('boom')
+
+    async with group_by_temporal(yield_then_fail(), soft_max_interval=0.01) as groups_iter:
+        groups: list[list[int]] = []
+        with pytest.raises(ValueError, match='boom'):
+            async for g in groups_iter:
+                groups.append(g)
+        assert groups == [[1]]
+
+
+async def test_group_by_temporal_stop_early():
+    finished = False
+
+    async def yield_forever() -> AsyncIterator[int]:
+        nonlocal finished
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+                await asyncio.sleep(0.001)
+        finally:
+            finished = True
+
+    async with group_by_temporal(yield_forever(), soft_max_interval=0.01) as groups_iter:
+        async for group in groups_iter:
+            assert group[0] == 0
+            break
+    # the item producer has been cancelled
+    assert finished
+
+
+async def test_group_by_temporal_read_ahead():
+    produced: list[int] = []
+
+    async def yield_items() -> AsyncIterator[int]:
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    async with group_by_temporal(yield_items(), soft_max_interval=0) as groups_iter:
+        groups: list[list[int]] = []
+        async for group in groups_iter:
+            groups.append(group)
+            # while the consumer is busy, at most one more item is received
+            await asyncio.sleep(0.001)
+            assert len(produced) <= sum(len(g) for g in groups) + 1
+    assert [item for group in groups for item in group] == list(range(100))
+
+
 def test_check_object_json_schema():
     object_schema = {'type': 'object', 'properties': {'a': {'type': 'string'}}}
     assert check_object_json_schema(object_schema) == object_schema